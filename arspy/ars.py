@@ -8,32 +8,1906 @@ as introduced in the original paper. This allows us
 to extract larger amounts of samples at a time
 in a stable way. Furthermore, we do *not* require the *derivative*
 of the logpdf as input to our sampler, only the logpdf itself.
+If the derivative is available, passing it as well yields tighter
+upper hulls built from tangents, as in the original paper.
 
 Our code is a port of an original matlab code in pmtk3 by Daniel Eaton (danieljameseaton@gmail.com) and compared to an open-source julia port (by Levi Boyles) of the same matlab function for testing purposes.
 """
-from numpy import sign, log, unique, linspace, isinf
+import asyncio
+import json
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from inspect import iscoroutinefunction
+from time import perf_counter
+from numpy import sign, log, exp, sqrt, unique, linspace, isinf
 from numpy.random import RandomState
 import numpy as np
-from arspy.hull import compute_hulls, evaluate_hulls, sample_upper_hull
+from arspy.hull import (
+    Hull, HullStack, compute_hulls, update_hulls, prune_mesh, evaluate_hulls, sample_upper_hull,
+    compute_hull_stack, evaluate_hull_stack, sample_upper_hull_stack
+)
+from arspy.probability_utils import alias_table, sampler_uniform_stream, uniform_stream
+from arspy.kernels import sample_kernel, jit_logpdf
 from typing import Tuple
 
-__all__ = (
-    "adaptive_rejection_sampling",
-)
+__all__ = (
+    "ARSampler",
+    "BatchARSampler",
+    "CachedLogpdf",
+    "SamplerStats",
+    "adaptive_rejection_sampling",
+    "find_initial_abscissae",
+    "batch_adaptive_rejection_sampling",
+)
+
+__author__ = (
+    "Moritz Freidank"
+)
+
+
+class CachedLogpdf(object):
+    """
+    Wrapper around a `logpdf` that evaluates it at most once per point.
+
+    Every point `logpdf` is evaluated at is kept (sorted) in `abscissae`,
+    with the corresponding `logpdf` value at the same position in `values`.
+    `adaptive_rejection_sampling` uses these two lists directly as
+    the mesh its hulls are built on, so each mesh point is evaluated
+    exactly once.
+    Passing a `CachedLogpdf` instance as `logpdf` to
+    `adaptive_rejection_sampling` allows to inspect its counters
+    afterwards and to reuse already evaluated points in subsequent calls.
+
+    If the derivative `dlogpdf` is given, it is evaluated at the same
+    points and its values are kept in `derivatives`.
+
+    Examples
+    ----------
+    >>> logpdf = CachedLogpdf(lambda x: -x ** 2)
+    >>> logpdf(1.0), logpdf(1.0)
+    (-1.0, -1.0)
+    >>> logpdf.n_evaluations, logpdf.n_saved_evaluations
+    (1, 1)
+
+    """
+    def __init__(self, logpdf: callable, dlogpdf: callable=None):
+        assert(hasattr(logpdf, "__call__"))
+        assert(dlogpdf is None or hasattr(dlogpdf, "__call__"))
+
+        self.logpdf, self.dlogpdf = logpdf, dlogpdf
+
+        self.abscissae, self.values = [], []
+        self.derivatives = None if dlogpdf is None else []
+
+        self.n_evaluations = 0
+        self.n_saved_evaluations = 0
+
+    def __call__(self, x):
+        index = bisect_left(self.abscissae, x)
+
+        if index < len(self.abscissae) and self.abscissae[index] == x:
+            self.n_saved_evaluations += 1
+            return self.values[index]
+
+        fx = self.logpdf(x)
+        self.n_evaluations += 1
+
+        self.abscissae.insert(index, x)
+        self.values.insert(index, fx)
+
+        if self.dlogpdf is not None:
+            self.derivatives.insert(index, self.dlogpdf(x))
+
+        return fx
+
+    def evaluate_array(self, x, map_function: callable=None):
+        """
+        Evaluate `logpdf` at all points in array `x`.
+        All points that were not evaluated before are passed to
+        `logpdf` in a single call, which must therefore
+        accept and return NumPy arrays (as must `dlogpdf`, if given).
+
+        Parameters
+        ----------
+        x : np.ndarray
+            Points to evaluate `logpdf` at.
+
+        map_function : callable, optional
+            If given, `logpdf` (and `dlogpdf`) are instead called once per
+            new point via `map_function(logpdf, points)`, e.g. the `map`
+            method of a `concurrent.futures.Executor`.
+
+        Returns
+        ----------
+        fx : np.ndarray
+            Value of `logpdf` at each point in `x`.
+
+        """
+        x = np.asarray(x, dtype=float)
+        abscissae, values = np.asarray(self.abscissae), np.asarray(self.values)
+
+        index = np.searchsorted(abscissae, x)
+        cached = index < len(abscissae)
+        cached[cached] = abscissae[index[cached]] == x[cached]
+
+        fx = np.empty_like(x)
+        fx[cached] = values[index[cached]]
+        self.n_saved_evaluations += int(np.count_nonzero(cached))
+
+        if cached.all():
+            return fx
+
+        new_points, inverse = unique(x[~cached], return_inverse=True)
+
+        if map_function is None:
+            new_values = np.asarray(self.logpdf(new_points), dtype=float)
+        else:
+            new_values = np.asarray(list(map_function(self.logpdf, new_points)), dtype=float)
+        self.n_evaluations += len(new_points)
+        self.n_saved_evaluations += int(np.count_nonzero(~cached)) - len(new_points)
+
+        fx[~cached] = new_values[inverse]
+
+        # merge new points into the sorted lists in place
+        abscissae = np.concatenate((abscissae, new_points))
+        order = np.argsort(abscissae, kind="mergesort")
+
+        self.abscissae[:] = abscissae[order].tolist()
+        self.values[:] = np.concatenate((values, new_values))[order].tolist()
+
+        if self.dlogpdf is not None:
+            if map_function is None:
+                new_derivatives = self.dlogpdf(new_points)
+            else:
+                new_derivatives = list(map_function(self.dlogpdf, new_points))
+
+            self.derivatives[:] = np.concatenate((
+                np.asarray(self.derivatives, dtype=float),
+                np.asarray(new_derivatives, dtype=float)
+            ))[order].tolist()
+
+        return fx
+
+    def __len__(self):
+        return len(self.abscissae)
+
+
+class _AwaitedLogpdf(object):
+    """
+    Synchronous wrapper around a `logpdf` defined as a coroutine function
+    (`async def`), which runs each call to completion in a new event loop.
+    """
+    def __init__(self, logpdf: callable):
+        self.logpdf = logpdf
+
+    def __call__(self, x):
+        return _run_until_complete(self.logpdf(x))
+
+
+def _run_until_complete(coroutine):
+    """ Run `coroutine` in a new event loop (`asyncio.run` needs Python 3.7). """
+    loop = asyncio.new_event_loop()
+
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def _await_all(logpdf: callable, x):
+    """ Call the coroutine function `logpdf` at all points of `x` concurrently. """
+    async def gather():
+        return await asyncio.gather(*(logpdf(xi) for xi in x))
+
+    return _run_until_complete(gather())
+
+
+class _ConcurrentMap(object):
+    """
+    Map function of speculative sampling: calls a function at all points
+    of an array concurrently, by awaiting all calls at once for coroutine
+    functions and on `executor` (by default a pool of `n_workers` threads,
+    created on first use and shut down by `close`) otherwise, and returns
+    the results in order.
+    """
+    def __init__(self, n_workers: int, executor=None):
+        self.n_workers = n_workers
+        self.executor = executor
+        self.owns_executor = executor is None
+
+    def __call__(self, function, x):
+        if isinstance(function, _AwaitedLogpdf):
+            return _await_all(function.logpdf, x)
+
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.n_workers)
+
+        return list(self.executor.map(function, x))
+
+    def close(self):
+        """ Shut down the pool of threads, unless it was passed in. """
+        if self.owns_executor and self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+
+def _to_json(value):
+    """ Convert NumPy arrays and scalars for `json.dumps`. """
+    return value.tolist()
+
+
+def _parabola_vertex(x, fx):
+    """
+    Return the vertex of the parabola through three points,
+    or `None` if it is not concave.
+    """
+    (x0, x1, x2), (f0, f1, f2) = x, fx
+
+    denominator = (x0 - x1) * (x0 - x2) * (x1 - x2)
+    A = (x2 * (f1 - f0) + x1 * (f0 - f2) + x0 * (f2 - f1)) / denominator
+    B = (x2 ** 2 * (f0 - f1) + x1 ** 2 * (f2 - f0) + x0 ** 2 * (f1 - f2)) / denominator
+
+    if not A < 0:
+        return None
+
+    return -B / (2. * A)
+
+
+def _flank_candidate(points, drops, mode, edge, min_drop, max_drop):
+    """
+    Next point to evaluate on one side of the `mode`, or `None` if that side
+    already holds a point whose `logpdf` lies between `min_drop` and
+    `max_drop` below the mode (or reaches the domain boundary `edge`).
+    `points` and their `drops` are ordered from the mode outwards.
+    """
+    if not points or any(min_drop <= drop <= max_drop for drop in drops):
+        return None
+
+    outer = next((i for i, drop in enumerate(drops) if drop > max_drop), None)
+
+    if outer is not None:
+        # interpolate between the last point too close to the mode and the
+        # first too far, assuming a quadratic drop around the mode
+        inner = points[outer - 1] if outer > 0 else mode
+        x = mode + (points[outer] - mode) * sqrt(sqrt(min_drop * max_drop) / drops[outer])
+
+        if not min(inner, points[outer]) < x < max(inner, points[outer]):
+            # bisect instead
+            x = (inner + points[outer]) / 2.
+
+        return x
+
+    # all points are too close to the mode, expand outwards
+    far = points[-1]
+    x = far + 2. * (far - mode)
+
+    if (x - edge) * (far - mode) > 0:
+        # approach a bounded domain boundary geometrically
+        if abs(edge - far) <= 1e-3 * abs(far - mode):
+            return None
+        x = (far + edge) / 2.
+
+    return x
+
+
+def find_initial_abscissae(logpdf: callable, a: float, b: float,
+                           domain: Tuple[float, float], abscissae=None,
+                           min_drop: float=0.5, max_drop: float=3.,
+                           max_evaluations: int=50, max_refinements: int=5):
+    """
+    Find a small initial mesh for adaptive rejection sampling
+    that brackets the mode of `logpdf` and contains a point on each
+    side of it where `logpdf` is between `min_drop` and `max_drop`
+    below its (approximate) maximum.
+
+    Starting from `a`, `b` (and their midpoint or the given `abscissae`),
+    the search expands geometrically until the mode is bracketed,
+    refines the mode by fitting parabolas through the best point
+    and its neighbours, and finally expands or bisects towards suitable
+    flanking points. All evaluated points are part of the mesh.
+
+    Parameters
+    ----------
+    logpdf: callable
+        Univariate function that computes :math:`log(f(u))`, see
+        `adaptive_rejection_sampling`. Called once per evaluated point.
+
+    a: float
+        Lower starting point of the search, must hold: :math:`a < b`.
+
+    b: float
+        Upper starting point of the search, must hold: :math:`a < b`.
+
+    domain : Tuple[float, float]
+        Domain of `logpdf`. The mesh need not reach its finite bounds,
+        since the hulls extend to them (see `arspy.hull.compute_hulls`),
+        so `logpdf` is only evaluated at a bound if it is among `a`, `b`
+        and `abscissae`.
+
+    abscissae : iterable, optional
+        Additional starting points, e.g. quantiles of samples of a previous run.
+        Must lie in the domain.
+
+    min_drop : float, optional
+        Smallest distance of `logpdf` below the maximum for flanking points.
+
+    max_drop : float, optional
+        Largest distance of `logpdf` below the maximum for flanking points.
+
+    max_evaluations : int, optional
+        Maximal number of points to evaluate.
+
+    max_refinements : int, optional
+        Maximal number of parabola fits to refine the mode.
+        Each costs one evaluation and tightens the hulls around the mode,
+        which pays off unless only very few samples are drawn.
+
+    Returns
+    ----------
+    abscissae : list
+        Sorted mesh of at least four points.
+
+    Examples
+    ----------
+    >>> mesh = find_initial_abscissae(lambda x: -(x - 100.) ** 2 / 2., a=0., b=1., domain=(float("-inf"), float("inf")))
+    >>> mesh[0], 100.0 in mesh, mesh[-1] > 100.0
+    (0.0, True, True)
+
+    """
+    lower, upper = domain
+    S, fS = [], []
+
+    def evaluate(x):
+        x = float(x)
+        index = bisect_left(S, x)
+        if index == len(S) or S[index] != x:
+            S.insert(index, x)
+            fS.insert(index, float(logpdf(x)))
+
+    if a >= b or isinf(a) or isinf(b) or a < lower or b > upper:
+        raise ValueError("invalid a and b")
+
+    starting_points = ((a + b) / 2.,) if abscissae is None else tuple(abscissae)
+
+    for x in (a, b) + starting_points:
+        if x < lower or x > upper:
+            raise ValueError("abscissae must lie in the domain")
+
+        evaluate(x)
+
+    n_refinements = 0
+
+    for _ in range(max_evaluations):
+        k = int(np.argmax(fS))
+        mode, max_value = S[k], fS[k]
+        spread = S[-1] - S[0]
+
+        x = None
+
+        if k == 0 and S[0] > lower:
+            # bracket the mode from the left
+            x = S[0] - 2. * spread
+            if x < lower:
+                x = None if S[0] - lower <= 1e-3 * spread else (S[0] + lower) / 2.
+
+        elif k == len(S) - 1 and S[-1] < upper:
+            # bracket the mode from the right
+            x = S[-1] + 2. * spread
+            if x > upper:
+                x = None if upper - S[-1] <= 1e-3 * spread else (S[-1] + upper) / 2.
+
+        elif 0 < k < len(S) - 1 and n_refinements < max_refinements:
+            # refine the mode
+            vertex = _parabola_vertex(S[k - 1:k + 2], fS[k - 1:k + 2])
+
+            if (vertex is not None and S[k - 1] < vertex < S[k + 1] and
+                    abs(vertex - mode) > 1e-3 * (S[k + 1] - S[k - 1])):
+                x = vertex
+                n_refinements += 1
+
+        if x is None:
+            for points, values, edge in (
+                (S[k - 1::-1] if k else [], fS[k - 1::-1] if k else [], lower),
+                (S[k + 1:], fS[k + 1:], upper),
+            ):
+                x = _flank_candidate(
+                    points, [max_value - value for value in values], mode, edge,
+                    min_drop=min_drop, max_drop=max_drop
+                )
+                if x is not None:
+                    break
+
+        if x is None:
+            break
+
+        evaluate(x)
+
+    k = int(np.argmax(fS))
+    if (k == 0 and isinf(lower)) or (k == len(S) - 1 and isinf(upper)):
+        raise ValueError("could not bracket the mode of logpdf")
+
+    while len(S) < 4:
+        # split the widest interval
+        i = int(np.argmax(np.diff(S)))
+        evaluate((S[i] + S[i + 1]) / 2.)
+
+    return S
+
+
+class SamplerStats(object):
+    """
+    Performance counters of an `ARSampler`, updated while it samples
+    (see `ARSampler.stats`).
+
+    Attributes
+    ----------
+    n_samples : int
+        Number of samples drawn.
+
+    n_candidates : int
+        Number of candidates drawn from the upper hull.
+
+    n_squeezed : int
+        Number of candidates accepted by the squeeze test,
+        i.e. without evaluating `logpdf`.
+
+    n_bounded : int
+        Number of candidates that failed the squeeze test but were accepted
+        by `logpdf_lower_bound`, i.e. `logpdf` evaluations avoided by it.
+
+    n_bound_evaluations : int
+        Number of points `logpdf_lower_bound` was evaluated at.
+
+    n_evaluations : int
+        Number of points `logpdf` was evaluated at by the sampler,
+        including its initial mesh.
+
+    n_hull_updates : int
+        Number of points inserted into the hulls incrementally.
+
+    n_hull_rebuilds : int
+        Number of times the hulls were computed from scratch.
+
+    n_abscissae : int
+        Current number of points in the mesh.
+
+    max_n_abscissae : int
+        Largest number of points the mesh held so far.
+
+    n_upper_segments : int
+        Current number of upper hull segments.
+
+    timings : dict or None
+        Seconds spent drawing candidates and evaluating the hulls
+        (`"envelope"`), evaluating `logpdf` (`"logpdf"`) and
+        `logpdf_lower_bound` (`"lower_bound"`), updating and
+        rebuilding the hulls (`"hulls"`) and in the compiled kernel
+        (`"kernel"`), if the sampler was created with `profile=True`.
+
+    """
+    def __init__(self, profile: bool=False):
+        self.n_samples, self.n_candidates, self.n_squeezed = 0, 0, 0
+        self.n_bounded, self.n_bound_evaluations = 0, 0
+        self.n_evaluations = 0
+        self.n_hull_updates, self.n_hull_rebuilds = 0, 0
+        self.n_abscissae, self.max_n_abscissae, self.n_upper_segments = 0, 0, 0
+
+        self.timings = None
+
+        if profile:
+            self.timings = dict.fromkeys(("envelope", "logpdf", "lower_bound", "hulls", "kernel"), 0.)
+
+    @property
+    def acceptance_rate(self):
+        """ Fraction of candidates that were accepted. """
+        return self.n_samples / max(self.n_candidates, 1)
+
+    @property
+    def squeeze_rate(self):
+        """ Fraction of candidates accepted by the squeeze test. """
+        return self.n_squeezed / max(self.n_candidates, 1)
+
+    def __repr__(self):
+        return "SamplerStats({})".format(", ".join(
+            "{}={!r}".format(name, value) for name, value in (
+                *vars(self).items(),
+                ("acceptance_rate", self.acceptance_rate),
+                ("squeeze_rate", self.squeeze_rate),
+            )
+        ))
+
+
+def _timed(function, timings, phase):
+    """ Wrap `function` to add the time spent in it to `timings[phase]`. """
+    def timed_function(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            timings[phase] += perf_counter() - start
+
+    return timed_function
+
+
+class ARSampler(object):
+    """
+    Adaptive rejection sampler that keeps its mesh, the `logpdf` values
+    on that mesh, its hulls and its random stream between calls.
+    Every call to `sample` or `draw` continues to refine the same hulls,
+    so repeated sampling from the same target only pays for adaptation once.
+
+    Parameters
+    ----------
+    logpdf: callable
+        Univariate function that computes :math:`log(f(u))`
+        for a given :math:`u`, where :math:`f(u)` is proportional
+        to the target density to sample from.
+        If this is an `arspy.ars.CachedLogpdf`, all points it has
+        already been evaluated at are added to the initial mesh
+        and its counters are updated during sampling.
+
+    a: float
+        Lower starting point used to initialize the hulls.
+        Must lie in the domain of the logpdf and it
+        must hold: :math:`a < b`.
+
+    b: float
+        Upper starting point used to initialize the hulls.
+        Must lie in the domain of the logpdf and it
+        must hold: :math:`a < b`.
+
+    domain : Tuple[float, float]
+        Domain of `logpdf`.
+        May be unbounded on either or both sides,
+        in which case `(float("-inf"), float("inf"))`
+        would be passed.
+        If this domain is unbounded to the left,
+        the derivative of the logpdf
+        for x<= a must be positive.
+        If this domain is unbounded to the right the derivative of the logpdf for x>=b
+        must be negative.
+
+    random_stream : RandomState or Generator, optional
+        Seeded random number generator object with same interface as a NumPy
+        RandomState object. Defaults to `None` in which case a NumPy
+        RandomState seeded from `/dev/urandom` if available or the clock if not
+        will be used.
+        A NumPy `Generator` (e.g. `numpy.random.default_rng(seed)`)
+        may be passed instead.
+        Uniform random values are drawn from it on demand, so that it
+        advances by exactly the values used. An
+        `arspy.probability_utils.UniformStream` wrapping it is used as is,
+        which draws values in blocks (faster, but the stream runs ahead of the
+        values used) and lets short-lived samplers share one buffer.
+        Streams the sampler creates itself are always buffered.
+
+    block_size : int, optional
+        If given, sample in rounds of `block_size` candidates each,
+        see `adaptive_rejection_sampling`.
+
+    abscissae : iterable, optional
+        Additional points to add to the initial mesh, e.g.
+        the `abscissae` of another sampler for the same or a similar
+        target (see `ARSampler.from_sampler`).
+        Must lie in the domain of the logpdf.
+
+    dlogpdf : callable, optional
+        Derivative of `logpdf`. If given, the upper hull is built from
+        tangents instead of extended secants, which gives a tighter envelope
+        and thus fewer rejections and `logpdf` evaluations.
+        If `logpdf` is an `arspy.ars.CachedLogpdf`, pass the derivative
+        to it instead.
+
+    freeze_acceptance_rate : float, optional
+        If given, `freeze` the sampler as soon as its `efficiency`
+        reaches this value.
+        Defaults to `None`, in which case the hulls are refined indefinitely
+        unless `freeze` is called or `max_abscissae` is reached.
+
+    max_abscissae : int, optional
+        If given, `freeze` the sampler as soon as its mesh holds
+        at least this many points, which bounds memory and hull update cost.
+        In block mode, the last round may exceed this budget.
+        Defaults to `None`, in which case the mesh size is not bounded.
+
+    prune_to : int, optional
+        If given, keep refining the hulls but `prune` the mesh back to
+        this many points whenever it grows larger, so that memory and
+        per-step cost stay bounded for long-running samplers
+        (e.g. of a slowly drifting target). Must be at least 4.
+        Defaults to `None`, in which case the mesh is never pruned.
+
+    compiled : bool, optional
+        If `True`, draw candidates one at a time with
+        `arspy.kernels.sample_kernel`, which is compiled with numba if it is
+        installed (`logpdf` is then compiled as well and must be supported by
+        `numba.njit`) and runs in the interpreter otherwise.
+        Both backends give identical results. The hulls are only
+        pruned, frozen and made available between runs of the kernel, i.e.
+        every few thousand candidates. Not supported with `block_size`
+        or `dlogpdf`. Defaults to `False`.
+
+    n_workers : int, optional
+        If given, sample speculatively for expensive `logpdf` functions:
+        each round draws enough candidates from the current envelope
+        to keep (on average) `n_workers` `logpdf` evaluations in flight,
+        evaluates all candidates that fail the squeeze test concurrently
+        and then applies the accept/reject decisions in candidate order,
+        refining the hulls once per round. As in block mode, all candidates
+        of a round are tested against the same hulls, so samples are exact.
+        Evaluations run on a pool of `n_workers` threads (so `logpdf` should
+        release the GIL, e.g. run a simulator or NumPy code) or, if `logpdf`
+        is a coroutine function (`async def`), are awaited concurrently.
+        The pool is created on first use and shut down by `close`
+        (or at the end of a `with` block). Not supported with `block_size`
+        or `compiled`. Defaults to `None`, in which case candidates are
+        evaluated one at a time.
+
+    auto_init : bool or dict, optional
+        If `True`, build the initial mesh with `find_initial_abscissae`,
+        starting the search from `a`, `b` and `abscissae`, which then
+        need not lie near the mode or on either side of it.
+        A dict is passed to `find_initial_abscissae` as further keyword arguments.
+        Defaults to `False`, in which case the mesh consists of
+        `a`, `b`, three points in between and `abscissae`.
+
+    profile : bool, optional
+        If `True`, record the time spent in each phase of sampling
+        in `stats.timings`. Defaults to `False`.
+
+    on_mesh_update : callable, optional
+        Function called as `on_mesh_update(sampler)` whenever points
+        were added to the mesh and the hulls were updated (in block mode,
+        compiled mode and speculative mode, once per round).
+
+    logpdf_lower_bound : callable, optional
+        Cheap lower bound of `logpdf` (e.g. from Jensen's inequality or a
+        truncated sum), called like `logpdf` (on arrays in block mode).
+        Candidates that fail the squeeze test are accepted without
+        evaluating `logpdf` if they pass the same test against this bound.
+        Samples remain exact as long as the bound holds everywhere, but
+        such candidates are not added to the mesh. Counted in
+        `stats.n_bounded`. Not supported with `compiled`.
+        Defaults to `None`, in which case `logpdf` is evaluated directly.
+
+    executor : concurrent.futures.Executor, optional
+        Pool to run the evaluations of speculative sampling on instead of a
+        pool of `n_workers` threads owned by the sampler, e.g. to share one
+        pool between many short-lived samplers. It is not shut down by
+        `close`. Requires `n_workers`. Defaults to `None`.
+
+    Examples
+    ----------
+    >>> from numpy.random import RandomState
+    >>> sampler = ARSampler(logpdf=lambda x: -x ** 2, a=-2, b=2, domain=(float("-inf"), float("inf")), random_stream=RandomState(seed=1))
+    >>> len(sampler.sample(1000))
+    1000
+    >>> x = sampler.draw()  # continues to refine the same hulls
+    >>> sampler.stats.n_samples
+    1001
+
+    A new sampler for the same target can be warm-started from the refined mesh:
+
+    >>> warm_sampler = ARSampler.from_sampler(sampler)
+    >>> warm_sampler.abscissae == sampler.abscissae
+    True
+
+    Once the hulls are tight, freezing them makes large draws cheap:
+
+    >>> sampler.freeze()
+    >>> len(sampler.sample(100000))
+    100000
+
+    """
+    def __init__(self, logpdf: callable,
+                 a: float, b: float,
+                 domain: Tuple[float, float],
+                 random_stream=None,
+                 block_size: int=None,
+                 abscissae=None,
+                 dlogpdf: callable=None,
+                 freeze_acceptance_rate: float=None,
+                 max_abscissae: int=None,
+                 prune_to: int=None,
+                 compiled: bool=False,
+                 n_workers: int=None,
+                 auto_init=False,
+                 profile: bool=False,
+                 on_mesh_update: callable=None,
+                 logpdf_lower_bound: callable=None,
+                 executor=None):
+        assert(hasattr(logpdf, "__call__"))
+        assert(logpdf_lower_bound is None or hasattr(logpdf_lower_bound, "__call__"))
+        assert(len(domain) == 2), "Domain must be two-element iterable."
+        assert(domain[1] >= domain[0]), "Invalid domain, it must hold: domain[1] >= domain[0]."
+        assert(block_size is None or block_size > 0), "Block size must be > 0."
+        assert(prune_to is None or prune_to >= 4), "At least four abscissae must be kept."
+        assert(not compiled or (block_size is None and dlogpdf is None)), "Compiled sampling does not support 'block_size' or 'dlogpdf'."
+        assert(n_workers is None or n_workers > 0), "Number of workers must be > 0."
+        assert(n_workers is None or (block_size is None and not compiled)), "Speculative sampling does not support 'block_size' or 'compiled'."
+        assert(logpdf_lower_bound is None or not compiled), "Compiled sampling does not support 'logpdf_lower_bound'."
+        assert(executor is None or n_workers is not None), "An executor requires 'n_workers'."
+
+        owns_random_stream = random_stream is None
+
+        if random_stream is None:
+            random_stream = RandomState()
+
+        if iscoroutinefunction(logpdf):
+            logpdf = _AwaitedLogpdf(logpdf)
+
+        if not isinstance(logpdf, CachedLogpdf):
+            logpdf = CachedLogpdf(logpdf, dlogpdf=dlogpdf)
+        elif dlogpdf is not None:
+            raise ValueError("pass 'dlogpdf' to the given CachedLogpdf instead")
+
+        if a >= b or isinf(a) or isinf(b) or a < domain[0] or b > domain[1]:
+            raise ValueError("invalid a and b")
+
+        self.logpdf = logpdf
+        self.a, self.b = a, b
+        self.domain = domain
+        self.random_stream = random_stream
+        self._uniforms = sampler_uniform_stream(random_stream, owned=owns_random_stream)
+        self.block_size = block_size
+        self.freeze_acceptance_rate = freeze_acceptance_rate
+        self.max_abscissae = max_abscissae
+        self.prune_to = prune_to
+        self.compiled = compiled
+        self.n_workers = n_workers
+        self.auto_init = auto_init
+        self.on_mesh_update = on_mesh_update
+        self.logpdf_lower_bound = logpdf_lower_bound
+        self.executor = executor
+
+        self.frozen = False
+
+        self.stats = SamplerStats(profile=profile)
+        self._n_previous_evaluations = logpdf.n_evaluations
+
+        self._sample_upper_hull, self._evaluate_hulls = sample_upper_hull, evaluate_hulls
+        self._compute_hulls, self._update_hulls = compute_hulls, update_hulls
+        self._evaluate_logpdf, self._evaluate_logpdf_array = logpdf, logpdf.evaluate_array
+        self._evaluate_uncached, self._sample_kernel = logpdf.logpdf, sample_kernel
+        # the map function does not refer back to the sampler, so that
+        # a sampler that is no longer used releases its threads
+        self._map = _ConcurrentMap(n_workers, executor=executor)
+        self._evaluate_concurrently = partial(self._map, logpdf.logpdf)
+        self._evaluate_lower_bound = logpdf_lower_bound
+
+        if profile:
+            timings = self.stats.timings
+            for attribute, phase in (
+                ("_sample_upper_hull", "envelope"), ("_evaluate_hulls", "envelope"),
+                ("_compute_hulls", "hulls"), ("_update_hulls", "hulls"),
+                ("_evaluate_logpdf", "logpdf"), ("_evaluate_logpdf_array", "logpdf"),
+                ("_evaluate_uncached", "logpdf"), ("_evaluate_concurrently", "logpdf"),
+                ("_evaluate_lower_bound", "lower_bound"), ("_sample_kernel", "kernel"),
+            ):
+                if getattr(self, attribute) is not None:
+                    setattr(self, attribute, _timed(getattr(self, attribute), timings, phase))
+
+        if auto_init:
+            find_initial_abscissae(
+                self._evaluate_logpdf, a=a, b=b, domain=domain, abscissae=abscissae,
+                **(auto_init if isinstance(auto_init, dict) else {})
+            )
+        else:
+            n_derivative_steps = 1e-3 * (b - a)
+
+            S = (a, a + n_derivative_steps, b - n_derivative_steps, b)
+
+            if domain[0] == float("-inf"):
+                # ensure positive derivative at 'a'
+                derivative_sign = sign(logpdf(a + n_derivative_steps) - logpdf(a))
+                positive_derivative = derivative_sign > 0
+
+                assert(positive_derivative), "derivative at 'a' must be positive, since the domain is unbounded to the left"
+
+            if domain[1] == float("inf"):
+                # ensure negative derivative at 'b'
+                derivative_sign = sign(logpdf(b) - logpdf(b - n_derivative_steps))
+                negative_derivative = derivative_sign < 0
+
+                assert(negative_derivative), "derivative at 'b' must be negative, since the domain is unbounded to the right"
+
+            # initialize a mesh on which to create upper & lower hulls
+            n_initial_mesh_points = 3
+
+            for s in unique(
+                (S[0], *(linspace(S[1], S[2], num=n_initial_mesh_points + 2)), S[3],
+                 *(() if abscissae is None else abscissae))
+            ):
+                if s < domain[0] or s > domain[1]:
+                    raise ValueError("abscissae must lie in the domain")
+
+                self._evaluate_logpdf(s)
+
+        self._rebuild_hulls()
+
+        self._check_mesh()
+        self._update_stats()
+
+    @classmethod
+    def from_sampler(cls, sampler, logpdf: callable=None, random_stream=None,
+                     dlogpdf: callable=None):
+        """
+        Warm-start a new sampler from the mesh of `sampler`.
+
+        Parameters
+        ----------
+        sampler : arspy.ars.ARSampler
+            Sampler whose `abscissae`, `a`, `b`, `domain` and `block_size`
+            are used to initialize the new sampler.
+
+        logpdf : callable, optional
+            Target of the new sampler, e.g. a conditional whose parameters
+            changed slightly since `sampler` was used.
+            Defaults to `None`, in which case the new sampler targets the same
+            `logpdf` as `sampler` and reuses all of its `logpdf` values.
+
+        random_stream : RandomState or Generator, optional
+            Random stream of the new sampler, see `ARSampler`.
+
+        dlogpdf : callable, optional
+            Derivative of the new `logpdf`, see `ARSampler`.
+            Ignored if `logpdf` is `None`.
+
+        Returns
+        ----------
+        sampler : arspy.ars.ARSampler
+            New, independent sampler, which keeps the `logpdf_lower_bound`
+            of `sampler` if it targets the same `logpdf`.
+
+        """
+        # a bound of the old target need not hold for a new one
+        logpdf_lower_bound = sampler.logpdf_lower_bound if logpdf is None else None
+
+        if logpdf is None:
+            logpdf = CachedLogpdf(sampler.logpdf.logpdf, dlogpdf=sampler.logpdf.dlogpdf)
+            logpdf.abscissae = list(sampler.abscissae)
+            logpdf.values = list(sampler.values)
+
+            if sampler.derivatives is not None:
+                logpdf.derivatives = list(sampler.derivatives)
+        elif not isinstance(logpdf, CachedLogpdf):
+            logpdf = CachedLogpdf(logpdf, dlogpdf=dlogpdf)
+
+        return cls(
+            logpdf=logpdf, a=sampler.a, b=sampler.b, domain=sampler.domain,
+            random_stream=random_stream, block_size=sampler.block_size,
+            abscissae=sampler.abscissae,
+            freeze_acceptance_rate=sampler.freeze_acceptance_rate,
+            max_abscissae=sampler.max_abscissae,
+            prune_to=sampler.prune_to,
+            compiled=sampler.compiled,
+            n_workers=sampler.n_workers,
+            auto_init=sampler.auto_init,
+            profile=sampler.stats.timings is not None,
+            on_mesh_update=sampler.on_mesh_update,
+            logpdf_lower_bound=logpdf_lower_bound,
+            executor=sampler.executor
+        )
+
+    @classmethod
+    def from_samples(cls, logpdf: callable, samples, domain: Tuple[float, float],
+                     probabilities=(0.02, 0.16, 0.5, 0.84, 0.98), **kwargs):
+        """
+        Create a sampler whose initial mesh is seeded with quantiles of
+        `samples`, e.g. of a previous run on a similar target, and completed
+        by `find_initial_abscissae`.
+
+        Parameters
+        ----------
+        logpdf : callable
+            Target of the new sampler, see `ARSampler`.
+
+        samples : iterable
+            Samples approximately distributed like the target.
+
+        domain : Tuple[float, float]
+            Domain of `logpdf`, see `ARSampler`.
+
+        probabilities : Tuple[float, ...], optional
+            Probabilities of the quantiles of `samples` to start from.
+
+        kwargs
+            Further keyword arguments of `ARSampler`.
+
+        Returns
+        ----------
+        sampler : arspy.ars.ARSampler
+            New sampler.
+
+        """
+        quantiles = unique(np.quantile(np.asarray(samples, dtype=float), probabilities))
+        quantiles = quantiles[(quantiles >= domain[0]) & (quantiles <= domain[1])]
+
+        assert(len(quantiles) >= 2), "'samples' must have at least two distinct quantiles in the domain."
+
+        return cls(
+            logpdf=logpdf, a=float(quantiles[0]), b=float(quantiles[-1]),
+            domain=domain, abscissae=quantiles[1:-1].tolist(), auto_init=True,
+            **kwargs
+        )
+
+    def save(self, file):
+        """
+        Save the state of the sampler (mesh, `logpdf` values, hulls, settings,
+        counters and random state) to an uncompressed `.npz` file,
+        e.g. to checkpoint a long run or to keep a library of refined
+        envelopes for targets that are sampled frequently.
+        Use `ARSampler.load` to resume sampling.
+
+        Parameters
+        ----------
+        file : str or file
+            File name or file-like object, see `numpy.savez`.
+
+        Examples
+        ----------
+        >>> from io import BytesIO
+        >>> from numpy.random import RandomState
+        >>> logpdf = lambda x: -x ** 2
+        >>> sampler = ARSampler(logpdf=logpdf, a=-2, b=2, domain=(float("-inf"), float("inf")), random_stream=RandomState(seed=1))
+        >>> samples = sampler.sample(100)
+        >>> checkpoint = BytesIO()
+        >>> sampler.save(checkpoint)
+        >>> _ = checkpoint.seek(0)
+        >>> restored = ARSampler.load(checkpoint, logpdf=logpdf)
+        >>> restored.sample(100) == sampler.sample(100)
+        True
+
+        """
+        uniforms = self._uniforms
+        random_stream = uniforms.random_stream
+
+        if isinstance(random_stream, RandomState):
+            random_state = random_stream.get_state(legacy=False)
+        else:
+            random_state = random_stream.bit_generator.state
+
+        settings = dict(
+            a=self.a, b=self.b, domain=self.domain, block_size=self.block_size,
+            freeze_acceptance_rate=self.freeze_acceptance_rate,
+            max_abscissae=self.max_abscissae, prune_to=self.prune_to,
+            compiled=self.compiled, n_workers=self.n_workers,
+            auto_init=self.auto_init, frozen=self.frozen,
+            n_evaluations=self.logpdf.n_evaluations,
+            n_saved_evaluations=self.logpdf.n_saved_evaluations,
+            random_stream=type(random_stream).__name__, random_state=random_state,
+            stats=vars(self.stats),
+        )
+
+        arrays = dict(
+            abscissae=self.abscissae, values=self.values,
+            uniform_buffer=np.asarray(uniforms._buffer, dtype=float),
+            settings=json.dumps(settings, default=_to_json),
+        )
+
+        if self.derivatives is not None:
+            arrays["derivatives"] = self.derivatives
+
+        for name, hull in (("lower", self.lower_hull), ("upper", self.upper_hull)):
+            for attribute in ("m", "b", "left", "right", "log_pr", "pr"):
+                if getattr(hull, attribute) is not None:
+                    arrays["{}_{}".format(name, attribute)] = getattr(hull, attribute)
+
+        np.savez(file, **arrays)
+
+    @classmethod
+    def load(cls, file, logpdf: callable, dlogpdf: callable=None,
+             random_stream=None, **kwargs):
+        """
+        Restore a sampler saved with `ARSampler.save`, without any
+        `logpdf` evaluations, e.g. to resume a checkpointed run or to start
+        worker processes with a refined envelope. Continuing to sample from it gives the same
+        samples the saved sampler would have given, unless `random_stream`
+        is passed, e.g. to start independent chains from a shared envelope.
+
+        Parameters
+        ----------
+        file : str or file
+            File name or file-like object, see `numpy.load`.
+
+        logpdf : callable
+            Target of the saved sampler (functions are not saved).
+
+        dlogpdf : callable, optional
+            Derivative of `logpdf`, if the saved sampler used one.
+
+        random_stream : RandomState or Generator, optional
+            Random stream of the restored sampler.
+            Defaults to `None`, in which case the saved random state is restored.
+
+        kwargs
+            Further keyword arguments of `ARSampler` that are not saved
+            (`profile`, `on_mesh_update` and `logpdf_lower_bound`).
+
+        Returns
+        ----------
+        sampler : arspy.ars.ARSampler
+            Restored sampler.
+
+        """
+        with np.load(file) as data:
+            arrays = {name: data[name] for name in data.files}
+
+        settings = json.loads(str(arrays["settings"]))
+
+        if "derivatives" in arrays:
+            assert(dlogpdf is not None), "The saved sampler used 'dlogpdf', it must be given."
+
+        cached_logpdf = CachedLogpdf(logpdf, dlogpdf=dlogpdf if "derivatives" in arrays else None)
+        cached_logpdf.abscissae = arrays["abscissae"].tolist()
+        cached_logpdf.values = arrays["values"].tolist()
+
+        if "derivatives" in arrays:
+            cached_logpdf.derivatives = arrays["derivatives"].tolist()
+
+        restore_random_state = random_stream is None
+
+        if restore_random_state:
+            state = settings["random_state"]
+            bit_generator = getattr(np.random, state["bit_generator"])()
+
+            if settings["random_stream"] == "RandomState":
+                random_stream = RandomState(bit_generator)
+                random_stream.set_state(state)
+            else:
+                bit_generator.state = state
+                random_stream = np.random.Generator(bit_generator)
+
+        abscissae = cached_logpdf.abscissae
+
+        # the saved mesh is complete, so the initial mesh search evaluates nothing
+        sampler = cls(
+            logpdf=cached_logpdf, a=abscissae[0], b=abscissae[-1],
+            domain=tuple(settings["domain"]), random_stream=random_stream,
+            block_size=settings["block_size"], abscissae=abscissae[1:-1],
+            freeze_acceptance_rate=settings["freeze_acceptance_rate"],
+            max_abscissae=settings["max_abscissae"], prune_to=settings["prune_to"],
+            compiled=settings["compiled"], n_workers=settings["n_workers"],
+            auto_init={"max_evaluations": 0}, **kwargs
+        )
+        sampler.a, sampler.b = settings["a"], settings["b"]
+        sampler.auto_init = settings["auto_init"]
+
+        # the constructor's lookups of the saved mesh count as saved evaluations
+        cached_logpdf.n_evaluations = settings["n_evaluations"]
+        cached_logpdf.n_saved_evaluations = settings["n_saved_evaluations"]
+        sampler._n_previous_evaluations = cached_logpdf.n_evaluations
+
+        sampler.lower_hull, sampler.upper_hull = (
+            Hull(**{
+                attribute: arrays["{}_{}".format(name, attribute)]
+                for attribute in ("m", "b", "left", "right", "log_pr", "pr")
+                if "{}_{}".format(name, attribute) in arrays
+            })
+            for name in ("lower", "upper")
+        )
+
+        sampler.frozen = False
+        if settings["frozen"]:
+            sampler.freeze()
 
-__author__ = (
-    "Moritz Freidank"
-)
+        if restore_random_state:
+            sampler._uniforms._buffer[:] = arrays["uniform_buffer"].tolist()
+
+        timings = sampler.stats.timings
+        vars(sampler.stats).update(settings["stats"])
+        sampler.stats.timings = timings
+
+        return sampler
+
+    @property
+    def abscissae(self):
+        """ Sorted points of the current mesh. """
+        return self.logpdf.abscissae
+
+    @property
+    def values(self):
+        """ Values of `logpdf` at each point in `abscissae`. """
+        return self.logpdf.values
+
+    @property
+    def derivatives(self):
+        """
+        Values of `dlogpdf` at each point in `abscissae`,
+        `None` unless the sampler uses tangents.
+        """
+        return self.logpdf.derivatives
+
+    def freeze(self):
+        """
+        Stop refining the hulls and sample from the current envelope only.
+
+        Frozen samplers select upper hull segments in constant time
+        using an alias table and draw and squeeze-test candidates in large
+        vectorized batches. `logpdf` is only evaluated for the few candidates
+        that fail the squeeze test and these points are no longer added to
+        the mesh. Samples remain exact.
+        """
+        self.frozen = True
+        self._alias_table = alias_table(self.upper_hull.pr)
+        self._squeeze_rate = self.efficiency
+
+    @property
+    def efficiency(self):
+        """
+        Ratio of lower to upper hull mass.
+        This is the probability that a candidate passes the squeeze test
+        and thus a lower bound on the acceptance rate, obtained
+        from the hulls without any `logpdf` evaluations.
+        """
+        return float(exp(self.lower_hull.log_mass() - self.upper_hull.log_mass()))
+
+    def prune(self, n_abscissae: int):
+        """
+        Remove the mesh points that contribute least to the hulls until
+        at most `n_abscissae` points remain and rebuild the hulls
+        (see `arspy.hull.prune_mesh`).
+
+        Parameters
+        ----------
+        n_abscissae : int
+            Maximal number of points to keep, must be at least 4.
+
+        """
+        if len(self.abscissae) <= n_abscissae:
+            return
+
+        prune_mesh(
+            S=self.abscissae, fS=self.values, n_abscissae=n_abscissae,
+            dfS=self.derivatives
+        )
+
+        self._rebuild_hulls()
+
+        if self.frozen:
+            # refresh the alias table for the new hulls
+            self.freeze()
+
+    def _rebuild_hulls(self):
+        """ Compute both hulls from scratch for the current mesh. """
+        self.lower_hull, self.upper_hull = self._compute_hulls(
+            S=self.abscissae, fS=self.values, domain=self.domain,
+            dfS=self.derivatives
+        )
+
+        self.stats.n_hull_rebuilds += 1
+
+    def _update_stats(self):
+        """ Update the counters in `stats` that are read from the sampler. """
+        stats = self.stats
+
+        stats.n_evaluations += self.logpdf.n_evaluations - self._n_previous_evaluations
+        self._n_previous_evaluations = self.logpdf.n_evaluations
+
+        stats.n_abscissae, stats.n_upper_segments = len(self.abscissae), len(self.upper_hull)
+        stats.max_n_abscissae = max(stats.max_n_abscissae, stats.n_abscissae)
+
+    def _check_mesh(self):
+        """ Prune or freeze the sampler after its mesh changed, if requested. """
+        self.stats.max_n_abscissae = max(self.stats.max_n_abscissae, len(self.abscissae))
+
+        if self.frozen:
+            return
+
+        if self.prune_to is not None:
+            self.prune(self.prune_to)
+
+        if self.max_abscissae is not None and len(self.abscissae) >= self.max_abscissae:
+            self.freeze()
+        elif (self.freeze_acceptance_rate is not None and
+              self.efficiency >= self.freeze_acceptance_rate):
+            self.freeze()
+
+    def close(self):
+        """
+        Shut down the pool of threads of speculative sampling (see `n_workers`),
+        unless it was passed in as `executor`. The sampler can still be used,
+        a new pool is created when needed.
+        """
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def draw(self):
+        """
+        Draw a single sample.
+
+        Returns
+        ----------
+        sample : float
+            A sample drawn from the target distribution.
+
+        """
+        return self.sample(1)[0]
+
+    def sample(self, n_samples: int=None, out=None, dtype=None):
+        """
+        Draw `n_samples` samples, refining the hulls along the way.
+
+        Parameters
+        ----------
+        n_samples: int, optional
+            Number of samples to draw. Defaults to `len(out)` if `out` is given.
+
+        out : np.ndarray, optional
+            Preallocated one-dimensional array (or `numpy.memmap`) to write
+            the samples to, chunk by chunk. Must hold at least `n_samples` values.
+
+        dtype : data-type, optional
+            If given, return the samples as a new NumPy array of this type.
+
+        Returns
+        ----------
+        samples : list or np.ndarray
+            A list of samples drawn from the
+            target distribution :math:`f`
+            with the given `logpdf`, or an array if `out` or `dtype` is given
+            (`out[:n_samples]`, if `out` is given).
+
+        """
+        if n_samples is None:
+            assert(out is not None), "Either 'n_samples' or 'out' must be given."
+            n_samples = len(out)
+
+        assert(n_samples >= 0), "Number of samples must be >= 0."
+
+        if out is None and dtype is None:
+            return self._sample_array(n_samples).tolist()
+
+        if out is None:
+            out = np.empty(n_samples, dtype=dtype)
+
+        assert(out.ndim == 1 and len(out) >= n_samples), "'out' must hold 'n_samples' values."
+
+        n_drawn = 0
+
+        for samples in self.stream(n_samples):
+            out[n_drawn:n_drawn + len(samples)] = samples
+            n_drawn += len(samples)
+
+        return out[:n_samples]
+
+    def stream(self, n_samples: int=None, chunk_size: int=2 ** 16):
+        """
+        Yield samples in chunks as they are drawn, refining the hulls
+        along the way, so that arbitrarily many samples can be
+        processed without holding all of them in memory.
+
+        Parameters
+        ----------
+        n_samples: int, optional
+            Total number of samples to draw.
+            Defaults to `None`, in which case chunks are yielded indefinitely.
+
+        chunk_size : int, optional
+            Number of samples per chunk (the last chunk may be smaller),
+            defaults to 65536.
+
+        Yields
+        ----------
+        samples : np.ndarray
+            Next chunk of samples drawn from the target distribution.
+
+        Examples
+        ----------
+        >>> from numpy.random import RandomState
+        >>> sampler = ARSampler(logpdf=lambda x: -x ** 2, a=-2, b=2, domain=(float("-inf"), float("inf")), random_stream=RandomState(seed=1))
+        >>> [len(samples) for samples in sampler.stream(2500, chunk_size=1000)]
+        [1000, 1000, 500]
+
+        """
+        assert(chunk_size > 0), "Chunk size must be > 0."
+
+        n_drawn = 0
+
+        while n_samples is None or n_drawn < n_samples:
+            size = chunk_size if n_samples is None else min(chunk_size, n_samples - n_drawn)
+
+            yield self._sample_array(size)
+
+            n_drawn += size
+
+    def _sample_array(self, n_samples):
+        """ Draw `n_samples` samples and return them as an array. """
+        samples = np.empty(0)
+
+        if not self.frozen:
+            if self.block_size is not None:
+                samples = self._sample_blocks(n_samples)
+            elif self.n_workers is not None:
+                samples = self._sample_speculative(n_samples)
+            elif self.compiled:
+                samples = self._sample_compiled(n_samples)
+            else:
+                samples = np.asarray(self._sample_scalar(n_samples), dtype=float)
+
+        if len(samples) < n_samples:
+            # sampler was frozen (during this call)
+            samples = np.concatenate((samples, self._sample_frozen(n_samples - len(samples))))
+
+        self.stats.n_samples += len(samples)
+        self._update_stats()
+
+        return samples
+
+    def _sample_scalar(self, n_samples):
+        """
+        Draw up to `n_samples` samples one candidate at a time,
+        stops early if the sampler is frozen.
+        """
+        domain, random_stream = self.domain, self._uniforms
+        S, fS, dfS = self.abscissae, self.values, self.derivatives
+        lower_hull, upper_hull = self.lower_hull, self.upper_hull
+
+        logpdf, on_mesh_update = self._evaluate_logpdf, self.on_mesh_update
+        cached_logpdf, lower_bound = self.logpdf, self._evaluate_lower_bound
+        sample_upper_hull, evaluate_hulls = self._sample_upper_hull, self._evaluate_hulls
+        update_hulls = self._update_hulls
+
+        samples = []
+        n_candidates, n_squeezed, n_bounded, n_hull_updates = 0, 0, 0, 0
+
+        while len(samples) < n_samples and not self.frozen:
+
+            mesh_changed = False
+
+            x = sample_upper_hull(upper_hull, random_stream=random_stream)
+
+            lh_val, uh_val = evaluate_hulls(x, lower_hull, upper_hull)
+
+            U = random_stream.rand()
+
+            n_candidates += 1
+
+            if log(U) <= lh_val - uh_val:
+                # accept u is below lower bound
+                samples.append(x)
+                n_squeezed += 1
+
+            elif lower_bound is not None and log(U) <= lower_bound(x) - uh_val:
+                # accept, u is below the lower bound of `logpdf`
+                samples.append(x)
+                n_bounded += 1
+
+            else:
+                n_evaluations = cached_logpdf.n_evaluations
+
+                fx = logpdf(x)
+
+                if log(U) <= fx - uh_val:
+                    # accept, u is between lower bound and f
+                    samples.append(x)
+
+                # otherwise reject, u is between f and upper_bound
+                # (`x` may already be a mesh point, which `logpdf` returns from its cache)
+                mesh_changed = cached_logpdf.n_evaluations > n_evaluations
+
+            if mesh_changed:
+                # insert `x` into the mesh, only hull segments next to it change
+                # (`logpdf` already added `x` with its values to `S`, `fS` and `dfS`)
+                update_hulls(
+                    S=S, fS=fS, lower_hull=lower_hull, upper_hull=upper_hull,
+                    x=x, fx=fx, domain=domain, dfS=dfS
+                )
+                n_hull_updates += 1
+
+                self._check_mesh()
+
+                if on_mesh_update is not None:
+                    on_mesh_update(self)
+
+                # pruning replaces the hulls
+                lower_hull, upper_hull = self.lower_hull, self.upper_hull
+
+        self.stats.n_candidates += n_candidates
+        self.stats.n_squeezed += n_squeezed
+        self.stats.n_bounded += n_bounded
+        self.stats.n_hull_updates += n_hull_updates
+
+        if lower_bound is not None:
+            # the bound is evaluated for every candidate that fails the squeeze test
+            self.stats.n_bound_evaluations += n_candidates - n_squeezed
+
+        return samples
+
+    def _sample_compiled(self, n_samples):
+        """
+        Draw up to `n_samples` samples with `arspy.kernels.sample_kernel`,
+        stops early if the sampler is frozen.
+        """
+        logpdf = self.logpdf
+
+        if not hasattr(self, "_kernel_logpdf"):
+            self._kernel_logpdf = jit_logpdf(logpdf.logpdf)
+
+        samples, n_accepted = np.empty(n_samples), 0
+
+        while n_accepted < n_samples and not self.frozen:
+            # mesh with spare capacity for the kernel to insert points into
+            n = len(logpdf)
+            S, fS = np.empty(2 * n + 64), np.empty(2 * n + 64)
+            S[:n], fS[:n] = logpdf.abscissae, logpdf.values
+
+            # each sample takes at least one candidate (three values),
+            # so the kernel uses all values unless the mesh fills up first
+            U = self._uniforms.rand(3 * min(2 ** 12, n_samples - n_accepted))
+
+            n_new_samples, n_used, n_new, n_evaluations = self._sample_kernel(
+                self._kernel_logpdf, S=S, fS=fS, n=n, domain=self.domain,
+                U=U, samples=samples[n_accepted:]
+            )
+            n_accepted += n_new_samples
+
+            # unused values are handed out again, so that the random stream
+            # only advances by the values used (as in scalar mode)
+            self._uniforms.put_back(U[n_used:])
+
+            # each candidate that fails the squeeze test is evaluated once,
+            # even if it adds no point to the mesh
+            self.stats.n_candidates += n_used // 3
+            self.stats.n_squeezed += n_used // 3 - n_evaluations
+            logpdf.n_evaluations += n_evaluations
+
+            if n_new > n:
+                logpdf.abscissae[:], logpdf.values[:] = S[:n_new].tolist(), fS[:n_new].tolist()
+                self.stats.n_hull_updates += n_new - n
+
+                self._rebuild_hulls()
+
+                self._check_mesh()
+
+                if self.on_mesh_update is not None:
+                    self.on_mesh_update(self)
+
+        return samples[:n_accepted]
+
+    def _sample_blocks(self, n_samples):
+        """
+        Block mode, see `adaptive_rejection_sampling`.
+        Candidates within a round are independent trials of rejection sampling
+        against the same hulls, so accepting them in bulk keeps samples exact.
+
+        Rounds start with as many candidates as there are mesh points and
+        double in size up to `block_size`, so that the hulls are refined
+        on few points while they are still loose.
+        Stops early if the sampler is frozen.
+        """
+        random_stream, stats = self._uniforms, self.stats
+
+        samples, n_accepted = [np.empty(0)], 0
+
+        round_size = min(self.block_size, len(self.logpdf))
+
+        while n_accepted < n_samples and not self.frozen:
+            x = self._sample_upper_hull(self.upper_hull, random_stream=random_stream, size=round_size)
+
+            lh_val, uh_val = self._evaluate_hulls(x, self.lower_hull, self.upper_hull)
+
+            log_U = log(random_stream.rand(round_size))
+
+            # accept, u is below lower bound
+            accepted = log_U <= lh_val - uh_val
+
+            stats.n_candidates += round_size
+            stats.n_squeezed += int(np.count_nonzero(accepted))
+
+            if self.logpdf_lower_bound is not None:
+                self._test_lower_bound(x, log_U, uh_val, accepted)
+
+            evaluated = ~accepted
+
+            if evaluated.any():
+                fx = self._evaluate_logpdf_array(x[evaluated])
+
+                # accept, u is between lower bound and f
+                accepted[evaluated] = log_U[evaluated] <= fx - uh_val[evaluated]
+
+                # all evaluated points were added to the mesh, rebuild hulls once
+                self._rebuild_hulls()
+
+                self._check_mesh()
+
+                if self.on_mesh_update is not None:
+                    self.on_mesh_update(self)
+
+            samples.append(x[accepted])
+            n_accepted += len(samples[-1])
+
+            round_size = min(self.block_size, 2 * round_size)
+
+        return np.concatenate(samples)[:n_samples]
+
+    def _test_lower_bound(self, x, log_U, uh_val, accepted):
+        """
+        Accept (in place) the candidates that failed the squeeze test
+        (`accepted[i]` is `False`) but pass it against `logpdf_lower_bound`,
+        which is called on an array in block mode and per point otherwise.
+        """
+        tested = np.flatnonzero(~accepted)
+
+        if not len(tested):
+            return
+
+        if self.block_size is not None:
+            bound = np.asarray(self._evaluate_lower_bound(x[tested]), dtype=float)
+        else:
+            evaluate = self._evaluate_lower_bound
+            bound = np.asarray([evaluate(xi) for xi in x[tested]], dtype=float)
+
+        # accept, u is below the lower bound of `logpdf`
+        bounded = log_U[tested] <= bound - uh_val[tested]
+        accepted[tested[bounded]] = True
+
+        self.stats.n_bound_evaluations += len(tested)
+        self.stats.n_bounded += int(np.count_nonzero(bounded))
+
+    def _sample_speculative(self, n_samples):
+        """
+        Speculative mode, see `ARSampler`.
+        Each round draws enough candidates for about `n_workers` of them to
+        fail the squeeze test, evaluates those concurrently and keeps the
+        accepted candidates in the order they were drawn.
+        Stops early if the sampler is frozen.
+        """
+        random_stream, stats = self._uniforms, self.stats
+
+        samples, n_accepted = [np.empty(0)], 0
+
+        while n_accepted < n_samples and not self.frozen:
+            round_size = int(min(
+                2 ** 16, np.ceil(self.n_workers / max(1. - self.efficiency, 1e-3))
+            ))
+
+            x = self._sample_upper_hull(self.upper_hull, random_stream=random_stream, size=round_size)
+
+            lh_val, uh_val = self._evaluate_hulls(x, self.lower_hull, self.upper_hull)
+
+            log_U = log(random_stream.rand(round_size))
+
+            # accept, u is below lower bound
+            accepted = log_U <= lh_val - uh_val
+
+            stats.n_candidates += round_size
+            stats.n_squeezed += int(np.count_nonzero(accepted))
+
+            if self.logpdf_lower_bound is not None:
+                self._test_lower_bound(x, log_U, uh_val, accepted)
+
+            evaluated = ~accepted
+
+            if evaluated.any():
+                fx = self._evaluate_logpdf_array(x[evaluated], map_function=self._map)
+
+                # accept, u is between lower bound and f
+                accepted[evaluated] = log_U[evaluated] <= fx - uh_val[evaluated]
+
+                # all evaluated points were added to the mesh, rebuild hulls once
+                self._rebuild_hulls()
+
+                self._check_mesh()
+
+                if self.on_mesh_update is not None:
+                    self.on_mesh_update(self)
+
+            samples.append(x[accepted])
+            n_accepted += len(samples[-1])
+
+        return np.concatenate(samples)[:n_samples]
+
+    def _sample_frozen(self, n_samples):
+        """
+        Draw `n_samples` samples from the frozen hulls, see `freeze`.
+        Each round draws enough candidates to (most likely) finish,
+        but at most `block_size` (or 65536 if unset) candidates.
+        """
+        logpdf, stats = self.logpdf, self.stats
+        random_stream = self._uniforms
+
+        max_round_size = self.block_size or 2 ** 16
+
+        samples, n_accepted = [np.empty(0)], 0
+
+        while n_accepted < n_samples:
+            round_size = int(min(
+                max_round_size, (n_samples - n_accepted) / self._squeeze_rate + 1
+            ))
+
+            x = self._sample_upper_hull(
+                self.upper_hull, random_stream=random_stream,
+                size=round_size, alias_table=self._alias_table
+            )
+
+            lh_val, uh_val = self._evaluate_hulls(x, self.lower_hull, self.upper_hull)
+
+            log_U = log(random_stream.rand(round_size))
+
+            # accept, u is below lower bound
+            accepted = log_U <= lh_val - uh_val
+
+            stats.n_candidates += round_size
+            stats.n_squeezed += int(np.count_nonzero(accepted))
+
+            if self.logpdf_lower_bound is not None:
+                self._test_lower_bound(x, log_U, uh_val, accepted)
+
+            evaluated = np.flatnonzero(~accepted)
+
+            if len(evaluated):
+                # hulls are frozen, so these points do not go into the mesh
+                if self.block_size is not None:
+                    fx = np.asarray(self._evaluate_uncached(x[evaluated]), dtype=float)
+                elif self.n_workers is not None:
+                    fx = np.asarray(self._evaluate_concurrently(x[evaluated]), dtype=float)
+                else:
+                    evaluate = self._evaluate_uncached
+                    fx = np.asarray([evaluate(xi) for xi in x[evaluated]])
+
+                logpdf.n_evaluations += len(evaluated)
+
+                # accept, u is between lower bound and f
+                accepted[evaluated] = log_U[evaluated] <= fx - uh_val[evaluated]
+
+            samples.append(x[accepted])
+            n_accepted += len(samples[-1])
+
+        return np.concatenate(samples)[:n_samples]
+
+
+class BatchARSampler(object):
+    """
+    Adaptive rejection sampler for many independent univariate
+    log-concave targets at once, e.g. all conditionals of one Gibbs sweep.
+
+    The meshes of all targets are kept in one padded 2-D array
+    (one row per target) and all targets are advanced together:
+    each round draws one candidate per target, evaluates `logpdf` only for
+    the targets whose candidate fails the squeeze test and refines only
+    their hulls, using vectorized operations (see
+    `arspy.hull.compute_hull_stack`), so the per-target overhead is small.
+    Like `ARSampler`, the sampler keeps its meshes and hulls between calls.
+
+    Parameters
+    ----------
+    logpdf: callable
+        Vectorized function that computes the logpdfs of some of the targets:
+        given an array `x` of shape `(len(targets), n_points)` and an array
+        `targets` of target indices, `logpdf(x, targets)` returns an array
+        of the same shape as `x` holding :math:`log(f_k(x[i, j]))` with
+        `k = targets[i]`, where :math:`f_k(u)` is proportional to the
+        density of target `k`. It is only called for the targets that need
+        new values.
+
+    a: np.ndarray (n_targets,)
+        Lower starting point of each target, see `ARSampler`.
+
+    b: np.ndarray (n_targets,)
+        Upper starting point of each target, see `ARSampler`.
+
+    domain : np.ndarray (n_targets, 2) or Tuple[float, float]
+        Domain of each target, see `ARSampler`.
+        A single pair is used for all targets.
+
+    random_stream : RandomState or Generator, optional
+        Seeded random number generator object with same interface as a NumPy
+        RandomState object. Defaults to `None` in which case a NumPy
+        RandomState seeded from `/dev/urandom` if available or the clock if not
+        will be used.
+        A NumPy `Generator` (e.g. `numpy.random.default_rng(seed)`)
+        may be passed instead.
+
+    Examples
+    ----------
+    >>> import numpy as np
+    >>> means = np.arange(1000.)
+    >>> sampler = BatchARSampler(logpdf=lambda x, targets: -(x - means[targets, None]) ** 2, a=means - 2, b=means + 2, domain=(float("-inf"), float("inf")), random_stream=np.random.RandomState(seed=1))
+    >>> sampler.sample(5).shape
+    (1000, 5)
+
+    """
+    def __init__(self, logpdf: callable, a, b, domain, random_stream=None):
+        assert(hasattr(logpdf, "__call__"))
+
+        a, b = np.atleast_1d(np.asarray(a, dtype=float)), np.atleast_1d(np.asarray(b, dtype=float))
+        a, b = np.broadcast_arrays(a, b)
+        domain = np.broadcast_to(np.asarray(domain, dtype=float), a.shape + (2,))
+
+        assert(a.ndim == 1), "'a' and 'b' must be one-dimensional."
+        assert((domain[:, 1] >= domain[:, 0]).all()), "Invalid domain, it must hold: domain[1] >= domain[0]."
+
+        if random_stream is None:
+            random_stream = RandomState()
+
+        if ((a >= b) | isinf(a) | isinf(b) | (a < domain[:, 0]) | (b > domain[:, 1])).any():
+            raise ValueError("invalid a and b")
+
+        self.logpdf = logpdf
+        self.a, self.b = a, b
+        self.domain = domain
+        self.random_stream = random_stream
+
+        # initialize the same mesh as `ARSampler` for each target
+        n_derivative_steps = 1e-3 * (b - a)
+        n_initial_mesh_points = 3
+
+        S = np.column_stack((
+            a, *linspace(a + n_derivative_steps, b - n_derivative_steps,
+                         num=n_initial_mesh_points + 2), b
+        ))
+        fS = self._evaluate(S, np.arange(len(a)))
+
+        unbounded_left, unbounded_right = isinf(domain[:, 0]), isinf(domain[:, 1])
+
+        # ensure positive derivative at 'a' and negative derivative at 'b'
+        assert((fS[unbounded_left, 1] > fS[unbounded_left, 0]).all()), "derivative at 'a' must be positive, since the domain is unbounded to the left"
+        assert((fS[unbounded_right, -1] < fS[unbounded_right, -2]).all()), "derivative at 'b' must be negative, since the domain is unbounded to the right"
+
+        self.n_abscissae = np.full(len(a), S.shape[1])
+
+        # meshes are padded with `inf` (and values with `-inf`)
+        self._S = np.pad(S, ((0, 0), (0, S.shape[1])), constant_values=float("inf"))
+        self._fS = np.pad(fS, ((0, 0), (0, S.shape[1])), constant_values=float("-inf"))
+
+        self._compute_hulls()
+
+    def __len__(self):
+        return len(self.a)
+
+    @property
+    def abscissae(self):
+        """ Sorted mesh of each target, as a list of arrays. """
+        return [S[:n] for S, n in zip(self._S, self.n_abscissae)]
+
+    @property
+    def values(self):
+        """ Values of each target's `logpdf` at its `abscissae`. """
+        return [fS[:n] for fS, n in zip(self._fS, self.n_abscissae)]
+
+    @property
+    def efficiency(self):
+        """
+        Ratio of lower to upper hull mass of each target, see `ARSampler.efficiency`.
+        """
+        return exp(self.lower_hulls.log_mass() - self.upper_hulls.log_mass())
+
+    def _evaluate(self, x, targets):
+        return np.asarray(self.logpdf(x, targets), dtype=float).reshape(x.shape)
+
+    def _compute_hulls(self, targets=None):
+        """
+        (Re-)compute the hulls of `targets`, or of all targets if `None`.
+        All hulls are recomputed whenever the widest mesh grew, since all
+        hulls of the stacks have as many segments as the widest mesh needs.
+        """
+        width = self.n_abscissae.max()
+
+        if targets is None or width != self._hull_width:
+            self.lower_hulls, self.upper_hulls = compute_hull_stack(
+                S=self._S[:, :width], fS=self._fS[:, :width],
+                n_abscissae=self.n_abscissae, domain=self.domain
+            )
+            self._hull_width = width
+            return
+
+        lower_hulls, upper_hulls = compute_hull_stack(
+            S=self._S[targets, :width], fS=self._fS[targets, :width],
+            n_abscissae=self.n_abscissae[targets], domain=self.domain[targets]
+        )
+
+        for hulls, new_hulls in ((self.lower_hulls, lower_hulls), (self.upper_hulls, upper_hulls)):
+            for attribute in HullStack.__slots__:
+                if getattr(hulls, attribute) is not None:
+                    getattr(hulls, attribute)[targets] = getattr(new_hulls, attribute)
+
+    def _insert(self, targets, x, fx):
+        """
+        Insert point `x[i]` with value `fx[i]` into the mesh of target
+        `targets[i]`, for all `i`.
+        """
+        if self.n_abscissae.max() == self._S.shape[1]:
+            # grow the padding geometrically
+            padding = ((0, 0), (0, self._S.shape[1]))
+            self._S = np.pad(self._S, padding, constant_values=float("inf"))
+            self._fS = np.pad(self._fS, padding, constant_values=float("-inf"))
+
+        S, fS = self._S[targets], self._fS[targets]
+
+        position = np.count_nonzero(S < x[:, None], axis=1)
+
+        # skip points that are already part of the mesh
+        new = np.take_along_axis(S, position[:, None], axis=1)[:, 0] != x
+        targets, S, fS, x, fx, position = (
+            values[new] for values in (targets, S, fS, x, fx, position)
+        )
+
+        # shift all points after `position` by one column
+        column = np.arange(S.shape[1])
+        before, at = column < position[:, None], column == position[:, None]
+
+        self._S[targets] = np.where(before, S, np.where(at, x[:, None], np.roll(S, 1, axis=1)))
+        self._fS[targets] = np.where(before, fS, np.where(at, fx[:, None], np.roll(fS, 1, axis=1)))
+
+        self.n_abscissae[targets] += 1
+
+    def sample(self, n_samples: int=1):
+        """
+        Draw `n_samples` samples from each target, refining the hulls along the way.
+
+        Parameters
+        ----------
+        n_samples: int, optional
+            Number of samples to draw from each target, defaults to 1.
+
+        Returns
+        ----------
+        samples : np.ndarray (n_targets, n_samples)
+            Samples drawn from each target, one row per target.
+
+        """
+        assert(n_samples >= 0), "Number of samples must be >= 0."
+
+        random_stream = uniform_stream(self.random_stream)
+
+        samples = np.empty((len(self), n_samples))
+        n_accepted = np.zeros(len(self), dtype=int)
+
+        while (n_accepted < n_samples).any():
+            active = n_accepted < n_samples
+
+            x = sample_upper_hull_stack(self.upper_hulls, random_stream=random_stream)
+
+            lh_val, uh_val = evaluate_hull_stack(x, self.lower_hulls, self.upper_hulls)
+
+            log_U = log(random_stream.rand(len(self)))
+
+            # accept, u is below lower bound
+            accepted = active & (log_U <= lh_val - uh_val)
+
+            targets = np.flatnonzero(active & ~accepted)
+
+            if len(targets):
+                fx = self._evaluate(x[targets, None], targets)[:, 0]
+
+                # accept, u is between lower bound and f
+                accepted[targets] = log_U[targets] <= fx - uh_val[targets]
+
+                # all evaluated points are added to the meshes,
+                # rebuild the hulls of their targets once
+                self._insert(targets, x[targets], fx)
+                self._compute_hulls(targets)
+
+            targets = np.flatnonzero(accepted)
+            samples[targets, n_accepted[targets]] = x[targets]
+            n_accepted[targets] += 1
+
+        return samples
 
 
 def adaptive_rejection_sampling(logpdf: callable,
                                 a: float, b: float,
                                 domain: Tuple[float, float],
                                 n_samples: int,
-                                random_stream=None):
+                                random_stream=None,
+                                block_size: int=None,
+                                dlogpdf: callable=None,
+                                out=None, dtype=None,
+                                return_stats: bool=False,
+                                n_workers: int=None,
+                                logpdf_lower_bound: callable=None,
+                                **sampler_kwargs):
     """
     Adaptive rejection sampling samples exactly (all samples are i.i.d) and efficiently from any univariate log-concave distribution. The basic idea is to successively determine an envelope of straight-line segments to construct an increasingly accurate approximation of the logarithm.
     It does not require any normalization of the target distribution.
+    Use `arspy.ars.ARSampler` to keep the refined hulls for subsequent calls.
 
     Parameters
     ----------
@@ -41,6 +1915,9 @@ def adaptive_rejection_sampling(logpdf: callable,
         Univariate function that computes :math:`log(f(u))`
         for a given :math:`u`, where :math:`f(u)` is proportional
         to the target density to sample from.
+        If this is an `arspy.ars.CachedLogpdf`, all points it has
+        already been evaluated at are added to the initial mesh
+        and its counters are updated during sampling.
 
     a: float
         Lower starting point used to initialize the hulls.
@@ -66,18 +1943,64 @@ def adaptive_rejection_sampling(logpdf: callable,
     n_samples: int
         Number of samples to draw.
 
-    random_stream : RandomState, optional
+    random_stream : RandomState or Generator, optional
         Seeded random number generator object with same interface as a NumPy
         RandomState object. Defaults to `None` in which case a NumPy
         RandomState seeded from `/dev/urandom` if available or the clock if not
         will be used.
+        A NumPy `Generator` (e.g. `numpy.random.default_rng(seed)`)
+        may be passed instead.
+
+    block_size : int, optional
+        If given, sample in rounds of `block_size` candidates each.
+        All candidates of a round are drawn from the same hulls using
+        vectorized operations, candidates that pass the squeeze test are
+        accepted in bulk and `logpdf` is called once per round on an array
+        of all remaining candidates, so it must accept and return
+        NumPy arrays. All points `logpdf` was evaluated at are
+        added to the mesh at the end of each round.
+        Defaults to `None`, in which case one candidate is handled at a time.
+
+    dlogpdf : callable, optional
+        Derivative of `logpdf`. If given, the upper hull is built from
+        tangents instead of extended secants, which gives a tighter envelope
+        and thus fewer rejections and `logpdf` evaluations.
+
+    out : np.ndarray, optional
+        Preallocated one-dimensional array (or `numpy.memmap`) to write
+        the samples to, see `ARSampler.sample`.
+
+    dtype : data-type, optional
+        If given, return the samples as a NumPy array of this type.
+
+    return_stats : bool, optional
+        If `True`, also return the `arspy.ars.SamplerStats` of the run.
+        Defaults to `False`.
+
+    n_workers : int, optional
+        If given, keep about `n_workers` `logpdf` evaluations in flight
+        concurrently, for expensive `logpdf` functions that release the GIL
+        or are coroutine functions, see `ARSampler`.
+
+    logpdf_lower_bound : callable, optional
+        Cheap lower bound of `logpdf`, tried before `logpdf` for candidates
+        that fail the squeeze test, see `ARSampler`.
+
+    **sampler_kwargs
+        Further options passed on to `ARSampler`, e.g. `abscissae`,
+        `freeze_acceptance_rate`, `max_abscissae`, `prune_to`, `compiled`,
+        `auto_init`, `profile`, `on_mesh_update` or `executor`.
 
     Returns
     ----------
-    samples : list
+    samples : list or np.ndarray
         A list of samples drawn from the
         target distribution :math:`f`
-        with the given `logpdf`.
+        with the given `logpdf`, or an array if `out` or `dtype` is given.
+        To process samples as they are drawn, use `ARSampler.stream`.
+
+    stats : arspy.ars.SamplerStats
+        Counters of the run, only returned if `return_stats` is `True`.
 
     Examples
     ----------
@@ -96,73 +2019,61 @@ def adaptive_rejection_sampling(logpdf: callable,
     True
 
     """
-    assert(hasattr(logpdf, "__call__"))
-    assert(len(domain) == 2), "Domain must be two-element iterable."
-    assert(domain[1] >= domain[0]), "Invalid domain, it must hold: domain[1] >= domain[0]."
-    assert(n_samples >= 0), "Number of samples must be >= 0."
-
-    if random_stream is None:
-        random_stream = RandomState()
-
-    if a >= b or isinf(a) or isinf(b) or a < domain[0] or b > domain[1]:
-        raise ValueError("invalid a and b")
-
-    n_derivative_steps = 1e-3 * (b - a)
-
-    S = (a, a + n_derivative_steps, b - n_derivative_steps, b)
-
-    if domain[0] == float("-inf"):
-        # ensure positive derivative at 'a'
-        derivative_sign = sign(logpdf(a + n_derivative_steps) - logpdf(a))
-        positive_derivative = derivative_sign > 0
-
-        assert(positive_derivative), "derivative at 'a' must be positive, since the domain is unbounded to the left"
-
-    if domain[1] == float("inf"):
-        # ensure negative derivative at 'b'
-        derivative_sign = sign(logpdf(b) - logpdf(b - n_derivative_steps))
-        negative_derivative = derivative_sign < 0
-
-        assert(negative_derivative), "derivative at 'b' must be negative, since the domain is unbounded to the right"
+    with ARSampler(
+        logpdf=logpdf, a=a, b=b, domain=domain,
+        random_stream=random_stream, block_size=block_size, dlogpdf=dlogpdf,
+        n_workers=n_workers, logpdf_lower_bound=logpdf_lower_bound,
+        **sampler_kwargs
+    ) as sampler:
+        samples = sampler.sample(n_samples, out=out, dtype=dtype)
 
-    # initialize a mesh on which to create upper & lower hulls
-    n_initial_mesh_points = 3
+    if return_stats:
+        return samples, sampler.stats
 
-    S = unique(
-        (S[0], *(linspace(S[1], S[2], num=n_initial_mesh_points + 2)), S[3])
-    )
-
-    fS = tuple(logpdf(s) for s in S)
-
-    lower_hull, upper_hull = compute_hulls(S=S, fS=fS, domain=domain)
+    return samples
 
-    samples = []
 
-    while len(samples) < n_samples:
+def batch_adaptive_rejection_sampling(logpdf: callable, a, b, domain,
+                                      n_samples: int=1, random_stream=None):
+    """
+    Draw `n_samples` samples from each of many independent univariate
+    log-concave targets at once, using vectorized operations over all targets.
+    Use `arspy.ars.BatchARSampler` to keep the refined hulls for subsequent calls.
 
-        mesh_changed = False
+    Parameters
+    ----------
+    logpdf: callable
+        Vectorized function `logpdf(x, targets)` that computes the logpdfs
+        of the targets with indices `targets` at the points in the rows of `x`,
+        see `BatchARSampler`.
 
-        x = sample_upper_hull(upper_hull, random_stream=random_stream)
+    a: np.ndarray (n_targets,)
+        Lower starting point of each target, see `adaptive_rejection_sampling`.
 
-        lh_val, uh_val = evaluate_hulls(x, lower_hull, upper_hull)
+    b: np.ndarray (n_targets,)
+        Upper starting point of each target, see `adaptive_rejection_sampling`.
 
-        U = random_stream.rand()
+    domain : np.ndarray (n_targets, 2) or Tuple[float, float]
+        Domain of each target, see `adaptive_rejection_sampling`.
+        A single pair is used for all targets.
 
-        if log(U) <= lh_val - uh_val:
-            # accept u is below lower bound
-            samples.append(x)
+    n_samples: int, optional
+        Number of samples to draw from each target, defaults to 1.
 
-        elif log(U) <= logpdf(x) - uh_val:
-            # accept, u is between lower bound and f
-            samples.append(x)
+    random_stream : RandomState or Generator, optional
+        Seeded random number generator object with same interface as a NumPy
+        RandomState object. Defaults to `None` in which case a NumPy
+        RandomState seeded from `/dev/urandom` if available or the clock if not
+        will be used.
+        A NumPy `Generator` (e.g. `numpy.random.default_rng(seed)`)
+        may be passed instead.
 
-            mesh_changed = True
-        else:
-            # reject, u is between f and upper_bound
-            mesh_changed = True
+    Returns
+    ----------
+    samples : np.ndarray (n_targets, n_samples)
+        Samples drawn from each target, one row per target.
 
-        if mesh_changed:
-            S = sorted([*S, x])
-            fS = tuple(logpdf(s) for s in S)
-            lower_hull, upper_hull = compute_hulls(S=S, fS=fS, domain=domain)
-    return samples
+    """
+    return BatchARSampler(
+        logpdf=logpdf, a=a, b=b, domain=domain, random_stream=random_stream
+    ).sample(n_samples)
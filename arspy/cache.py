@@ -0,0 +1,210 @@
+"""
+This module contains a least-recently-used cache of adaptive rejection
+samplers for a parametric family of targets `logpdf(x, *theta)`,
+e.g. the conditionals of a mixture model given the cluster assignment.
+
+Targets with recurring parameters reuse the refined hulls of their cached
+sampler instead of paying for adaptation again.
+"""
+from collections import OrderedDict
+from numpy.random import RandomState
+from arspy.ars import ARSampler
+from arspy.probability_utils import sampler_uniform_stream
+from typing import Tuple
+
+__all__ = (
+    "SamplerCache",
+)
+
+
+class SamplerCache(object):
+    """
+    Factory of `arspy.ars.ARSampler` objects for the targets
+    `logpdf(x, *theta)` that keeps the most recently used samplers
+    (keyed by the hashable parameter tuple `theta`) with their refined hulls.
+
+    The least recently used samplers are evicted once more than `max_samplers`
+    samplers are cached or their meshes hold more than `max_total_abscissae`
+    points in total, which bounds the memory used by the cache.
+
+    Parameters
+    ----------
+    logpdf : callable
+        Log-density of the family, `logpdf(x, *theta)` computes :math:`log(f(x; \\theta))`
+        up to an additive constant, see `arspy.ars.ARSampler`.
+
+    a: float
+        Lower starting point of all samplers, see `arspy.ars.ARSampler`.
+
+    b: float
+        Upper starting point of all samplers, see `arspy.ars.ARSampler`.
+
+    domain : Tuple[float, float]
+        Domain of all targets, see `arspy.ars.ARSampler`.
+
+    random_stream : RandomState or Generator, optional
+        Random stream shared by all samplers, see `arspy.ars.ARSampler`.
+
+    max_samplers : int, optional
+        Maximal number of cached samplers. Defaults to 128.
+
+    max_total_abscissae : int, optional
+        Maximal total number of mesh points of all cached samplers.
+        Defaults to `None`, in which case only `max_samplers` is bounded.
+
+    sampler_kwargs
+        Further keyword arguments of `arspy.ars.ARSampler` used for all samplers,
+        e.g. `auto_init=True` if the modes of the targets vary with `theta`
+        or `max_abscissae` to bound the mesh of each sampler.
+
+    Attributes
+    ----------
+    n_hits : int
+        Number of requests served by a cached sampler.
+
+    n_misses : int
+        Number of requests that created a new sampler.
+
+    n_evictions : int
+        Number of samplers evicted from the cache.
+
+    Examples
+    ----------
+    >>> from numpy.random import RandomState
+    >>> cache = SamplerCache(logpdf=lambda x, mean: -(x - mean) ** 2, a=-2, b=2, domain=(float("-inf"), float("inf")), random_stream=RandomState(seed=1), auto_init=True)
+    >>> samples = [cache.sample((mean,), 10) for mean in (0., 1., 0., 0., 1.)]
+    >>> cache.n_hits, cache.n_misses
+    (3, 2)
+
+    """
+    def __init__(self, logpdf: callable, a: float, b: float,
+                 domain: Tuple[float, float], random_stream=None,
+                 max_samplers: int=128, max_total_abscissae: int=None,
+                 **sampler_kwargs):
+        assert(hasattr(logpdf, "__call__"))
+        assert(max_samplers > 0), "At least one sampler must be cached."
+        assert(max_total_abscissae is None or max_total_abscissae > 0), "Maximal number of abscissae must be > 0."
+
+        owns_random_stream = random_stream is None
+
+        if random_stream is None:
+            random_stream = RandomState()
+
+        self.logpdf = logpdf
+        self.a, self.b = a, b
+        self.domain = domain
+        self.random_stream = random_stream
+        self.max_samplers = max_samplers
+        self.max_total_abscissae = max_total_abscissae
+        self.sampler_kwargs = sampler_kwargs
+
+        # one stream of uniform random values for all samplers
+        self._uniforms = sampler_uniform_stream(random_stream, owned=owns_random_stream)
+
+        # samplers from least to most recently used
+        self._samplers = OrderedDict()
+
+        self.n_hits, self.n_misses, self.n_evictions = 0, 0, 0
+
+    def __len__(self):
+        return len(self._samplers)
+
+    def __contains__(self, theta):
+        return theta in self._samplers
+
+    @property
+    def hit_rate(self):
+        """ Fraction of requests served by a cached sampler. """
+        return self.n_hits / max(self.n_hits + self.n_misses, 1)
+
+    @property
+    def n_abscissae(self):
+        """ Total number of mesh points of all cached samplers. """
+        return sum(len(sampler.abscissae) for sampler in self._samplers.values())
+
+    def get(self, theta):
+        """
+        Return the sampler of the target `logpdf(x, *theta)`,
+        creating it if it is not cached.
+
+        Parameters
+        ----------
+        theta : tuple
+            Hashable parameters of the target.
+
+        Returns
+        ----------
+        sampler : arspy.ars.ARSampler
+            Sampler of the target, marked as most recently used.
+
+        """
+        sampler = self._samplers.get(theta)
+
+        if sampler is not None:
+            self.n_hits += 1
+            self._samplers.move_to_end(theta)
+            return sampler
+
+        self.n_misses += 1
+
+        logpdf = self.logpdf
+
+        sampler = ARSampler(
+            logpdf=lambda x: logpdf(x, *theta), a=self.a, b=self.b,
+            domain=self.domain, random_stream=self._uniforms, **self.sampler_kwargs
+        )
+
+        self._samplers[theta] = sampler
+        self._evict()
+
+        return sampler
+
+    def sample(self, theta, n_samples: int=1):
+        """
+        Draw `n_samples` samples from the target `logpdf(x, *theta)`,
+        see `ARSampler.sample`.
+        """
+        samples = self.get(theta).sample(n_samples)
+
+        # the mesh of the sampler may have grown
+        self._evict()
+
+        return samples
+
+    def draw(self, theta):
+        """ Draw a single sample from the target `logpdf(x, *theta)`. """
+        return self.sample(theta, 1)[0]
+
+    def clear(self):
+        """
+        Remove all cached samplers and shut down their pools of threads
+        (see `arspy.ars.ARSampler.close`). The counters are kept.
+        """
+        for sampler in self._samplers.values():
+            sampler.close()
+
+        self._samplers.clear()
+
+    def _evict(self):
+        """
+        Evict least recently used samplers until the limits hold,
+        but always keep the most recently used one.
+        Evicted samplers are closed, see `arspy.ars.ARSampler.close`.
+        """
+        samplers = self._samplers
+
+        while len(samplers) > self.max_samplers:
+            _, sampler = samplers.popitem(last=False)
+            sampler.close()
+            self.n_evictions += 1
+
+        if self.max_total_abscissae is None:
+            return
+
+        n_abscissae = self.n_abscissae
+
+        while len(samplers) > 1 and n_abscissae > self.max_total_abscissae:
+            _, sampler = samplers.popitem(last=False)
+            sampler.close()
+            n_abscissae -= len(sampler.abscissae)
+            self.n_evictions += 1
@@ -0,0 +1,370 @@
+"""
+This module contains a Gibbs sampler whose univariate conditionals
+are sampled with adaptive rejection sampling.
+
+Every update of a coordinate builds a new `arspy.ars.ARSampler` for its
+conditional. After the draw, a few points of its mesh are kept to seed
+the mesh of the same coordinate in the next sweep. Conditionals usually
+change little from one sweep to the next, so the warm-started hulls are
+tight from the start and most draws pass the squeeze test.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from numpy.random import RandomState
+from arspy.ars import ARSampler
+from arspy.hull import prune_mesh
+from arspy.probability_utils import sampler_uniform_stream
+
+__all__ = (
+    "GibbsSampler",
+    "gibbs_sampling",
+)
+
+# largest distance of `logpdf` below its maximum for points to carry over
+# to the next sweep, the target mass beyond such points is negligible
+MAX_WARM_DROP = 8.
+
+
+class GibbsSampler(object):
+    """
+    Gibbs sampler for a (multivariate) target that is log-concave in each
+    coordinate. Its state `x` is updated one coordinate at a time,
+    by drawing from the conditional of that coordinate given all others.
+
+    Parameters
+    ----------
+    logpdf : callable, optional
+        Joint log-density: `logpdf(x)` computes :math:`log(f(x))`
+        for a point `x` (np.ndarray (n_dimensions,)), where :math:`f(x)` is
+        proportional to the target density. Must be given unless `conditionals` is.
+
+    x0 : np.ndarray (n_dimensions,)
+        Initial state of the chain, must lie in `domains`.
+
+    domains : Tuple[float, float] or Sequence[Tuple[float, float]], optional
+        Domain of each coordinate, see `arspy.ars.ARSampler`.
+        A single pair is used for all coordinates.
+        Defaults to `None`, in which case all coordinates are unbounded.
+
+    conditionals : Sequence[callable], optional
+        Log-densities of the conditionals, up to additive constants:
+        `conditionals[i](xi, x)` computes the log-density of coordinate `i`
+        at `xi`, given the other coordinates of the current state `x`
+        (`x[i]` must be ignored). Cheaper than `logpdf` if the
+        joint log-density has terms that do not depend on `xi`.
+
+    scan : str, optional
+        `"systematic"` to update all coordinates in order in every sweep or
+        `"random"` to update `n_dimensions` coordinates chosen uniformly at random.
+        Defaults to `"systematic"`.
+
+    random_stream : RandomState or Generator, optional
+        Random stream shared by all conditionals, see `arspy.ars.ARSampler`.
+
+    width : float, optional
+        Distance of the starting points `a` and `b` of each coordinate from
+        its initial value in the first sweep, see `arspy.ars.find_initial_abscissae`.
+        Defaults to 1.
+
+    n_warm_abscissae : int, optional
+        Number of mesh points of each conditional that are kept to seed the
+        mesh of the next sweep, at least 4. Defaults to 5.
+
+    sampler_kwargs
+        Further keyword arguments of `arspy.ars.ARSampler` used for all
+        conditionals (e.g. `n_workers` for expensive log-densities).
+        The log-densities are called on floats, so `block_size` is not supported.
+        With `n_workers`, all conditionals share one pool of threads
+        (unless an `executor` is given), which is shut down by `close`
+        (or at the end of a `with` block).
+
+    Examples
+    ----------
+    >>> import numpy as np
+    >>> precision = np.array([[2., -1.], [-1., 2.]])
+    >>> sampler = GibbsSampler(logpdf=lambda x: -x @ precision @ x / 2., x0=np.zeros(2), random_stream=np.random.RandomState(seed=1))
+    >>> sampler.sample(1000).shape
+    (1000, 2)
+    >>> sampler.n_sweeps
+    1000
+
+    """
+    def __init__(self, logpdf: callable=None, x0=None, domains=None,
+                 conditionals=None, scan: str="systematic", random_stream=None,
+                 width: float=1., n_warm_abscissae: int=5, **sampler_kwargs):
+        assert((logpdf is None) != (conditionals is None)), "Either 'logpdf' or 'conditionals' must be given."
+        assert(x0 is not None), "An initial state 'x0' must be given."
+        assert(scan in ("systematic", "random")), "Scan must be 'systematic' or 'random'."
+        assert(width > 0), "Width must be > 0."
+        assert(n_warm_abscissae >= 4), "At least four abscissae must be kept."
+        assert("block_size" not in sampler_kwargs), "Conditionals do not support 'block_size'."
+
+        x = np.array(x0, dtype=float)
+
+        assert(x.ndim == 1), "'x0' must be one-dimensional."
+
+        if domains is None:
+            domains = (float("-inf"), float("inf"))
+
+        domains = np.broadcast_to(np.asarray(domains, dtype=float), x.shape + (2,))
+
+        assert((domains[:, 1] >= domains[:, 0]).all()), "Invalid domain, it must hold: domain[1] >= domain[0]."
+
+        if ((x < domains[:, 0]) | (x > domains[:, 1])).any():
+            raise ValueError("x0 must lie in the domains")
+
+        if conditionals is not None:
+            assert(len(conditionals) == len(x)), "One conditional per coordinate is required."
+
+        owns_random_stream = random_stream is None
+
+        if random_stream is None:
+            random_stream = RandomState()
+
+        self.logpdf, self.conditionals = logpdf, conditionals
+        self.x = x
+        self.domains = domains
+        self.scan = scan
+        self.random_stream = random_stream
+        self.width = width
+        self.n_warm_abscissae = n_warm_abscissae
+        self.sampler_kwargs = sampler_kwargs
+
+        # one stream of uniform random values for all conditionals
+        self._uniforms = sampler_uniform_stream(random_stream, owned=owns_random_stream)
+
+        # sampler of the latest update of each coordinate, `None` before the first one
+        self.samplers = [None] * len(x)
+        self._warm_abscissae = [None] * len(x)
+
+        # pool of threads shared by the conditionals, created on first use
+        self._executor = None
+
+        self.n_sweeps = 0
+        self.n_evaluations = 0
+
+    @property
+    def n_dimensions(self):
+        """ Number of coordinates of the target. """
+        return len(self.x)
+
+    def _conditional(self, i):
+        """ Log-density of coordinate `i` given the other coordinates of `x`. """
+        x = self.x.copy()
+
+        if self.conditionals is not None:
+            conditional = self.conditionals[i]
+            return lambda xi: conditional(xi, x)
+
+        logpdf = self.logpdf
+
+        def joint_logpdf(xi):
+            # a fresh copy per call, so that concurrent calls do not interfere
+            y = x.copy()
+            y[i] = xi
+            return logpdf(y)
+
+        return joint_logpdf
+
+    def _sampler_kwargs(self):
+        """ Keyword arguments of the samplers of the conditionals. """
+        sampler_kwargs = self.sampler_kwargs
+
+        if sampler_kwargs.get("n_workers") is None or sampler_kwargs.get("executor") is not None:
+            return sampler_kwargs
+
+        # a new pool per update would leave threads behind in every update
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=sampler_kwargs["n_workers"])
+
+        return dict(sampler_kwargs, executor=self._executor)
+
+    def close(self):
+        """ Shut down the pool of threads shared by the conditionals, if any. """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _starting_points(self, i):
+        """ Points `a` and `b` (and further abscissae) to build the mesh of coordinate `i` from. """
+        abscissae = self._warm_abscissae[i]
+
+        if abscissae is not None:
+            return abscissae[0], abscissae[-1], abscissae[1:-1]
+
+        (lower, upper), xi, width = self.domains[i], self.x[i], self.width
+
+        # `logpdf` need not be defined at finite bounds, the hulls reach
+        # them anyway (see `arspy.hull.compute_hulls`)
+        a = xi - width if xi - width > lower else (xi + lower) / 2.
+        b = xi + width if xi + width < upper else (xi + upper) / 2.
+
+        return a, b, None
+
+    def _warm_mesh(self, sampler):
+        """
+        Points of the mesh of `sampler` to seed the next update of the same
+        coordinate with: the (at least three) points closest to the mode in
+        log-density, pruned to the `n_warm_abscissae` points that contribute
+        most to the hulls.
+        """
+        S, fS = np.asarray(sampler.abscissae), np.asarray(sampler.values)
+
+        # points far out in the tails (e.g. from bracketing the mode) would
+        # be evaluated again in every sweep without tightening the hulls
+        keep = fS >= fS.max() - MAX_WARM_DROP
+        if np.count_nonzero(keep) < 3:
+            keep = np.isin(np.arange(len(S)), np.argsort(fS)[-3:])
+
+        S, fS = S[keep].tolist(), fS[keep].tolist()
+
+        if len(S) > self.n_warm_abscissae:
+            prune_mesh(S=S, fS=fS, n_abscissae=self.n_warm_abscissae)
+
+        return S
+
+    def update(self, i: int):
+        """
+        Draw coordinate `i` from its conditional given all other coordinates.
+
+        Parameters
+        ----------
+        i : int
+            Index of the coordinate to update.
+
+        Returns
+        ----------
+        xi : float
+            New value of coordinate `i`.
+
+        """
+        a, b, abscissae = self._starting_points(i)
+
+        sampler = ARSampler(
+            logpdf=self._conditional(i), a=a, b=b, domain=tuple(self.domains[i]),
+            random_stream=self._uniforms, abscissae=abscissae,
+            # a single draw does not pay for refining the mode of a warm mesh
+            auto_init=True if abscissae is None else {"max_refinements": 0, "min_drop": 0.25, "max_drop": 6.},
+            **self._sampler_kwargs()
+        )
+
+        self.x[i] = sampler.draw()
+
+        self.n_evaluations += sampler.stats.n_evaluations
+        self.samplers[i] = sampler
+
+        self._warm_abscissae[i] = self._warm_mesh(sampler)
+
+        return self.x[i]
+
+    def sweep(self):
+        """
+        Run one sweep, updating `n_dimensions` coordinates.
+
+        Returns
+        ----------
+        x : np.ndarray (n_dimensions,)
+            State of the chain after the sweep (the array `x` itself).
+
+        """
+        n_dimensions = self.n_dimensions
+
+        if self.scan == "systematic":
+            coordinates = range(n_dimensions)
+        else:
+            coordinates = np.minimum(
+                (self._uniforms.rand(n_dimensions) * n_dimensions).astype(int), n_dimensions - 1
+            )
+
+        for i in coordinates:
+            self.update(int(i))
+
+        self.n_sweeps += 1
+
+        return self.x
+
+    def sample(self, n_sweeps: int=None, out=None):
+        """
+        Run `n_sweeps` sweeps and record the state after each of them.
+
+        Parameters
+        ----------
+        n_sweeps : int, optional
+            Number of sweeps to run. Defaults to `len(out)` if `out` is given.
+
+        out : np.ndarray (n_sweeps, n_dimensions), optional
+            Preallocated array (or `numpy.memmap`) to write the chain to.
+
+        Returns
+        ----------
+        chain : np.ndarray (n_sweeps, n_dimensions)
+            State after each sweep (`out[:n_sweeps]`, if `out` is given).
+
+        """
+        if n_sweeps is None:
+            assert(out is not None), "Either 'n_sweeps' or 'out' must be given."
+            n_sweeps = len(out)
+
+        assert(n_sweeps >= 0), "Number of sweeps must be >= 0."
+
+        if out is None:
+            out = np.empty((n_sweeps, self.n_dimensions))
+
+        assert(out.ndim == 2 and len(out) >= n_sweeps and out.shape[1] == self.n_dimensions), "'out' must have shape (n_sweeps, n_dimensions)."
+
+        for t in range(n_sweeps):
+            out[t] = self.sweep()
+
+        return out[:n_sweeps]
+
+
+def gibbs_sampling(logpdf: callable=None, x0=None, n_sweeps: int=None,
+                   domains=None, conditionals=None, random_stream=None,
+                   out=None, **kwargs):
+    """
+    Run a Gibbs sampler with adaptive rejection sampling of the conditionals
+    for `n_sweeps` sweeps. Use `arspy.gibbs.GibbsSampler` to continue the chain later.
+
+    Parameters
+    ----------
+    logpdf : callable, optional
+        Joint log-density, see `GibbsSampler`.
+
+    x0 : np.ndarray (n_dimensions,)
+        Initial state of the chain.
+
+    n_sweeps : int, optional
+        Number of sweeps to run. Defaults to `len(out)` if `out` is given.
+
+    domains : Tuple[float, float] or Sequence[Tuple[float, float]], optional
+        Domain of each coordinate, see `GibbsSampler`.
+
+    conditionals : Sequence[callable], optional
+        Log-densities of the conditionals, see `GibbsSampler`.
+
+    random_stream : RandomState or Generator, optional
+        Random stream of the chain, see `GibbsSampler`.
+
+    out : np.ndarray (n_sweeps, n_dimensions), optional
+        Preallocated array to write the chain to.
+
+    kwargs
+        Further keyword arguments of `GibbsSampler` (e.g. `scan`).
+
+    Returns
+    ----------
+    chain : np.ndarray (n_sweeps, n_dimensions)
+        State after each sweep.
+
+    """
+    with GibbsSampler(
+        logpdf=logpdf, x0=x0, domains=domains, conditionals=conditionals,
+        random_stream=random_stream, **kwargs
+    ) as sampler:
+        return sampler.sample(n_sweeps, out=out)
@@ -1,20 +1,218 @@
-from numpy import asarray, isinf, isnan, spacing as eps, log, exp, cumsum
-from arspy.probability_utils import exp_normalize
+from bisect import bisect
+from numpy import (
+    asarray, isinf, isnan, spacing as eps, log, exp, cumsum,
+    searchsorted, minimum, maximum, clip, full, errstate, ndim,
+    concatenate, zeros, abs as absolute, argsort, ones, inf,
+    arange, where, take_along_axis, count_nonzero, any as any_,
+    broadcast_arrays,
+)
+from arspy.probability_utils import (
+    exp_normalize, log_sum_exp, sample_alias_table, uniform_stream
+)
 
 __all__ = (
+    "Hull",
     "HullNode",
+    "HullStack",
     "compute_hulls",
+    "compute_hull_stack",
+    "update_hulls",
+    "prune_mesh",
     "evaluate_hulls",
+    "evaluate_hull_stack",
     "sample_upper_hull",
+    "sample_upper_hull_stack",
     "compute_segment_log_prob",
 )
 
 
+class Hull(object):
+    """
+    Piecewise-linear hull stored as one contiguous NumPy array per
+    segment attribute (struct-of-arrays).
+
+    Segment `i` is the line :math:`m_i x + b_i` on `[left[i], right[i]]`.
+    For upper hulls, `log_pr[i]` is the (unnormalized) log probability mass
+    of segment `i` under the exponentiated hull and `pr[i]` is its
+    normalized probability. Lower hulls carry no masses (`log_pr` is `None`).
+    The cumulative probabilities `cdf` of all segments are cached and kept
+    up to date together with `pr`, so that segments can be located by
+    binary search (see `locate` and `sample_upper_hull`).
+
+    Indexing or iterating over a hull yields `HullNode` views
+    of single segments.
+
+    Parameters
+    ----------
+    m, b, left, right : array-like
+        Slopes, intercepts, left and right breakpoints of all segments.
+
+    log_pr : array-like, optional
+        Unnormalized log probability masses of all segments.
+
+    pr : array-like, optional
+        Normalized probabilities of all segments.
+        Defaults to the normalized `log_pr` or to zeros if no masses are given.
+
+    """
+    __slots__ = ("m", "b", "left", "right", "log_pr", "pr", "cdf")
+
+    def __init__(self, m, b, left, right, log_pr=None, pr=None):
+        self.m, self.b = asarray(m, dtype=float), asarray(b, dtype=float)
+        self.left = asarray(left, dtype=float)
+        self.right = asarray(right, dtype=float)
+
+        self.log_pr = None if log_pr is None else asarray(log_pr, dtype=float)
+
+        if pr is not None:
+            self.pr = asarray(pr, dtype=float)
+            self.cdf = cumsum(self.pr)
+        else:
+            self._normalize()
+
+    @classmethod
+    def from_nodes(cls, nodes):
+        """
+        Construct a hull from a sequence of `HullNode` objects.
+        Hulls are returned unchanged.
+        """
+        if isinstance(nodes, Hull):
+            return nodes
+
+        log_pr = [node.log_pr for node in nodes]
+
+        return cls(
+            m=[node.m for node in nodes], b=[node.b for node in nodes],
+            left=[node.left for node in nodes],
+            right=[node.right for node in nodes],
+            log_pr=None if None in log_pr else log_pr,
+            pr=[node.pr for node in nodes]
+        )
+
+    @classmethod
+    def _from_segments(cls, segments):
+        """
+        Construct a hull from a list of `(m, b, left, right[, log_pr])` tuples.
+        """
+        return cls(*asarray(segments, dtype=float).T)
+
+    def _splice(self, edits):
+        """
+        Replace segments in place.
+        `edits` is a list of `(start, stop, segments)` triples, sorted by
+        `start` and non-overlapping, each of which replaces segments
+        `start` to `stop` (exclusive) by a list of
+        `(m, b, left, right[, log_pr])` tuples.
+        """
+        attributes = ("m", "b", "left", "right", "log_pr")[
+            :4 + (self.log_pr is not None)
+        ]
+
+        pieces, position = [], 0
+
+        for start, stop, segments in edits:
+            pieces.append((position, start, None))
+            pieces.append((0, 0, asarray(segments, dtype=float).reshape(-1, len(attributes))))
+            position = stop
+
+        pieces.append((position, len(self), None))
+
+        for column, attribute in enumerate(attributes):
+            values = getattr(self, attribute)
+            setattr(self, attribute, concatenate([
+                values[start:stop] if segments is None else segments[:, column]
+                for start, stop, segments in pieces
+            ]))
+
+        self._normalize()
+
+    def _normalize(self):
+        if self.log_pr is None:
+            self.pr = zeros(len(self))
+        else:
+            self.pr = exp_normalize(self.log_pr)
+
+        self.cdf = cumsum(self.pr)
+
+    def locate(self, x):
+        """
+        Return the index of the segment containing `x` (a float or an array),
+        using binary search over the right breakpoints.
+        Points beyond the last breakpoint are assigned to the last segment.
+        """
+        return minimum(searchsorted(self.right, x), len(self) - 1)
+
+    def log_mass(self):
+        """
+        Return the logarithm of the total (unnormalized) probability mass
+        of the exponentiated hull, summed over all segments.
+        """
+        if self.log_pr is not None:
+            return log_sum_exp(self.log_pr)
+
+        return log_sum_exp(
+            _segment_log_probs(self.left, self.right, self.m, self.b)
+        )
+
+    def __len__(self):
+        return len(self.m)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError("hull segment index out of range")
+
+        return HullNode._view(self, index)
+
+    def __iter__(self):
+        return (HullNode._view(self, index) for index in range(len(self)))
+
+    def __repr__(self):
+        return "Hull({nodes})".format(nodes=list(self))
+
+
+def _hull_attribute(attribute):
+    def get(node):
+        values = getattr(node._hull, attribute)
+        return None if values is None else float(values[node._index])
+
+    def set(node, value):
+        getattr(node._hull, attribute)[node._index] = value
+
+        if attribute == "pr":
+            node._hull.cdf = cumsum(node._hull.pr)
+
+    return property(get, set)
+
+
 class HullNode(object):
-    def __init__(self, m, b, left, right, pr=0.0):
-        self.m, self.b = m, b
-        self.left, self.right = left, right
-        self.pr = pr
+    """
+    Single segment of a `Hull`.
+
+    Nodes obtained from a hull are views on it: their attributes are
+    read from (and written to) the arrays of that hull.
+    Constructing a `HullNode` directly creates a hull with a single segment.
+    """
+    __slots__ = ("_hull", "_index")
+
+    def __init__(self, m, b, left, right, pr=0.0, log_pr=None):
+        self._hull = Hull(
+            m=(m,), b=(b,), left=(left,), right=(right,),
+            log_pr=None if log_pr is None else (log_pr,), pr=(pr,)
+        )
+        self._index = 0
+
+    @classmethod
+    def _view(cls, hull, index):
+        node = cls.__new__(cls)
+        node._hull, node._index = hull, index
+        return node
+
+    m, b = _hull_attribute("m"), _hull_attribute("b")
+    left, right = _hull_attribute("left"), _hull_attribute("right")
+    pr, log_pr = _hull_attribute("pr"), _hull_attribute("log_pr")
 
     def __eq__(self, other):
         from math import isclose
@@ -41,12 +239,70 @@ class HullNode(object):
         return hash(str(self))
 
 
-def compute_hulls(S, fS, domain):
+class HullStack(object):
+    """
+    Stack of piecewise-linear hulls of independent targets,
+    one hull per row of 2-D NumPy arrays (see `Hull`).
+
+    Rows of different targets hold the same number of segments;
+    unused segments are padded with empty segments (`left == right`)
+    of mass zero (`log_pr == -inf`).
+
+    Parameters
+    ----------
+    m, b, left, right : np.ndarray (n_targets, n_segments)
+        Slopes, intercepts, left and right breakpoints of all segments.
+
+    log_pr : np.ndarray (n_targets, n_segments), optional
+        Unnormalized log probability masses of all segments.
+
+    """
+    __slots__ = ("m", "b", "left", "right", "log_pr")
+
+    def __init__(self, m, b, left, right, log_pr=None):
+        self.m, self.b = asarray(m, dtype=float), asarray(b, dtype=float)
+        self.left = asarray(left, dtype=float)
+        self.right = asarray(right, dtype=float)
+        self.log_pr = None if log_pr is None else asarray(log_pr, dtype=float)
+
+    def locate(self, x):
+        """
+        Return the index of the segment containing `x[k]` in each hull `k`.
+        Points beyond the last breakpoint are assigned to the last segment.
+        """
+        index = count_nonzero(self.right < asarray(x)[:, None], axis=1)
+        return minimum(index, self.m.shape[1] - 1)
+
+    def log_mass(self):
+        """
+        Return the logarithm of the total (unnormalized) probability mass
+        of each exponentiated hull.
+        """
+        log_pr = self.log_pr
+
+        if log_pr is None:
+            log_pr = _segment_log_probs(self.left, self.right, self.m, self.b)
+
+        shift = log_pr.max(axis=1)
+        shift[isinf(shift)] = 0.
+
+        with errstate(divide="ignore"):
+            return shift + log(exp(log_pr - shift[:, None]).sum(axis=1))
+
+    def __len__(self):
+        return len(self.m)
+
+
+def compute_hulls(S, fS, domain, dfS=None):
     """
     (Re-)compute upper and lower hull given
     the segment points `S` with function values
     `fS` and the `domain` of the logpdf.
 
+    All segments are computed at once with NumPy array operations,
+    so that hulls of meshes with many thousand points are built in
+    milliseconds (e.g. from dense grids of tabulated `logpdf` values).
+
     Parameters
     ----------
     S : np.ndarray (N, 1)
@@ -66,108 +322,666 @@ def compute_hulls(S, fS, domain):
         for x<= a must be positive.
         If this domain is unbounded to the right                  the derivative of the logpdf for x>=b
         must be negative.
+        On a bounded side, the outermost upper hull segment extends
+        from the mesh to the bound, which need not be part of `S`.
+
+    dfS : tuple, optional
+        Value of the derivative of the `logpdf` for each
+        of the given segment points in `S`.
+        If given, the upper hull is built from the tangents at all points
+        in `S` (as in Gilks & Wild), which is tighter than the
+        default upper hull built from extended secants.
 
     Returns
     ----------
-    lower_hull: List[arspy.hull.HullNode]
-    upper_hull: List[arspy.hull.HullNode]
+    lower_hull: arspy.hull.Hull
+    upper_hull: arspy.hull.Hull
 
     """
     assert(len(S) == len(fS))
     assert(len(domain) == 2)
+    assert(dfS is None or len(dfS) == len(S))
 
-    lower_hull = []
+    S, fS = asarray(S, dtype=float), asarray(fS, dtype=float)
 
-    for li in range(len(S) - 1):
-        m = (fS[li + 1] - fS[li]) / (S[li + 1] - S[li])
-        b = fS[li] - m * S[li]
-        left = S[li]
-        right = S[li + 1]
-        lower_hull.append(HullNode(m=m, b=b, left=left, right=right))
+    # secant through S[i] and S[i + 1]
+    with errstate(divide="ignore", invalid="ignore", over="ignore"):
+        m = (fS[1:] - fS[:-1]) / (S[1:] - S[:-1])
+        b = fS[:-1] - m * S[:-1]
+
+    # secants to a value of -inf (e.g. at a bound of the domain) bound
+    # `logpdf` from below by -inf only
+    unbounded = isinf(fS[:-1]) | isinf(fS[1:])
+
+    lower_hull = Hull(
+        m=where(unbounded, 0., m), b=where(unbounded, float("-inf"), b),
+        left=S[:-1], right=S[1:]
+    )
 
     # compute upper piecewise-linear hull
 
+    if dfS is not None:
+        upper_hull = _tangent_upper_hull(S, fS, asarray(dfS, dtype=float), domain)
+
+        assert(len(upper_hull) == len(S))
+
+        return lower_hull, upper_hull
+
     # expected final length of upper hull after full computation
     n_upper_segments = 2 * (len(S) - 2) + isinf(domain[0]) + isinf(domain[1])
 
-    upper_hull = []
+    upper_hull = _secant_upper_hull(S, fS, m, domain)
+
+    assert(len(lower_hull) == len(S) - 1)
+    assert(len(upper_hull) == n_upper_segments)
+
+    return lower_hull, upper_hull
+
+
+def _secant_upper_hull(S, fS, m, domain):
+    """
+    Vectorized computation of all upper hull segments of `compute_hulls`
+    from the secants with slopes `m`, which gives the same results as
+    `_tail_segments` and `_upper_hull_segments` applied to each interval.
+    """
+    n = len(S)
+
+    # interior intervals li = 1, ..., n - 3 are covered by two lines:
+    # the secants through S[li - 1], S[li] and through S[li + 1], S[li + 2]
+    x1, x2, f1, f2 = S[1:-2], S[2:-1], fS[1:-2], fS[2:-1]
+    dx1, df1 = S[1:-2] - S[:-3], fS[1:-2] - fS[:-3]
+    dx2, df2 = S[3:] - S[2:-1], fS[3:] - fS[2:-1]
+
+    m1, m2 = m[:-2], m[2:]
+    b1, b2 = f1 - m1 * x1, f2 - m2 * x2
+
+    if any_(isinf(m1) & isinf(m2)):
+        raise ValueError("both hull slopes are infinite")
+
+    # (nearly) parallel lines are covered by the second line only,
+    # lines with infinite slope by the other line only
+    parallel = isinf(m1) | (absolute(m1 - m2) < 10.0 ** 8 * eps(absolute(m1)))
+    second_infinite = ~parallel & isinf(m2)
+    intersect = ~parallel & ~second_infinite
+
+    with errstate(divide="ignore", invalid="ignore", over="ignore"):
+        # more numerically stable than (b2 - b1) / (m1 - m2)
+        ix = ((f1 * dx1 - df1 * x1) * dx2 - (f2 * dx2 - df2 * x2) * dx1) / (df2 * dx1 - df1 * dx2)
+
+    if any_(intersect & isinf(ix)):
+        raise ValueError("Non finite intersection")
+
+    at_left = intersect & (absolute(ix - x1) < 10.0 ** 12 * eps(x1))
+    at_right = intersect & ~at_left & (absolute(ix - x2) < 10.0 ** 12 * eps(x2))
+    ix = where(at_left, x1, where(at_right, x2, ix))
+
+    if any_(intersect & ((ix < x1) | (ix > x2))):
+        raise ValueError("Intersection out of bounds -- logpdf is not concave")
+
+    ix = where(parallel, x1, where(second_infinite, x2, ix))
+
+    def interleave(first, second):
+        return concatenate((first[:, None], second[:, None]), axis=1).ravel()
+
+    # on a bounded side, the outermost segment reaches the bound
+    first, last = _outermost_breakpoints(S, domain)
+
+    # segments from left to right: left tail, first interval (along the
+    # second line), two per interior interval, last interval (along the
+    # second last line) and right tail
+    m_, b_, left, right = (
+        concatenate(values) for values in zip(
+            (m[1:2], fS[1:2] - m[1:2] * S[1:2], [first], S[1:2]),
+            (interleave(m1, m2), interleave(b1, b2), interleave(x1, ix), interleave(ix, x2)),
+            (m[-2:-1], fS[-2:-1] - m[-2:-1] * S[-2:-1], S[-2:-1], [last]),
+        )
+    )
+
+    empty = concatenate(([False], interleave(parallel, second_infinite), [False]))
 
     if isinf(domain[0]):
         # first line (from -infinity)
+        m_, b_ = concatenate((m[:1], m_)), concatenate((fS[:1] - m[:1] * S[:1], b_))
+        left, right = concatenate(([float("-inf")], left)), concatenate((S[:1], right))
+        empty = concatenate(([False], empty))
 
-        m = (fS[1] - fS[0]) / (S[1] - S[0])
-        b = fS[0] - m * S[0]
-        pr = compute_segment_log_prob(float("-inf"), S[0], m, b)
+    if isinf(domain[1]):
+        # last line (to infinity)
+        m_, b_ = concatenate((m_, m[-1:])), concatenate((b_, fS[-1:] - m[-1:] * S[-1:]))
+        left, right = concatenate((left, S[-1:])), concatenate((right, [float("inf")]))
+        empty = concatenate((empty, [False]))
+
+    log_pr = _segment_log_probs(left, right, m_, b_)
+    log_pr[empty] = float("-inf")
+
+    assert(len(m_) == 2 * (n - 2) + isinf(domain[0]) + isinf(domain[1]))
+
+    return Hull(m=m_, b=b_, left=left, right=right, log_pr=log_pr)
+
+
+def _tangent_upper_hull(S, fS, dfS, domain):
+    """
+    Vectorized computation of all upper hull segments of `compute_hulls`
+    along the tangents at `S`, which gives the same results as
+    `_tangent_segment` applied to each point.
+    """
+    x1, x2 = S[:-1], S[1:]
+    dm = dfS[:-1] - dfS[1:]
+
+    # (nearly) parallel tangents, logpdf is linear in between
+    parallel = absolute(dm) < 10.0 ** 8 * eps(maximum(absolute(dfS[:-1]), absolute(dfS[1:])))
+
+    with errstate(divide="ignore", invalid="ignore", over="ignore"):
+        ix = (fS[1:] - fS[:-1] - x2 * dfS[1:] + x1 * dfS[:-1]) / dm
+
+    at_left = absolute(ix - x1) < 10.0 ** 12 * eps(x1)
+    at_right = ~at_left & (absolute(ix - x2) < 10.0 ** 12 * eps(x2))
+    ix = where(at_left, x1, where(at_right, x2, ix))
+
+    if any_(~parallel & (isnan(ix) | (ix < x1) | (ix > x2))):
+        raise ValueError("Intersection out of bounds -- logpdf is not concave")
+
+    ix = where(parallel, (x1 + x2) / 2., ix)
+
+    left = concatenate(([float(domain[0])], ix))
+    right = concatenate((ix, [float(domain[1])]))
+
+    b = fS - dfS * S
+
+    return Hull(
+        m=dfS, b=b, left=left, right=right,
+        log_pr=_segment_log_probs(left, right, dfS, b)
+    )
+
+
+def compute_hull_stack(S, fS, n_abscissae, domain):
+    """
+    Compute lower and upper hulls of many independent targets at once,
+    using vectorized operations over all targets.
+
+    The upper hulls are built from extended secants exactly as in
+    `compute_hulls`, but each interval always carries two segments
+    (one of which may be empty) so that all hulls share one layout.
+
+    Parameters
+    ----------
+    S : np.ndarray (n_targets, n_columns)
+        Sorted mesh of each target, one per row.
+        Row `k` holds `n_abscissae[k]` points, followed by padding.
+
+    fS : np.ndarray (n_targets, n_columns)
+        Value of the `logpdf` of each target at its mesh points.
+
+    n_abscissae : np.ndarray (n_targets,)
+        Number of mesh points of each target, at least 3.
+
+    domain : np.ndarray (n_targets, 2)
+        Domain of the `logpdf` of each target, see `compute_hulls`.
+
+    Returns
+    ----------
+    lower_hulls: arspy.hull.HullStack
+    upper_hulls: arspy.hull.HullStack
+
+    """
+    S, fS = asarray(S, dtype=float), asarray(fS, dtype=float)
+    n_abscissae, domain = asarray(n_abscissae), asarray(domain, dtype=float)
+
+    assert(S.shape == fS.shape)
+    assert((n_abscissae >= 3).all()), "At least three abscissae are required."
+
+    # interval `i` of row `k` is in use if i < n_abscissae[k] - 1
+    interval = arange(S.shape[1] - 1)
+    used = interval < (n_abscissae - 1)[:, None]
+    last_interval = (n_abscissae - 2)[:, None]
+
+    with errstate(divide="ignore", invalid="ignore", over="ignore"):
+        # secant through S[:, i] and S[:, i + 1]
+        m = (fS[:, 1:] - fS[:, :-1]) / (S[:, 1:] - S[:, :-1])
+        b = fS[:, :-1] - m * S[:, :-1]
+
+    # unused intervals are padded with empty segments at the last point
+    first = S[:, :1]
+    last = take_along_axis(S, (n_abscissae - 1)[:, None], axis=1)
+
+    m, b = where(used, m, 0.), where(used, b, float("-inf"))
+    left, right = where(used, S[:, :-1], last), where(used, S[:, 1:], last)
+
+    lower_hulls = HullStack(m=m, b=b, left=left, right=right)
+
+    # over interval `i`, the upper hull is the minimum of the secants
+    # `i - 1` and `i + 1` (the first and last interval only use one of them)
+    m1 = concatenate((m[:, 1:2], m[:, :-1]), axis=1)
+    b1 = concatenate((b[:, 1:2], b[:, :-1]), axis=1)
+    m2 = concatenate((m[:, 1:], m[:, -1:]), axis=1)
+    b2 = concatenate((b[:, 1:], b[:, -1:]), axis=1)
+
+    at_end = interval == last_interval
+    m2, b2 = where(at_end, m1, m2), where(at_end, b1, b2)
+
+    with errstate(divide="ignore", invalid="ignore", over="ignore"):
+        ix = (b2 - b1) / (m1 - m2)
+
+    # (nearly) parallel lines, the outermost intervals (which only
+    # use one line) and unused intervals are covered by one segment only
+    single = (
+        (absolute(m1 - m2) < 10.0 ** 8 * eps(absolute(m1))) |
+        (interval == 0) | at_end | ~used
+    )
+    ix = where(single, left, ix)
+
+    tolerance = 10.0 ** 12 * eps(maximum(absolute(left), absolute(right)))
+    if any_(~single & ~((ix >= left - tolerance) & (ix <= right + tolerance))):
+        raise ValueError("Intersection out of bounds -- logpdf is not concave")
+
+    ix = clip(ix, left, right)
+
+    # unbounded tails along the outermost secants; on a bounded side, the
+    # tail continues the outermost interval segment up to the bound
+    # (as in `compute_hulls`), it is empty if the mesh reaches the bound
+    unbounded_left, unbounded_right = isinf(domain[:, :1]), isinf(domain[:, 1:])
+
+    first_m = where(unbounded_left, m[:, :1], m1[:, :1])
+    first_b = where(unbounded_left, b[:, :1], b1[:, :1])
+
+    last_m, last_b = (
+        where(unbounded_right, *(take_along_axis(values, last_interval, axis=1) for values in pair))
+        for pair in ((m, m1), (b, b1))
+    )
+
+    left_tail_start, right_tail_stop = domain[:, :1], domain[:, 1:]
 
-        upper_hull.append(
-            HullNode(m=m, b=b, pr=pr, left=float("-inf"), right=S[0])
+    segments = [
+        concatenate(values, axis=1) for values in (
+            (first_m, m1, m2, last_m),
+            (first_b, b1, b2, last_b),
+            (left_tail_start, left, ix, last),
+            (first, ix, right, right_tail_stop),
         )
+    ]
+
+    # order segments as left tail, (first, second) segment of each interval, right tail
+    n_intervals = S.shape[1] - 1
+    order = concatenate((
+        [0], (arange(2 * n_intervals) % 2) * n_intervals + arange(2 * n_intervals) // 2 + 1,
+        [2 * n_intervals + 1]
+    ))
+
+    m, b, left, right = (values[:, order] for values in segments)
+
+    log_pr = _segment_log_probs(left, right, m, b)
+
+    return lower_hulls, HullStack(m=m, b=b, left=left, right=right, log_pr=log_pr)
+
+
+def update_hulls(S, fS, lower_hull, upper_hull, x, fx, domain, dfS=None, dfx=None):
+    """
+    Insert a single new abscissa `x` with `logpdf` value `fx`
+    into the mesh `S` and update both hulls in place.
+
+    Only the lower hull segments adjacent to `x` and the
+    (at most four) upper hull intervals whose supporting lines
+    pass through a neighbour of `x` are recomputed, all other
+    segments and all previously computed values in `fS` are reused.
+
+    Parameters
+    ----------
+    S : list
+       Sorted straight-line segment points accumulated thus far.
+       `x` is inserted into `S` in place, unless `S` already contains it.
+       If the hulls were already built from a mesh containing `x`,
+       they are returned unchanged.
+
+    fS : list
+        Value of the `logpdf` for each of the given segment points in `S`.
+        `fx` is inserted into `fS` in place, unless `S` already contains `x`.
+
+    lower_hull: arspy.hull.Hull
+        Lower hull previously computed for `S` and `fS`.
+
+    upper_hull: arspy.hull.Hull
+        Upper hull previously computed for `S` and `fS`.
+
+    x : float
+        New segment point to insert.
 
-    # second line
-    m = (fS[2] - fS[1]) / (S[2] - S[1])
-    b = fS[1] - m * S[1]
-    pr = compute_segment_log_prob(S[0], S[1], m, b)
+    fx : float
+        Value of the `logpdf` at `x`.
 
-    upper_hull.append(HullNode(m=m, b=b, pr=pr, left=S[0], right=S[1]))
+    domain : Tuple[float, float]
+        Domain of `logpdf`, see `compute_hulls`.
+
+    dfS : list, optional
+        Value of the derivative of the `logpdf` for each of the given
+        segment points in `S`, if the hulls were built from tangents
+        (see `compute_hulls`).
+        `dfx` is inserted into `dfS` in place, unless `S` already contains `x`.
+
+    dfx : float, optional
+        Value of the derivative of the `logpdf` at `x`, required if `dfS`
+        is given and `S` does not already contain `x`.
+
+    Returns
+    ----------
+    lower_hull: arspy.hull.Hull
+    upper_hull: arspy.hull.Hull
+
+    """
+    assert(len(S) == len(fS))
+
+    k = bisect(S, x)
+
+    if k > 0 and S[k - 1] == x:
+        if len(lower_hull) == len(S) - 1:
+            # `x` is a point of the mesh the hulls were built from
+            return lower_hull, upper_hull
+
+        # `x` was already added to `S` and `fS`, e.g. by `arspy.ars.CachedLogpdf`
+        k -= 1
+    else:
+        S.insert(k, x)
+        fS.insert(k, fx)
+
+        if dfS is not None:
+            dfS.insert(k, dfx)
+
+    n = len(S)
+
+    # lower hull: the segment containing `x` is split in two
+    # (or a single new one is added if `x` lies outside of the mesh).
+    lo = max(0, k - 1)
+    lower_hull._splice([(
+        lo, lo + (0 < k < n - 1),
+        [_lower_hull_segment(S, fS, li) for li in range(lo, min(n - 2, k) + 1)]
+    )])
+
+    if dfS is not None:
+        # tangent upper hull: the tangent at `x` is new and the tangents
+        # next to it now end at their intersection with it
+        first, last = max(0, k - 1), min(n - 1, k + 1)
+
+        upper_hull._splice([(first, last, [
+            _tangent_segment(S, fS, dfS, li, domain) for li in range(first, last + 1)
+        ])])
+
+        return lower_hull, upper_hull
+
+    # upper hull: each interval [S[i], S[i + 1]] is bounded by the
+    # secants through S[i - 1], S[i] and S[i + 1], S[i + 2],
+    # so only the intervals within two points of `x` change.
+    first, last = max(0, k - 2), min(n - 2, k + 1)
+
+    left_tail, right_tail = _tail_segments(S, fS, domain)
+
+    # intervals [first, last - 1] of the old mesh are replaced
+    start = len(left_tail) + _segment_offset(first, n - 1)
+    stop = (
+        len(left_tail) + _segment_offset(last - 1, n - 1) +
+        _n_interval_segments(last - 1, n - 1)
+    )
+
+    upper_hull._splice([
+        (0, len(left_tail), left_tail),
+        (start, stop, [
+            segment for li in range(first, last + 1)
+            for segment in _upper_hull_segments(S, fS, li, domain)
+        ]),
+        (len(upper_hull) - len(right_tail), len(upper_hull), right_tail),
+    ])
+
+    return lower_hull, upper_hull
+
+
+def prune_mesh(S, fS, n_abscissae, dfS=None):
+    """
+    Remove points from the mesh `S` (and their values from `fS`) in place
+    until at most `n_abscissae` points remain.
+
+    Points are removed in order of the lower hull mass that is lost when
+    merging the two secants through them into one, i.e. the points that
+    contribute least to a tight envelope are removed first.
+    The two outermost points on either side are never removed, since
+    they determine the slopes of the unbounded upper hull segments.
+
+    Parameters
+    ----------
+    S : list
+       Sorted straight-line segment points accumulated thus far.
+
+    fS : list
+        Value of the `logpdf` for each of the given segment points in `S`.
+
+    n_abscissae : int
+        Maximal number of points to keep, must be at least 4.
+
+    dfS : list, optional
+        Value of the derivative of the `logpdf` for each of the given
+        segment points in `S`, pruned along with `fS` in place.
+
+    """
+    assert(len(S) == len(fS))
+    assert(n_abscissae >= 4), "At least four abscissae must be kept."
+
+    while len(S) > n_abscissae:
+        x, fx = asarray(S, dtype=float), asarray(fS, dtype=float)
+
+        # log masses of the secants left and right of each interior point
+        # and of the secant that replaces both if the point is removed
+        slopes = (fx[1:] - fx[:-1]) / (x[1:] - x[:-1])
+        log_masses = _segment_log_probs(x[:-1], x[1:], slopes, fx[:-1] - slopes * x[:-1])
+
+        merged_slopes = (fx[2:] - fx[:-2]) / (x[2:] - x[:-2])
+        merged_log_masses = _segment_log_probs(
+            x[:-2], x[2:], merged_slopes, fx[:-2] - merged_slopes * x[:-2]
+        )
+
+        shift = log_masses.max()
+        with errstate(invalid="ignore"):
+            lost_mass = (
+                exp(log_masses[:-1] - shift) + exp(log_masses[1:] - shift) -
+                exp(merged_log_masses - shift)
+            )
+
+        # candidates are interior points 2, ..., len(S) - 3
+        candidates = argsort(lost_mass[1:-1], kind="mergesort") + 2
+
+        # removing non-adjacent points only leaves all other scores unchanged
+        removable = ones(len(S), dtype=bool)
+        removed = []
+
+        for index in candidates:
+            if len(S) - len(removed) <= n_abscissae:
+                break
+            if removable[index]:
+                removed.append(index)
+                removable[index - 1:index + 2] = False
+
+        removed = set(removed)
+
+        for values in (S, fS) if dfS is None else (S, fS, dfS):
+            values[:] = [
+                value for index, value in enumerate(values) if index not in removed
+            ]
+
+
+def _lower_hull_segment(S, fS, li):
+    if isinf(fS[li]) or isinf(fS[li + 1]):
+        # see `compute_hulls`
+        return 0., float("-inf"), S[li], S[li + 1]
+
+    m = (fS[li + 1] - fS[li]) / (S[li + 1] - S[li])
+    b = fS[li] - m * S[li]
+    return m, b, S[li], S[li + 1]
+
+
+def _n_interval_segments(li, n):
+    """ Number of upper hull segments over interval `li` of a mesh with `n` points. """
+    return 1 if li in (0, n - 2) else 2
+
+
+def _segment_offset(li, n):
+    """ Index of the first upper hull segment over interval `li` (tails excluded). """
+    return 0 if li == 0 else 2 * li - 1
+
+
+def _outermost_breakpoints(S, domain):
+    """
+    Left end of the first and right end of the last interval segment of the
+    secant upper hull: the mesh ends on unbounded sides (where the tails
+    take over) and the bounds of the domain on bounded sides, since the
+    outermost secants lie above a concave `logpdf` beyond the mesh, too.
+    """
+    first = S[0] if isinf(domain[0]) else domain[0]
+    last = S[-1] if isinf(domain[1]) else domain[1]
+
+    return float(first), float(last)
+
+
+def _upper_hull_segments(S, fS, li, domain):
+    """
+    Compute the upper hull segments `(m, b, left, right, log_pr)`
+    over the interval `[S[li], S[li + 1]]`, extended to the bound of
+    `domain` for the outermost intervals of a bounded side.
+    """
+    if li == 0:
+        # second line
+        m = (fS[2] - fS[1]) / (S[2] - S[1])
+        b = fS[1] - m * S[1]
+        left = _outermost_breakpoints(S, domain)[0]
+        pr = compute_segment_log_prob(left, S[1], m, b)
+
+        return [(m, b, left, S[1], pr)]
+
+    if li == len(S) - 2:
+        # second last line
+        m = (fS[-2] - fS[-3]) / float(S[-2] - S[-3])
+        b = fS[-2] - m * S[-2]
+        right = _outermost_breakpoints(S, domain)[1]
+        pr = compute_segment_log_prob(S[-2], right, m, b)
+
+        return [(m, b, S[-2], right, pr)]
+    m1, b1, m2, b2, ix = _interval_lines(S, fS, li)
+
+    return [
+        (m1, b1, S[li], ix, compute_segment_log_prob(S[li], ix, m1, b1)),
+        (m2, b2, ix, S[li + 1], compute_segment_log_prob(ix, S[li + 1], m2, b2)),
+    ]
+
+
+def _interval_lines(S, fS, li):
+    """
+    Lines `(m1, b1)` and `(m2, b2)` of the secant upper hull over the
+    interior interval `[S[li], S[li + 1]]` (the secants through `S[li - 1]`,
+    `S[li]` and through `S[li + 1]`, `S[li + 2]`) and the point `ix` where
+    the hull switches from the first to the second line.
+
+    (Nearly) parallel lines and lines with infinite slope (next to a value
+    of -inf) are covered by the other line only, i.e. `ix` is `S[li]`
+    or `S[li + 1]`. Also used by the kernel in `arspy.kernels`.
+    """
+    dx1 = S[li] - S[li - 1]
+    df1 = fS[li] - fS[li - 1]
+    dx2 = S[li + 2] - S[li + 1]
+    df2 = fS[li + 2] - fS[li + 1]
+
+    f1 = fS[li]
+    f2 = fS[li + 1]
+    x1 = S[li]
+    x2 = S[li + 1]
 
-    # interior lines
     # there are two lines between each abscissa
-    for li in range(1, len(S) - 2):
+    m1 = df1 / dx1
+    b1 = f1 - m1 * x1
 
-        m1 = (fS[li] - fS[li - 1]) / (S[li] - S[li - 1])
-        b1 = fS[li] - m1 * S[li]
+    m2 = df2 / dx2
+    b2 = f2 - m2 * x2
 
-        m2 = (fS[li + 2] - fS[li + 1]) / (S[li + 2] - S[li + 1])
-        b2 = fS[li + 1] - m2 * S[li + 1]
+    if isinf(m1) and isinf(m2):
+        raise ValueError("both hull slopes are infinite")
 
-        if isinf(m1) and isinf(m2):
-            raise ValueError("both hull slopes are infinite")
+    if isinf(m1) or abs(m1 - m2) < 10.0 ** 8 * eps(abs(m1)):
+        return m1, b1, m2, b2, x1
 
-        dx1 = S[li] - S[li - 1]
-        df1 = fS[li] - fS[li - 1]
-        dx2 = S[li + 2] - S[li + 1]
-        df2 = fS[li + 2] - fS[li + 1]
+    if isinf(m2):
+        return m1, b1, m2, b2, x2
 
-        f1 = fS[li]
-        f2 = fS[li + 1]
-        x1 = S[li]
-        x2 = S[li + 1]
+    # more numerically stable than (b2 - b1) / (m1 - m2)
+    ix = ((f1 * dx1 - df1 * x1) * dx2 - (f2 * dx2 - df2 * x2) * dx1) / (df2 * dx1 - df1 * dx2)
 
-        # more numerically stable than above
-        ix = ((f1 * dx1 - df1 * x1) * dx2 - (f2 * dx2 - df2 * x2) * dx1) / (df2 * dx1 - df1 * dx2)
+    if isinf(ix):
+        raise ValueError("Non finite intersection")
 
-        if isinf(m1) or abs(m1 - m2) < 10.0 ** 8 * eps(m1):
-            ix = S[li]
-            pr1 = float("-inf")
-            pr2 = compute_segment_log_prob(ix, S[li + 1], m2, b2)
-        elif isinf(m2):
-            ix = S[li + 1]
-            pr1 = compute_segment_log_prob(S[li], ix, m1, b1)
-            pr2 = float("-inf")
-        else:
-            if isinf(ix):
-                raise ValueError("Non finite intersection")
+    if abs(ix - x1) < 10.0 ** 12 * eps(x1):
+        ix = x1
+    elif abs(ix - x2) < 10.0 ** 12 * eps(x2):
+        ix = x2
+
+    if ix < x1 or ix > x2:
+        raise ValueError("Intersection out of bounds -- logpdf is not concave")
+
+    return m1, b1, m2, b2, ix
+
+
+def _tangent_intersection(S, fS, dfS, li):
+    """
+    Compute the intersection of the tangents at `S[li]` and `S[li + 1]`.
+    """
+    dm = dfS[li] - dfS[li + 1]
+
+    if abs(dm) < 10.0 ** 8 * eps(max(abs(dfS[li]), abs(dfS[li + 1]))):
+        # (nearly) parallel tangents, logpdf is linear in between
+        return (S[li] + S[li + 1]) / 2.
+
+    ix = (fS[li + 1] - fS[li] - S[li + 1] * dfS[li + 1] + S[li] * dfS[li]) / dm
+
+    if abs(ix - S[li]) < 10.0 ** 12 * eps(S[li]):
+        ix = S[li]
+    elif abs(ix - S[li + 1]) < 10.0 ** 12 * eps(S[li + 1]):
+        ix = S[li + 1]
+
+    if isnan(ix) or ix < S[li] or ix > S[li + 1]:
+        raise ValueError("Intersection out of bounds -- logpdf is not concave")
+
+    return ix
+
+
+def _tangent_segment(S, fS, dfS, li, domain):
+    """
+    Compute the upper hull segment `(m, b, left, right, log_pr)`
+    along the tangent at `S[li]`.
+    """
+    # tangents lie above a concave `logpdf` everywhere,
+    # so the outermost ones reach the bounds of the domain
+    if li == 0:
+        left = float(domain[0])
+    else:
+        left = _tangent_intersection(S, fS, dfS, li - 1)
 
-            if abs(ix - S[li]) < 10.0 ** 12 * eps(S[li]):
-                ix = S[li]
-            elif abs(ix - S[li + 1]) < 10.0**12 * eps(S[li + 1]):
-                ix = S[li + 1]
+    if li == len(S) - 1:
+        right = float(domain[1])
+    else:
+        right = _tangent_intersection(S, fS, dfS, li)
+
+    m = dfS[li]
+    b = fS[li] - m * S[li]
 
-            if ix < S[li] or ix > S[li + 1]:
-                raise ValueError("Intersection out of bounds -- logpdf is not concave")
+    return m, b, left, right, compute_segment_log_prob(left, right, m, b)
 
-            pr1 = compute_segment_log_prob(S[li], ix, m1, b1)
-            pr2 = compute_segment_log_prob(ix, S[li + 1], m2, b2)
 
-            upper_hull.append(HullNode(m=m1, b=b1, pr=pr1, left=S[li], right=ix))
-            upper_hull.append(HullNode(m=m2, b=b2, pr=pr2, left=ix, right=S[li + 1]))
+def _tail_segments(S, fS, domain):
+    """
+    Compute the unbounded upper hull segments `(m, b, left, right, log_pr)`
+    to the left and right of the mesh, if `domain` is unbounded on that side.
+    """
+    left_tail, right_tail = [], []
 
-    # second last line
-    m = (fS[-2] - fS[-3]) / float(S[-2] - S[-3])
-    b = fS[-2] - m * S[-2]
-    pr = compute_segment_log_prob(S[-2], S[-1], m, b)
+    if isinf(domain[0]):
+        # first line (from -infinity)
+        m = (fS[1] - fS[0]) / (S[1] - S[0])
+        b = fS[0] - m * S[0]
+        pr = compute_segment_log_prob(float("-inf"), S[0], m, b)
 
-    upper_hull.append(HullNode(m=m, b=b, pr=pr, left=S[-2], right=S[-1]))
+        left_tail.append((m, b, float("-inf"), S[0], pr))
 
     if isinf(domain[1]):
         # last line (to infinity)
@@ -175,28 +989,25 @@ def compute_hulls(S, fS, domain):
         b = fS[-1] - m * S[-1]
         pr = compute_segment_log_prob(S[-1], float("inf"), m, b)
 
-        upper_hull.append(
-            HullNode(m=m, b=b, pr=pr, left=S[-1], right=float("inf"))
-        )
+        right_tail.append((m, b, S[-1], float("inf"), pr))
 
-    # normalize probabilities
-    normalized_probabilities = exp_normalize(
-        asarray([node.pr for node in upper_hull])
-    )
-
-    for node, probability in zip(upper_hull, normalized_probabilities):
-        node.pr = probability
-
-    assert(len(lower_hull) == len(S) - 1)
-    assert(len(upper_hull) == n_upper_segments)
-
-    return lower_hull, upper_hull
+    return left_tail, right_tail
 
 
 def compute_segment_log_prob(l, r, m, b):
-    if l == float("-inf"):
+    """
+    Logarithm of the (unnormalized) probability mass of the exponentiated
+    line segment `m * x + b` over `[l, r]`, `-inf` for empty segments.
+    """
+    if not r > l:
+        # empty segment
+        return -inf
+    elif m == 0:
+        # flat segment
+        return b + log(r - l)
+    elif l == -inf:
         return -log(m) + m * r + b
-    elif r == float("inf"):
+    elif r == inf:
         return -log(-m) + m * l + b
 
     M = max(m * r + b, m * l + b)
@@ -204,42 +1015,94 @@ def compute_segment_log_prob(l, r, m, b):
     return -log(abs(m)) + log(abs(exp(m * r + b - M) - exp(m * l + b - M))) + M
 
 
-def sample_upper_hull(upper_hull, random_stream):
+def _segment_log_probs(l, r, m, b):
+    """
+    Vectorized version of `compute_segment_log_prob` for arrays of segments,
+    which evaluates the very same expressions and thus gives identical results.
+    """
+    l, r, m, b = broadcast_arrays(*(asarray(values, dtype=float) for values in (l, r, m, b)))
+
+    with errstate(divide="ignore", invalid="ignore", over="ignore"):
+        value_left, value_right = m * l + b, m * r + b
+        M = maximum(value_right, value_left)
+
+        log_prob = -log(absolute(m)) + log(absolute(exp(value_right - M) - exp(value_left - M))) + M
+
+        right_tail = r == inf
+        log_prob[right_tail] = (-log(-m) + m * l + b)[right_tail]
+
+        left_tail = l == -inf
+        log_prob[left_tail] = (-log(m) + m * r + b)[left_tail]
+
+        # flat segment
+        flat = m == 0
+        log_prob[flat] = (b + log(r - l))[flat]
+
+    # empty segment
+    log_prob[~(r > l)] = -inf
+
+    return log_prob
+
+
+def sample_upper_hull(upper_hull, random_stream, size=None, alias_table=None):
     """
     Return a single value randomly sampled from
     the given `upper_hull`.
 
     Parameters
     ----------
-    upper_hull : List[pyars.hull.HullNode]
+    upper_hull : arspy.hull.Hull or List[arspy.hull.HullNode]
         Upper hull to evaluate.
 
-    random_stream : numpy.random.RandomState
-        (Seeded) stream of random values to use during sampling.
+    random_stream : numpy.random.RandomState or numpy.random.Generator
+        (Seeded) stream of random values to use during sampling,
+        or a `arspy.probability_utils.UniformStream` drawing from one.
+
+    size : int, optional
+        If given, draw `size` values at once using vectorized
+        operations and return them as an array.
+
+    alias_table : Tuple[np.ndarray, np.ndarray], optional
+        Alias table over the segment probabilities `upper_hull.pr`,
+        as built by `arspy.probability_utils.alias_table`.
+        If given, segments are selected in constant time per value
+        instead of by binary search. Requires `size`.
 
     Returns
     ----------
-    sample : float
-        Single value randomly sampled from `upper_hull`.
+    sample : float or np.ndarray
+        Single value randomly sampled from `upper_hull`
+        or array of `size` values if `size` is given.
 
     """
-    cdf = cumsum([node.pr for node in upper_hull])
+    upper_hull = Hull.from_nodes(upper_hull)
+    random_stream = uniform_stream(random_stream)
+
+    if size is not None:
+        return _sample_upper_hull_array(upper_hull, random_stream, size, alias_table)
+
+    assert(alias_table is None), "Alias tables require 'size'."
 
     # randomly choose a line segment
     U = random_stream.rand()
 
-    node = next(
-        (node for node, cdf_value in zip(upper_hull, cdf) if U < cdf_value),
-        upper_hull[-1]  # default is last line segment
-    )
+    # default is last line segment
+    index = min(searchsorted(upper_hull.cdf, U, side="right"), len(upper_hull) - 1)
 
     # sample along that line segment
     U = random_stream.rand()
 
-    m, left, right = node.m, node.left, node.right
+    m, left, right = (
+        float(upper_hull.m[index]), float(upper_hull.left[index]),
+        float(upper_hull.right[index])
+    )
 
-    M = max(m * right, m * left)
-    x = (log(U * (exp(m * right - M) - exp(m * left - M)) + exp(m * left - M)) + M) / m
+    if m == 0:
+        # flat segment
+        x = left + U * (right - left)
+    else:
+        M = max(m * right, m * left)
+        x = (log(U * (exp(m * right - M) - exp(m * left - M)) + exp(m * left - M)) + M) / m
 
     assert(x >= left and x <= right)
 
@@ -249,23 +1112,187 @@ def sample_upper_hull(upper_hull, random_stream):
     return x
 
 
+def _sample_upper_hull_array(upper_hull, random_stream, size, alias_table=None):
+    # randomly choose line segments
+    if alias_table is not None:
+        index = sample_alias_table(*alias_table, random_stream=random_stream, size=size)
+    else:
+        # default is last line segment
+        index = minimum(
+            searchsorted(upper_hull.cdf, random_stream.rand(size), side="right"),
+            len(upper_hull) - 1
+        )
+
+    m, left, right = upper_hull.m[index], upper_hull.left[index], upper_hull.right[index]
+
+    # sample along those line segments
+    return _sample_segments(m, left, right, random_stream.rand(size))
+
+
+def _sample_segments(m, left, right, U):
+    """
+    Invert the cdf of the exponentiated line segments with slopes `m`
+    on `[left, right]` at the uniform values `U` (all arrays).
+    """
+    with errstate(divide="ignore", invalid="ignore", over="ignore"):
+        M = maximum(m * right, m * left)
+        x = (log(U * (exp(m * right - M) - exp(m * left - M)) + exp(m * left - M)) + M) / m
+
+        # flat segments
+        flat = m == 0
+        x[flat] = left[flat] + U[flat] * (right[flat] - left[flat])
+
+    if isinf(x).any() or isnan(x).any():
+        raise ValueError("sampled an infinite or 'nan' x")
+
+    return clip(x, left, right)
+
+
 def evaluate_hulls(x, lower_hull, upper_hull):
+    """
+    Evaluate lower and upper hull at `x`.
+
+    Parameters
+    ----------
+    x : float or np.ndarray
+        Point(s) to evaluate the hulls at.
+
+    lower_hull: arspy.hull.Hull or List[arspy.hull.HullNode]
+        Lower hull to evaluate.
+
+    upper_hull: arspy.hull.Hull or List[arspy.hull.HullNode]
+        Upper hull to evaluate.
+
+    Returns
+    ----------
+    lh_val : float or np.ndarray
+        Value(s) of the lower hull at `x`, `-inf` outside of the mesh.
+
+    uh_val : float or np.ndarray
+        Value(s) of the upper hull at `x`.
+
+    """
+    lower_hull, upper_hull = Hull.from_nodes(lower_hull), Hull.from_nodes(upper_hull)
+
+    if ndim(x) > 0:
+        return _evaluate_hulls_array(asarray(x, dtype=float), lower_hull, upper_hull)
 
     # lower bound
     lh_val = 0.0
 
-    if x < min(node.left for node in lower_hull):
+    if x < lower_hull.left[0]:
         lh_val = float("-inf")
-    elif x > max(node.right for node in lower_hull):
+    elif x > lower_hull.right[-1]:
         lh_val = float("-inf")
     else:
-        node = next(node for node in lower_hull if node.left <= x <= node.right)
-        lh_val = node.m * x + node.b
+        index = lower_hull.locate(x)
+        lh_val = float(lower_hull.m[index] * x + lower_hull.b[index])
 
     # upper bound
     uh_val = 0.0
 
-    node = next(node for node in upper_hull if node.left <= x <= node.right)
-    uh_val = node.m * x + node.b
+    index = upper_hull.locate(x)
+    uh_val = float(upper_hull.m[index] * x + upper_hull.b[index])
+
+    return lh_val, uh_val
+
+
+def _evaluate_hulls_array(x, lower_hull, upper_hull):
+    def evaluate(hull):
+        index = hull.locate(x)
+        return hull.m[index] * x + hull.b[index]
+
+    # lower bound
+    lh_val = full(x.shape, float("-inf"))
+
+    inside = (x >= lower_hull.left[0]) & (x <= lower_hull.right[-1])
+    lh_val[inside] = evaluate(lower_hull)[inside]
+
+    # upper bound
+    uh_val = evaluate(upper_hull)
+
+    return lh_val, uh_val
+
+
+def sample_upper_hull_stack(upper_hulls, random_stream):
+    """
+    Return one value randomly sampled from each hull in `upper_hulls`.
+
+    Parameters
+    ----------
+    upper_hulls : arspy.hull.HullStack
+        Upper hulls to sample from.
+
+    random_stream : numpy.random.RandomState or numpy.random.Generator
+        (Seeded) stream of random values to use during sampling,
+        or a `arspy.probability_utils.UniformStream` drawing from one.
+
+    Returns
+    ----------
+    samples : np.ndarray (n_targets,)
+        One value randomly sampled from each of the `upper_hulls`.
+
+    """
+    n_targets = len(upper_hulls)
+    random_stream = uniform_stream(random_stream)
+
+    # randomly choose one line segment per hull
+    pr = exp(upper_hulls.log_pr - upper_hulls.log_pr.max(axis=1)[:, None])
+    cdf = cumsum(pr, axis=1)
+
+    U = random_stream.rand(n_targets) * cdf[:, -1]
+    index = count_nonzero(cdf <= U[:, None], axis=1)[:, None]
+
+    m, left, right = (
+        take_along_axis(values, index, axis=1)[:, 0]
+        for values in (upper_hulls.m, upper_hulls.left, upper_hulls.right)
+    )
+
+    # sample along those line segments
+    return _sample_segments(m, left, right, random_stream.rand(n_targets))
+
+
+def evaluate_hull_stack(x, lower_hulls, upper_hulls):
+    """
+    Evaluate each of the lower and upper hulls at one point.
+
+    Parameters
+    ----------
+    x : np.ndarray (n_targets,)
+        Point to evaluate the hulls of each target at.
+
+    lower_hulls: arspy.hull.HullStack
+        Lower hulls to evaluate.
+
+    upper_hulls: arspy.hull.HullStack
+        Upper hulls to evaluate.
+
+    Returns
+    ----------
+    lh_val : np.ndarray (n_targets,)
+        Value of each lower hull at `x`, `-inf` outside of its mesh.
+
+    uh_val : np.ndarray (n_targets,)
+        Value of each upper hull at `x`.
+
+    """
+    x = asarray(x, dtype=float)
+
+    def evaluate(hulls):
+        index = hulls.locate(x)[:, None]
+        return (
+            take_along_axis(hulls.m, index, axis=1)[:, 0] * x +
+            take_along_axis(hulls.b, index, axis=1)[:, 0]
+        )
+
+    # lower bound, lower hulls end at the last point of each mesh
+    lh_val = full(x.shape, float("-inf"))
+
+    inside = (x >= lower_hulls.left[:, 0]) & (x <= lower_hulls.right[:, -1])
+
+    lh_val[inside] = evaluate(lower_hulls)[inside]
+
+    # upper bound
+    uh_val = evaluate(upper_hulls)
 
     return lh_val, uh_val
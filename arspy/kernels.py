@@ -0,0 +1,236 @@
+"""
+This module contains a scalar kernel of the adaptive rejection sampling
+loop (envelope sampling, squeeze test, `logpdf` evaluation and hull
+reconstruction) written in plain arithmetic on NumPy arrays.
+
+If `numba` is installed, the kernel is compiled and calls back into
+(compiled) `logpdf` functions without going through the interpreter.
+Otherwise, the very same code runs in the interpreter, so both backends
+give identical results for the same uniform random values.
+"""
+from math import exp, log
+import numpy as np
+from arspy.hull import compute_segment_log_prob, _interval_lines
+
+try:
+    from numba import njit
+    from numba.extending import is_jitted
+except ImportError:
+    njit = None
+
+__all__ = (
+    "NUMBA_AVAILABLE",
+    "jit_logpdf",
+    "sample_kernel",
+)
+
+NUMBA_AVAILABLE = njit is not None
+
+
+def _jit(function):
+    return function if njit is None else njit(function)
+
+
+def jit_logpdf(logpdf):
+    """
+    Return `logpdf` compiled with `numba.njit` if numba is available
+    (and `logpdf` is not compiled already), otherwise `logpdf` itself.
+    """
+    if njit is None or is_jitted(logpdf):
+        return logpdf
+
+    return njit(logpdf)
+
+
+# shared with `arspy.hull`, so that both paths accept the same meshes
+_segment_log_prob = _jit(compute_segment_log_prob)
+_interval_lines_kernel = _jit(_interval_lines)
+
+
+@_jit
+def _set_segment(segments, k, m, b, left, right):
+    segments[0, k], segments[1, k] = m, b
+    segments[2, k], segments[3, k] = left, right
+    segments[4, k] = _segment_log_prob(left, right, m, b)
+
+
+@_jit
+def _compute_upper_hull(S, fS, n, lower, upper, segments):
+    """
+    Write the (secant) upper hull of the first `n` points of `S` on the
+    domain `(lower, upper)`, laid out as in `arspy.hull.compute_hulls`,
+    into the rows `m, b, left, right, log_pr` of `segments` and return
+    the number of segments.
+    """
+    k = 0
+    unbounded_left, unbounded_right = lower == -np.inf, upper == np.inf
+
+    if unbounded_left:
+        m = (fS[1] - fS[0]) / (S[1] - S[0])
+        _set_segment(segments, k, m, fS[0] - m * S[0], -np.inf, S[0])
+        k += 1
+
+    # first interval, along the second line (on a bounded side,
+    # the outermost segments reach the bound)
+    m = (fS[2] - fS[1]) / (S[2] - S[1])
+    _set_segment(segments, k, m, fS[1] - m * S[1], S[0] if unbounded_left else lower, S[1])
+    k += 1
+
+    # interior intervals, two lines each
+    for li in range(1, n - 2):
+        m1, b1, m2, b2, ix = _interval_lines_kernel(S, fS, li)
+        _set_segment(segments, k, m1, b1, S[li], ix)
+        _set_segment(segments, k + 1, m2, b2, ix, S[li + 1])
+        k += 2
+
+    # last interval, along the second last line
+    m = (fS[n - 2] - fS[n - 3]) / (S[n - 2] - S[n - 3])
+    _set_segment(segments, k, m, fS[n - 2] - m * S[n - 2], S[n - 2], S[n - 1] if unbounded_right else upper)
+    k += 1
+
+    if unbounded_right:
+        m = (fS[n - 1] - fS[n - 2]) / (S[n - 1] - S[n - 2])
+        _set_segment(segments, k, m, fS[n - 1] - m * S[n - 1], S[n - 1], np.inf)
+        k += 1
+
+    # cumulative (unnormalized) probabilities of all segments
+    shift = segments[4, :k].max()
+    total = 0.
+
+    for j in range(k):
+        total += exp(segments[4, j] - shift)
+        segments[5, j] = total
+
+    return k
+
+
+@_jit
+def _sample_kernel(logpdf, S, fS, n, lower, upper, U, samples):
+    capacity = len(S)
+    segments = np.empty((6, 2 * capacity))
+
+    n_segments = _compute_upper_hull(S, fS, n, lower, upper, segments)
+
+    n_accepted, n_used, n_evaluations = 0, 0, 0
+
+    while n_accepted < len(samples) and n_used + 3 <= len(U) and n < capacity:
+        # randomly choose a line segment (binary search on the cdf)
+        target = U[n_used] * segments[5, n_segments - 1]
+        low, high = 0, n_segments - 1
+        while low < high:
+            middle = (low + high) // 2
+            if segments[5, middle] > target:
+                high = middle
+            else:
+                low = middle + 1
+
+        m, b = segments[0, low], segments[1, low]
+        left, right = segments[2, low], segments[3, low]
+
+        # sample along that line segment
+        V = U[n_used + 1]
+
+        if m == 0:
+            x = left + V * (right - left)
+        else:
+            M = max(m * right, m * left)
+            x = (log(V * (exp(m * right - M) - exp(m * left - M)) + exp(m * left - M)) + M) / m
+
+        x = min(max(x, left), right)
+
+        uh_val = m * x + b
+
+        # lower hull, -inf outside of the mesh and next to values of -inf
+        lh_val = -np.inf
+        i = np.searchsorted(S[:n], x)
+        li = min(max(i - 1, 0), n - 2)
+
+        if S[0] <= x <= S[n - 1] and fS[li] > -np.inf and fS[li + 1] > -np.inf:
+            slope = (fS[li + 1] - fS[li]) / (S[li + 1] - S[li])
+            lh_val = fS[li] + slope * (x - S[li])
+
+        log_U = log(U[n_used + 2])
+        n_used += 3
+
+        if log_U <= lh_val - uh_val:
+            # accept, u is below lower bound
+            samples[n_accepted] = x
+            n_accepted += 1
+            continue
+
+        fx = logpdf(x)
+        n_evaluations += 1
+
+        if log_U <= fx - uh_val:
+            # accept, u is between lower bound and f
+            samples[n_accepted] = x
+            n_accepted += 1
+
+        if i < n and S[i] == x:
+            continue
+
+        # insert `x` into the mesh and rebuild the upper hull
+        for j in range(n, i, -1):
+            S[j], fS[j] = S[j - 1], fS[j - 1]
+
+        S[i], fS[i] = x, fx
+        n += 1
+
+        n_segments = _compute_upper_hull(S, fS, n, lower, upper, segments)
+
+    return n_accepted, n_used, n, n_evaluations
+
+
+def sample_kernel(logpdf, S, fS, n, domain, U, samples):
+    """
+    Run adaptive rejection sampling on the secant hulls of the mesh `S`,
+    one candidate at a time, consuming three uniform random values
+    from `U` per candidate (segment, position along it, squeeze test).
+
+    Stops once `samples` is full, `U` is exhausted or `S` is full.
+
+    Parameters
+    ----------
+    logpdf : callable
+        Univariate `logpdf` of the target, called on floats.
+        Must be compiled with numba (see `jit_logpdf`) if numba is available.
+
+    S : np.ndarray
+        Sorted mesh in its first `n` entries. Rejected candidates
+        are inserted in place, the remaining entries are spare capacity.
+
+    fS : np.ndarray
+        Value of `logpdf` at the points in `S`, updated in place.
+
+    n : int
+        Number of points in the mesh, at least 4.
+
+    domain : Tuple[float, float]
+        Domain of `logpdf`, see `arspy.hull.compute_hulls`.
+
+    U : np.ndarray
+        Uniform random values on `[0, 1)`.
+
+    samples : np.ndarray
+        Array to write the accepted samples to.
+
+    Returns
+    ----------
+    n_accepted : int
+        Number of samples written to `samples`.
+
+    n_used : int
+        Number of values of `U` used.
+
+    n : int
+        Number of points in the mesh afterwards.
+
+    n_evaluations : int
+        Number of calls to `logpdf`.
+
+    """
+    assert(n >= 4), "At least four abscissae are required."
+
+    return _sample_kernel(
+        logpdf, S, fS, n, float(domain[0]), float(domain[1]), U, samples
+    )
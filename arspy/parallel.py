@@ -0,0 +1,225 @@
+"""
+This module runs independent adaptive rejection sampling jobs,
+e.g. independent chains of the same target, and independent Gibbs
+sampling chains on a pool of processes.
+
+Each job draws from its own random stream, derived from a single seed
+using `numpy.random.SeedSequence.spawn`, so that streams are
+statistically independent and results only depend on the seed and the
+jobs, not on the number of worker processes.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count
+import numpy as np
+from numpy.random import MT19937, RandomState, SeedSequence
+from arspy.ars import adaptive_rejection_sampling
+from arspy.gibbs import gibbs_sampling
+
+__all__ = (
+    "parallel_adaptive_rejection_sampling",
+    "parallel_gibbs_sampling",
+    "spawn_random_streams",
+)
+
+
+def spawn_random_streams(seed, n_streams: int):
+    """
+    Derive `n_streams` statistically independent random streams from `seed`.
+
+    Parameters
+    ----------
+    seed : int, numpy.random.SeedSequence or None
+        Root seed. Defaults to `None`, in which case fresh entropy is used.
+
+    n_streams : int
+        Number of streams to derive.
+
+    Returns
+    ----------
+    random_streams : list
+        `n_streams` NumPy RandomState objects, stream `i` only depends on
+        `seed` and `i`.
+
+    """
+    if not isinstance(seed, SeedSequence):
+        seed = SeedSequence(seed)
+
+    return [RandomState(MT19937(child)) for child in seed.spawn(n_streams)]
+
+
+def _run_job(job, n_samples, random_stream):
+    return np.asarray(adaptive_rejection_sampling(
+        n_samples=n_samples, random_stream=random_stream, **job
+    ), dtype=float)
+
+
+def parallel_adaptive_rejection_sampling(jobs, n_samples: int, seed=None,
+                                         n_workers: int=None, out=None):
+    """
+    Run independent sampling jobs on a pool of `n_workers` processes.
+
+    Job `i` draws from the `i`-th stream of `spawn_random_streams(seed, len(jobs))`,
+    so for a given `seed` the samples are bit-identical for any `n_workers`.
+
+    Parameters
+    ----------
+    jobs : Sequence[dict]
+        Keyword arguments of `arspy.ars.adaptive_rejection_sampling`
+        (`logpdf`, `a`, `b`, `domain` and optionally `block_size` and `dlogpdf`)
+        for each job. Independent chains of one target use the same
+        arguments for all jobs.
+        Jobs are sent to worker processes, so their `logpdf` must be
+        picklable (e.g. a module-level function), unless `n_workers` is 1.
+
+    n_samples : int
+        Number of samples to draw in each job.
+
+    seed : int, numpy.random.SeedSequence, optional
+        Root seed of the random streams of all jobs.
+        Defaults to `None`, in which case fresh entropy is used.
+
+    n_workers : int, optional
+        Number of worker processes. Defaults to `None`, in which case
+        one process per CPU is used. If 1, all jobs run in this process.
+
+    out : np.ndarray (len(jobs), n_samples), optional
+        Preallocated array to write the samples of job `i` to row `i` of.
+
+    Returns
+    ----------
+    samples : np.ndarray (len(jobs), n_samples)
+        Samples of all jobs, one row per job (`out`, if given).
+
+    Examples
+    ----------
+    >>> job = dict(logpdf=lambda x: -x ** 2, a=-2., b=2., domain=(float("-inf"), float("inf")))
+    >>> chains = parallel_adaptive_rejection_sampling([job] * 4, n_samples=100, seed=1, n_workers=1)
+    >>> chains.shape
+    (4, 100)
+
+    """
+    jobs = list(jobs)
+
+    if out is None:
+        out = np.empty((len(jobs), n_samples))
+
+    assert(out.shape == (len(jobs), n_samples)), "'out' must have shape (len(jobs), n_samples)."
+
+    random_streams = spawn_random_streams(seed, len(jobs))
+
+    if n_workers is None:
+        n_workers = cpu_count() or 1
+
+    n_workers = max(1, min(n_workers, len(jobs)))
+
+    if n_workers == 1:
+        for i, (job, random_stream) in enumerate(zip(jobs, random_streams)):
+            out[i] = _run_job(job, n_samples, random_stream)
+
+        return out
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        results = executor.map(
+            _run_job, jobs, [n_samples] * len(jobs), random_streams,
+            chunksize=max(1, len(jobs) // (4 * n_workers))
+        )
+
+        for i, samples in enumerate(results):
+            out[i] = samples
+
+    return out
+
+
+def _run_chain(x0, n_sweeps, random_stream, kwargs):
+    return gibbs_sampling(
+        x0=x0, n_sweeps=n_sweeps, random_stream=random_stream, **kwargs
+    )
+
+
+def parallel_gibbs_sampling(x0, n_sweeps: int, n_chains: int=None, seed=None,
+                            n_workers: int=None, out=None, **kwargs):
+    """
+    Run independent Gibbs sampling chains (see `arspy.gibbs.GibbsSampler`)
+    on a pool of `n_workers` processes.
+
+    Chain `i` draws from the `i`-th stream of `spawn_random_streams(seed, n_chains)`,
+    so for a given `seed` the chains are bit-identical for any `n_workers`.
+
+    Parameters
+    ----------
+    x0 : np.ndarray (n_dimensions,) or (n_chains, n_dimensions)
+        Initial state of all chains or of each chain.
+
+    n_sweeps : int
+        Number of sweeps to run in each chain.
+
+    n_chains : int, optional
+        Number of chains. Defaults to `len(x0)` if `x0` is two-dimensional.
+
+    seed : int, numpy.random.SeedSequence, optional
+        Root seed of the random streams of all chains.
+        Defaults to `None`, in which case fresh entropy is used.
+
+    n_workers : int, optional
+        Number of worker processes. Defaults to `None`, in which case
+        one process per CPU is used. If 1, all chains run in this process.
+
+    out : np.ndarray (n_chains, n_sweeps, n_dimensions), optional
+        Preallocated array to write chain `i` to `out[i]` of.
+
+    kwargs
+        Keyword arguments of `arspy.gibbs.GibbsSampler` (`logpdf` or
+        `conditionals`, `domains`, ...) shared by all chains.
+        They are sent to worker processes, so they must be picklable
+        (e.g. module-level functions), unless `n_workers` is 1.
+
+    Returns
+    ----------
+    chains : np.ndarray (n_chains, n_sweeps, n_dimensions)
+        States after each sweep of all chains (`out`, if given).
+
+    Examples
+    ----------
+    >>> logpdf = lambda x: -(x[0] ** 2 + x[0] * x[1] + x[1] ** 2)
+    >>> chains = parallel_gibbs_sampling(np.zeros(2), n_sweeps=100, n_chains=4, seed=1, n_workers=1, logpdf=logpdf)
+    >>> chains.shape
+    (4, 100, 2)
+
+    """
+    x0 = np.asarray(x0, dtype=float)
+
+    if x0.ndim == 1:
+        assert(n_chains is not None), "'n_chains' must be given for a one-dimensional 'x0'."
+        x0 = np.broadcast_to(x0, (n_chains,) + x0.shape)
+    elif n_chains is None:
+        n_chains = len(x0)
+
+    assert(x0.shape[0] == n_chains), "'x0' must hold one initial state per chain."
+
+    if out is None:
+        out = np.empty((n_chains, n_sweeps, x0.shape[1]))
+
+    assert(out.shape == (n_chains, n_sweeps, x0.shape[1])), "'out' must have shape (n_chains, n_sweeps, n_dimensions)."
+
+    random_streams = spawn_random_streams(seed, n_chains)
+
+    if n_workers is None:
+        n_workers = cpu_count() or 1
+
+    n_workers = max(1, min(n_workers, n_chains))
+
+    if n_workers == 1:
+        for i, random_stream in enumerate(random_streams):
+            _run_chain(x0[i], n_sweeps, random_stream, dict(kwargs, out=out[i]))
+
+        return out
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        results = executor.map(
+            _run_chain, x0, [n_sweeps] * n_chains, random_streams, [kwargs] * n_chains
+        )
+
+        for i, chain in enumerate(results):
+            out[i] = chain
+
+    return out
@@ -2,7 +2,177 @@ import numpy as np
 from numpy import exp
 
 
+class UniformStream(object):
+    """
+    Stream of uniform random values on `[0, 1)` with the `rand` interface
+    of a NumPy RandomState, drawn from a NumPy `RandomState` or `Generator`.
+
+    Values are drawn from `random_stream` in blocks of `buffer_size`
+    and handed out one by one (or as arrays) in the same order,
+    which avoids one call into the random number generator per value.
+    The values handed out only depend on the seed of `random_stream`
+    (for a RandomState, they are the same values `random_stream.rand`
+    would return), but `random_stream` itself runs ahead of them by up to
+    `buffer_size` values.
+
+    Parameters
+    ----------
+    random_stream : numpy.random.RandomState or numpy.random.Generator
+        Source of the uniform random values.
+
+    buffer_size : int, optional
+        Number of values to draw at once, defaults to 4096.
+        If 0, all values are drawn on demand.
+
+    """
+    def __init__(self, random_stream, buffer_size: int=4096):
+        assert(buffer_size >= 0), "Buffer size must be >= 0."
+
+        self.random_stream = random_stream
+        self.buffer_size = buffer_size
+
+        # RandomState and objects with the same interface provide `rand`
+        self._draw = getattr(random_stream, "rand", None) or random_stream.random
+
+        # upcoming values in reverse order, so that the next one can be popped
+        self._buffer = []
+
+    def rand(self, size: int=None):
+        """
+        Return the next uniform random value or
+        an array of the next `size` values.
+        """
+        buffer = self._buffer
+
+        if size is None:
+            if not buffer:
+                if not self.buffer_size:
+                    return float(self._draw())
+
+                buffer[:] = self._draw(self.buffer_size)[::-1].tolist()
+
+            return buffer.pop()
+
+        n_buffered = min(size, len(buffer))
+        values = buffer[len(buffer) - n_buffered:][::-1]
+        del buffer[len(buffer) - n_buffered:]
+
+        if n_buffered == size:
+            return np.asarray(values, dtype=float)
+
+        return np.concatenate((values, self._draw(size - n_buffered)))
+
+    def put_back(self, values):
+        """
+        Return unused `values`, the last ones handed out by `rand`,
+        so that they are handed out again next, in the same order.
+        """
+        self._buffer.extend(np.asarray(values, dtype=float)[::-1].tolist())
+
+
+def sampler_uniform_stream(random_stream, owned: bool=False):
+    """
+    Return the `UniformStream` a sampler draws its uniform random values from.
+
+    A `UniformStream` is used as is, so that callers can opt in to buffering
+    and short-lived samplers can share one buffer. Other streams are only
+    buffered if the sampler created (`owned`) them: a stream passed by the
+    caller is read on demand, so that it advances by exactly the values the
+    sampler uses and later draws of the caller are not affected.
+    """
+    if isinstance(random_stream, UniformStream):
+        return random_stream
+
+    if owned:
+        return UniformStream(random_stream)
+
+    return UniformStream(random_stream, buffer_size=0)
+
+
+def uniform_stream(random_stream):
+    """
+    Return `random_stream` if it provides `rand` (e.g. a RandomState or
+    `UniformStream`) and an unbuffered `UniformStream` drawing from it otherwise
+    (e.g. for a NumPy `Generator`).
+    """
+    if hasattr(random_stream, "rand"):
+        return random_stream
+
+    return UniformStream(random_stream, buffer_size=0)
+
+
 def exp_normalize(probs_array):
     xp = probs_array - np.max(probs_array)
     exp_x = exp(xp)
-    return exp_x / sum(exp_x)
+    # sequential sum (like the builtin `sum`), unlike pairwise `np.sum`,
+    # so that hulls built in bulk or by updates normalize identically
+    return exp_x / np.cumsum(exp_x)[-1]
+
+
+def log_sum_exp(log_values):
+    max_value = np.max(log_values)
+
+    if np.isinf(max_value):
+        return max_value
+
+    return max_value + np.log(np.sum(exp(log_values - max_value)))
+
+
+def alias_table(probabilities):
+    """
+    Build a Walker alias table (using Vose's method) for the discrete
+    distribution with the given `probabilities`, which allows to
+    sample from it in constant time per sample (see `sample_alias_table`).
+
+    Parameters
+    ----------
+    probabilities : np.ndarray
+        Probabilities of each outcome, need not be normalized.
+
+    Returns
+    ----------
+    acceptance : np.ndarray
+        Probability to keep outcome `i` when column `i` is drawn.
+
+    alias : np.ndarray
+        Outcome to use instead of `i` when column `i` is drawn but not kept.
+
+    """
+    probabilities = np.asarray(probabilities, dtype=float)
+    n_outcomes = len(probabilities)
+
+    scaled = probabilities * n_outcomes / np.sum(probabilities)
+
+    acceptance = np.ones(n_outcomes)
+    alias = np.arange(n_outcomes)
+
+    small = list(np.flatnonzero(scaled < 1.))
+    large = list(np.flatnonzero(scaled >= 1.))
+
+    while small and large:
+        less, more = small.pop(), large.pop()
+
+        acceptance[less], alias[less] = scaled[less], more
+
+        scaled[more] -= 1. - scaled[less]
+
+        if scaled[more] < 1.:
+            small.append(more)
+        else:
+            large.append(more)
+
+    # remaining columns are (up to rounding errors) full
+    return acceptance, alias
+
+
+def sample_alias_table(acceptance, alias, random_stream, size):
+    """
+    Draw `size` outcome indices from an alias table built by `alias_table`.
+    """
+    random_stream = uniform_stream(random_stream)
+
+    column = np.minimum(
+        (random_stream.rand(size) * len(acceptance)).astype(int), len(acceptance) - 1
+    )
+
+    return np.where(random_stream.rand(size) < acceptance[column], column, alias[column])
@@ -0,0 +1,294 @@
+"""
+This module samples from densities that are only known through
+log-density values tabulated on a grid, e.g. outputs of an upstream
+job stored as `.npy` files, without calling any `logpdf`.
+
+The target is the linear interpolation of the tabulated log-density
+(extrapolated linearly into unbounded tails). This interpolation is
+exactly the lower hull of the grid, so candidates drawn from the
+upper hull are accepted or rejected by the squeeze test alone,
+which makes the samples exact and the sampling fully vectorized.
+"""
+import numpy as np
+from numpy.random import RandomState
+from arspy.ars import SamplerStats
+from arspy.hull import compute_hulls, evaluate_hulls, _sample_segments
+from arspy.probability_utils import sampler_uniform_stream
+from typing import Tuple
+
+__all__ = (
+    "TabulatedSampler",
+    "tabulated_rejection_sampling",
+)
+
+
+class TabulatedSampler(object):
+    """
+    Rejection sampler for the log-concave density whose log-density
+    is the linear interpolation of `values` tabulated at `abscissae`.
+
+    The hulls are built once from the whole grid (see
+    `arspy.hull.compute_hulls`) and never refined, as there is no
+    `logpdf` to refine them with. Arrays of `float64` values, including
+    memory-mapped ones (`numpy.load(file, mmap_mode="r")`), are used
+    without copies. The hulls take about 14 floats per grid point.
+
+    Parameters
+    ----------
+    abscissae : np.ndarray (n_abscissae,)
+        Strictly increasing grid points, at least three.
+
+    values : np.ndarray (n_abscissae,)
+        Finite log-density (up to an additive constant) at each grid point.
+        Its linear interpolation must be concave.
+
+    domain : Tuple[float, float], optional
+        Domain of the target. Each bound is either infinite, in which case
+        the log-density is extrapolated linearly beyond the grid (and must
+        increase towards the grid), or the first (last) grid point.
+        Defaults to `None`, in which case the target is restricted to the grid.
+
+    random_stream : RandomState or Generator, optional
+        (Seeded) stream of random values to use during sampling.
+        Defaults to `None`, in which case a new `numpy.random.RandomState`
+        is created.
+
+    Attributes
+    ----------
+    stats : arspy.ars.SamplerStats
+        Performance counters, `n_evaluations` stays zero.
+
+    Examples
+    ----------
+    >>> import numpy as np
+    >>> grid = np.linspace(-5., 5., 10001)
+    >>> sampler = TabulatedSampler(abscissae=grid, values=-grid ** 2 / 2., random_stream=np.random.RandomState(seed=1))
+    >>> samples = sampler.sample(10000)
+    >>> bool(abs(samples.mean()) < 0.05 and abs(samples.std() - 1.) < 0.05)
+    True
+
+    """
+    def __init__(self, abscissae, values, domain: Tuple[float, float]=None,
+                 random_stream=None):
+        S, fS = np.asarray(abscissae, dtype=float), np.asarray(values, dtype=float)
+
+        assert(S.ndim == 1 and S.shape == fS.shape), "'abscissae' and 'values' must be one-dimensional arrays of the same length."
+        assert(len(S) >= 3), "At least three abscissae are required."
+        assert((S[1:] > S[:-1]).all()), "Abscissae must be strictly increasing."
+        assert(np.isfinite(fS).all()), "Values must be finite."
+
+        if domain is None:
+            domain = (S[0], S[-1])
+
+        assert(len(domain) == 2), "Domain must be two-element iterable."
+        assert(domain[0] == float("-inf") or domain[0] == S[0]), "Lower bound of the domain must be -inf or the first abscissa."
+        assert(domain[1] == float("inf") or domain[1] == S[-1]), "Upper bound of the domain must be inf or the last abscissa."
+
+        owns_random_stream = random_stream is None
+
+        if random_stream is None:
+            random_stream = RandomState()
+
+        self.abscissae, self.values = S, fS
+        self.domain = tuple(float(bound) for bound in domain)
+
+        self.lower_hull, self.upper_hull = compute_hulls(S, fS, self.domain)
+
+        # secants must not steepen, up to round-off in the table
+        m = self.lower_hull.m
+        if (m[1:] - m[:-1] > 10.0 ** 8 * np.finfo(float).eps * np.abs(m[:-1])).any():
+            raise ValueError("Interpolated values are not concave")
+
+        if np.isinf(domain[0]):
+            assert(m[0] > 0), "values must increase at the first abscissae, since the domain is unbounded to the left"
+
+        if np.isinf(domain[1]):
+            assert(m[-1] < 0), "values must decrease at the last abscissae, since the domain is unbounded to the right"
+
+        self._uniforms = sampler_uniform_stream(random_stream, owned=owns_random_stream)
+
+        self.stats = SamplerStats()
+        self.stats.n_abscissae = self.stats.max_n_abscissae = len(S)
+        self.stats.n_upper_segments = len(self.upper_hull)
+
+    def logpdf(self, x):
+        """
+        Evaluate the interpolated log-density of the target at `x`.
+
+        Parameters
+        ----------
+        x : float or np.ndarray
+            Point(s) in the domain to evaluate the log-density at.
+
+        Returns
+        ----------
+        fx : float or np.ndarray
+            Log-density at `x`, up to the additive constant of `values`.
+
+        """
+        lh_val, uh_val = evaluate_hulls(x, self.lower_hull, self.upper_hull)
+
+        # beyond the grid, the tails of the upper hull extrapolate the table
+        return np.where(np.isinf(lh_val), uh_val, lh_val)[()]
+
+    def draw(self):
+        """ Draw a single sample from the target. """
+        return float(self.sample(1)[0])
+
+    def sample(self, n_samples: int=None, out=None, chunk_size: int=2 ** 16):
+        """
+        Draw `n_samples` samples from the target.
+
+        Parameters
+        ----------
+        n_samples : int, optional
+            Number of samples to draw. Defaults to `len(out)` if `out` is given.
+
+        out : np.ndarray, optional
+            Preallocated one-dimensional array (or `numpy.memmap`) to write
+            the samples to, chunk by chunk. Must hold at least `n_samples` values.
+
+        chunk_size : int, optional
+            Number of samples drawn at once, defaults to 65536.
+
+        Returns
+        ----------
+        samples : np.ndarray (n_samples,)
+            Samples from the target (`out[:n_samples]`, if `out` is given).
+
+        """
+        if n_samples is None:
+            assert(out is not None), "Either 'n_samples' or 'out' must be given."
+            n_samples = len(out)
+
+        assert(n_samples >= 0), "Number of samples must be >= 0."
+        assert(chunk_size > 0), "Chunk size must be > 0."
+
+        if out is None:
+            out = np.empty(n_samples)
+
+        assert(out.ndim == 1 and len(out) >= n_samples), "'out' must hold 'n_samples' values."
+
+        for start in range(0, n_samples, chunk_size):
+            stop = min(start + chunk_size, n_samples)
+            out[start:stop] = self._sample_chunk(stop - start)
+
+        return out[:n_samples]
+
+    def _sample_chunk(self, n_samples):
+        """
+        Draw `n_samples` samples. Each round draws enough candidates to
+        (most likely) finish, based on the acceptance rate so far.
+        """
+        random_stream, stats = self._uniforms, self.stats
+
+        samples, n_accepted = [np.empty(0)], 0
+
+        while n_accepted < n_samples:
+            acceptance_rate = stats.acceptance_rate if stats.n_candidates else 1.
+            round_size = int((n_samples - n_accepted) / max(acceptance_rate, 1e-3) + 1)
+
+            x, index = self._sample_upper_hull(round_size)
+
+            upper_hull, lower_hull = self.upper_hull, self.lower_hull
+            uh_val = upper_hull.m[index] * x + upper_hull.b[index]
+
+            # upper hull segments of `compute_hulls` lie over the grid
+            # intervals 0, 1, 1, 2, 2, ..., n - 3, n - 3, n - 2 (see
+            # `arspy.hull._segment_offset`), preceded and followed by the tails
+            index = index - np.isinf(self.domain[0])
+            interval = np.minimum((index + 1) // 2, len(lower_hull) - 1)
+            inside = (index >= 0) & (index < 2 * len(lower_hull) - 2)
+
+            # the lower hull is the target within the grid,
+            # beyond the grid the tails of the upper hull are
+            log_ratio = np.where(
+                inside, lower_hull.m[interval] * x + lower_hull.b[interval] - uh_val, 0.
+            )
+
+            accepted = np.log(random_stream.rand(round_size)) <= log_ratio
+
+            samples.append(x[accepted])
+            n_accepted += len(samples[-1])
+
+            stats.n_candidates += round_size
+            stats.n_squeezed += len(samples[-1])
+            stats.n_samples += len(samples[-1])
+
+        # surplus samples are dropped, keep the counters consistent
+        n_surplus = n_accepted - n_samples
+        stats.n_squeezed -= n_surplus
+        stats.n_samples -= n_surplus
+
+        return np.concatenate(samples)[:n_samples]
+
+    def _sample_upper_hull(self, size):
+        """
+        Draw `size` candidates from the upper hull (see
+        `arspy.hull.sample_upper_hull`) along with their segment indices,
+        so that the hulls can be evaluated without searching the grid again.
+        """
+        upper_hull, random_stream = self.upper_hull, self._uniforms
+
+        # default is last line segment
+        index = np.minimum(
+            np.searchsorted(upper_hull.cdf, random_stream.rand(size), side="right"),
+            len(upper_hull) - 1
+        )
+
+        x = _sample_segments(
+            upper_hull.m[index], upper_hull.left[index], upper_hull.right[index],
+            random_stream.rand(size)
+        )
+
+        return x, index
+
+
+def tabulated_rejection_sampling(abscissae, values, n_samples: int=None,
+                                 domain: Tuple[float, float]=None,
+                                 random_stream=None, out=None):
+    """
+    Draw `n_samples` samples from the log-concave density whose
+    log-density is the linear interpolation of `values` tabulated
+    at `abscissae`, see `TabulatedSampler`.
+
+    Parameters
+    ----------
+    abscissae : np.ndarray (n_abscissae,)
+        Strictly increasing grid points, e.g. `numpy.load(file, mmap_mode="r")`.
+
+    values : np.ndarray (n_abscissae,)
+        Log-density (up to an additive constant) at each grid point.
+
+    n_samples : int, optional
+        Number of samples to draw. Defaults to `len(out)` if `out` is given.
+
+    domain : Tuple[float, float], optional
+        Domain of the target, see `TabulatedSampler`.
+        Defaults to the range of the grid.
+
+    random_stream : RandomState or Generator, optional
+        (Seeded) stream of random values to use during sampling.
+
+    out : np.ndarray, optional
+        Preallocated one-dimensional array (or `numpy.memmap`) to write the samples to.
+
+    Returns
+    ----------
+    samples : np.ndarray (n_samples,)
+        Samples from the target.
+
+    Examples
+    ----------
+    >>> import numpy as np
+    >>> grid = np.linspace(0., 10., 1001)
+    >>> samples = tabulated_rejection_sampling(grid, -grid, 1000, random_stream=np.random.RandomState(seed=1))
+    >>> bool(samples.min() >= 0. and samples.max() <= 10.)
+    True
+
+    """
+    sampler = TabulatedSampler(
+        abscissae=abscissae, values=values, domain=domain, random_stream=random_stream
+    )
+
+    return sampler.sample(n_samples, out=out)
@@ -0,0 +1,24 @@
+from numpy import allclose, bincount
+import numpy as np
+
+from arspy.probability_utils import alias_table, sample_alias_table
+
+
+def test_alias_table():
+    random_stream = np.random.RandomState(seed=1)
+
+    for probabilities in (np.asarray([0.5, 0.5]), np.asarray([0.1, 0.0, 0.6, 0.3]),
+                          random_stream.dirichlet(np.ones(50))):
+        acceptance, alias = alias_table(probabilities)
+
+        # each column splits its mass 1 / n between itself and its alias
+        n_outcomes = len(probabilities)
+        implied = bincount(np.arange(n_outcomes), weights=acceptance, minlength=n_outcomes)
+        implied += bincount(alias, weights=1. - acceptance, minlength=n_outcomes)
+
+        assert(allclose(implied / n_outcomes, probabilities))
+
+        samples = sample_alias_table(acceptance, alias, random_stream, size=200000)
+        frequencies = bincount(samples, minlength=n_outcomes) / len(samples)
+
+        assert(allclose(frequencies, probabilities, atol=1e-02))
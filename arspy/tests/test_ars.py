@@ -1,9 +1,19 @@
-from numpy import log, exp, allclose, sqrt
+import asyncio
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from numpy import log, exp, allclose, sqrt, mean, std
+from pytest import approx
 import numpy as np
+import pytest
 
 from os.path import dirname, realpath, join
 
-from arspy.ars import adaptive_rejection_sampling
+from arspy.ars import (
+    adaptive_rejection_sampling, batch_adaptive_rejection_sampling,
+    find_initial_abscissae, ARSampler, BatchARSampler, CachedLogpdf
+)
+from arspy.probability_utils import UniformStream
 
 
 data_file = "{}/ars_{{}}.npy".format(
@@ -80,3 +90,693 @@ def test_half_gaussian():
 
 def test_relativistic_monte_carlo_logpdf():
     _run("relativistic_monte_carlo_logpdf")
+
+
+def test_logpdf_evaluated_once_per_point():
+    evaluated_points = []
+
+    def logpdf(x):
+        evaluated_points.append(x)
+        return gaussian(x)
+
+    cached_logpdf = CachedLogpdf(logpdf)
+
+    adaptive_rejection_sampling(
+        logpdf=cached_logpdf, a=-2, b=2, domain=(float("-inf"), float("inf")),
+        n_samples=100, random_stream=np.random.RandomState(seed=1)
+    )
+
+    assert(len(evaluated_points) == len(set(evaluated_points)))
+    assert(cached_logpdf.n_evaluations == len(evaluated_points))
+    assert(cached_logpdf.abscissae == sorted(evaluated_points))
+    # derivative checks at 'a' and 'b' reuse initial mesh points
+    assert(cached_logpdf.n_saved_evaluations == 4)
+
+
+def test_block_mode():
+    for test_name in ("1d-gaussian", "1d-half-gaussian"):
+        input_dict = tests[test_name]
+        logpdf = CachedLogpdf(input_dict["func"])
+
+        samples = adaptive_rejection_sampling(
+            logpdf=logpdf, a=input_dict["a"], b=input_dict["b"],
+            domain=input_dict["domain"], n_samples=100000,
+            random_stream=np.random.RandomState(seed=1), block_size=10000
+        )
+
+        reference_samples = adaptive_rejection_sampling(
+            logpdf=input_dict["func"], a=input_dict["a"], b=input_dict["b"],
+            domain=input_dict["domain"], n_samples=10000,
+            random_stream=np.random.RandomState(seed=1)
+        )
+
+        assert(len(samples) == 100000)
+        assert(allclose(np.mean(samples), np.mean(reference_samples), atol=5e-02))
+        assert(allclose(np.var(samples), np.var(reference_samples), atol=5e-02))
+        assert(logpdf.abscissae == sorted(set(logpdf.abscissae)))
+
+
+def test_sampler_keeps_hulls():
+    input_dict = tests["1d-gaussian"]
+
+    # sampling in two calls continues the same random stream and hulls
+    sampler = ARSampler(
+        logpdf=input_dict["func"], a=input_dict["a"], b=input_dict["b"],
+        domain=input_dict["domain"], random_stream=np.random.RandomState(seed=1)
+    )
+    samples = sampler.sample(10) + [sampler.draw()] + sampler.sample(9)
+
+    assert(allclose(samples, adaptive_rejection_sampling(
+        logpdf=input_dict["func"], a=input_dict["a"], b=input_dict["b"],
+        domain=input_dict["domain"], n_samples=20,
+        random_stream=np.random.RandomState(seed=1)
+    )))
+
+    # warm-started samplers reuse the mesh and all logpdf values
+    warm_sampler = ARSampler.from_sampler(sampler)
+    assert(warm_sampler.abscissae == sampler.abscissae)
+    assert(warm_sampler.logpdf.n_evaluations == 0)
+
+    warm_sampler.sample(10)
+    assert(len(sampler.abscissae) <= len(warm_sampler.abscissae))
+
+    # a new target is evaluated on the warm-started mesh
+    shifted_sampler = ARSampler.from_sampler(
+        sampler, logpdf=lambda x: gaussian(x - 0.1)
+    )
+    assert(shifted_sampler.abscissae == sampler.abscissae)
+    assert(shifted_sampler.logpdf.n_evaluations == len(sampler.abscissae))
+
+
+def test_frozen_sampler():
+    input_dict = tests["relativistic_monte_carlo_logpdf"]
+
+    reference_samples = adaptive_rejection_sampling(
+        logpdf=input_dict["func"], a=input_dict["a"], b=input_dict["b"],
+        domain=input_dict["domain"], n_samples=10000,
+        random_stream=np.random.RandomState(seed=1)
+    )
+
+    for block_size in (None, 1000):
+        sampler = ARSampler(
+            logpdf=input_dict["func"], a=input_dict["a"], b=input_dict["b"],
+            domain=input_dict["domain"], random_stream=np.random.RandomState(seed=2),
+            block_size=block_size, freeze_acceptance_rate=0.95
+        )
+
+        samples = sampler.sample(100000)
+        n_abscissae = len(sampler.abscissae)
+
+        assert(sampler.frozen)
+        assert(len(samples) == 100000)
+        assert(allclose(np.mean(samples), np.mean(reference_samples), atol=1e-01))
+        assert(allclose(np.var(samples), np.var(reference_samples), atol=2e-01))
+
+        sampler.sample(1000)
+        assert(len(sampler.abscissae) == n_abscissae)
+
+
+def test_adaptation_stops():
+    input_dict = tests["1d-gaussian"]
+
+    sampler = ARSampler(
+        logpdf=input_dict["func"], a=input_dict["a"], b=input_dict["b"],
+        domain=input_dict["domain"], random_stream=np.random.RandomState(seed=1),
+        max_abscissae=20
+    )
+
+    initial_efficiency = sampler.efficiency
+    assert(0. < initial_efficiency < 1.)
+
+    sampler.sample(1000)
+
+    assert(sampler.frozen)
+    assert(len(sampler.abscissae) == 20)
+    assert(initial_efficiency < sampler.efficiency < 1.)
+
+    sampler = ARSampler(
+        logpdf=input_dict["func"], a=input_dict["a"], b=input_dict["b"],
+        domain=input_dict["domain"], random_stream=np.random.RandomState(seed=1),
+        freeze_acceptance_rate=0.95
+    )
+
+    sampler.sample(1000)
+
+    assert(sampler.frozen)
+    assert(sampler.efficiency >= 0.95)
+
+
+def test_pruned_sampler():
+    input_dict = tests["1d-gaussian"]
+
+    reference_samples = adaptive_rejection_sampling(
+        logpdf=input_dict["func"], a=input_dict["a"], b=input_dict["b"],
+        domain=input_dict["domain"], n_samples=10000,
+        random_stream=np.random.RandomState(seed=1)
+    )
+
+    for block_size in (None, 1000):
+        sampler = ARSampler(
+            logpdf=input_dict["func"], a=input_dict["a"], b=input_dict["b"],
+            domain=input_dict["domain"], random_stream=np.random.RandomState(seed=2),
+            block_size=block_size, prune_to=12
+        )
+
+        samples = sampler.sample(10000)
+
+        assert(len(sampler.abscissae) <= 12)
+        assert(len(sampler.abscissae) == len(sampler.values))
+        assert(sampler.abscissae == sorted(set(sampler.abscissae)))
+        assert(allclose(np.mean(samples), np.mean(reference_samples), atol=5e-02))
+        assert(allclose(np.var(samples), np.var(reference_samples), atol=5e-02))
+
+
+def test_tangent_hulls():
+    input_dict = tests["relativistic_monte_carlo_logpdf"]
+
+    def dlogpdf(p):
+        return -p / sqrt(p ** 2 + 1)
+
+    reference_samples = adaptive_rejection_sampling(
+        logpdf=input_dict["func"], a=input_dict["a"], b=input_dict["b"],
+        domain=input_dict["domain"], n_samples=10000,
+        random_stream=np.random.RandomState(seed=1)
+    )
+
+    samples = adaptive_rejection_sampling(
+        logpdf=input_dict["func"], a=input_dict["a"], b=input_dict["b"],
+        domain=input_dict["domain"], n_samples=10000,
+        random_stream=np.random.RandomState(seed=2), dlogpdf=dlogpdf
+    )
+
+    assert(allclose(np.mean(samples), np.mean(reference_samples), atol=1e-01))
+    assert(allclose(np.var(samples), np.var(reference_samples), atol=2e-01))
+
+    secant_sampler = ARSampler(
+        logpdf=input_dict["func"], a=input_dict["a"], b=input_dict["b"],
+        domain=input_dict["domain"]
+    )
+    tangent_sampler = ARSampler(
+        logpdf=input_dict["func"], a=input_dict["a"], b=input_dict["b"],
+        domain=input_dict["domain"], dlogpdf=dlogpdf
+    )
+
+    assert(tangent_sampler.efficiency > secant_sampler.efficiency)
+
+
+def test_batch_sampler():
+    means, sigmas = np.linspace(-10., 10., 200), np.linspace(0.5, 3., 200)
+
+    n_evaluations = [0]
+
+    def logpdf(x, targets):
+        n_evaluations[0] += x.size
+        return -(x - means[targets, None]) ** 2 / (2. * sigmas[targets, None] ** 2)
+
+    samples = batch_adaptive_rejection_sampling(
+        logpdf=logpdf, a=means - 1., b=means + 1.,
+        domain=(float("-inf"), float("inf")), n_samples=3,
+        random_stream=np.random.RandomState(seed=1)
+    )
+
+    assert(samples.shape == (200, 3))
+
+    sampler = BatchARSampler(
+        logpdf=logpdf, a=means - 1., b=means + 1.,
+        domain=(float("-inf"), float("inf")),
+        random_stream=np.random.RandomState(seed=1)
+    )
+
+    n_evaluations[0] = 0
+    n_initial_abscissae = sampler.n_abscissae.copy()
+
+    z = (sampler.sample(500) - means[:, None]) / sigmas[:, None]
+
+    assert(allclose(np.mean(z), 0., atol=1e-02))
+    assert(allclose(np.var(z), 1., atol=1e-02))
+
+    # logpdf is only evaluated for targets whose candidate fails the squeeze test
+    assert(n_evaluations[0] == (sampler.n_abscissae - n_initial_abscissae).sum())
+    assert(n_evaluations[0] < 0.1 * z.size)
+
+    # hulls refined target by target match hulls built from scratch
+    lower_hulls, upper_hulls = sampler.lower_hulls, sampler.upper_hulls
+    sampler._compute_hulls()
+    for hulls, expected_hulls in ((lower_hulls, sampler.lower_hulls), (upper_hulls, sampler.upper_hulls)):
+        assert(allclose(hulls.log_mass(), expected_hulls.log_mass()))
+
+    for k, (S, fS) in enumerate(zip(sampler.abscissae, sampler.values)):
+        assert((np.diff(S) > 0).all())
+        assert(allclose(fS, -(S - means[k]) ** 2 / (2. * sigmas[k] ** 2)))
+
+
+def test_generator_random_stream():
+    input_dict = tests["1d-gaussian"]
+
+    samples = [
+        adaptive_rejection_sampling(
+            logpdf=input_dict["func"], a=input_dict["a"], b=input_dict["b"],
+            domain=input_dict["domain"], n_samples=10000,
+            random_stream=np.random.Generator(bit_generator(seed=1))
+        )
+        for bit_generator in (np.random.PCG64, np.random.PCG64, np.random.Philox)
+    ]
+
+    assert(samples[0] == samples[1])
+    assert(samples[0] != samples[2])
+
+    for generator_samples in samples:
+        assert(allclose(np.mean(generator_samples), 0., atol=5e-02))
+        assert(allclose(np.var(generator_samples), 0.5, atol=5e-02))
+
+
+def test_caller_random_stream_not_read_ahead():
+    random_stream = np.random.RandomState(seed=1)
+
+    samples = adaptive_rejection_sampling(
+        logpdf=lambda x: -x ** 2 / 2., a=-2, b=2, domain=(float("-inf"), float("inf")),
+        n_samples=100, random_stream=random_stream
+    )
+
+    # the caller's stream advanced by exactly the values used, as before buffering
+    assert(sum(samples) == approx(-11.154391794996059))
+    assert(random_stream.rand() == 0.31226983770191696)
+
+    # buffering is opt-in by passing a `UniformStream`
+    uniforms = UniformStream(np.random.RandomState(seed=1))
+    buffered_samples = adaptive_rejection_sampling(
+        logpdf=lambda x: -x ** 2 / 2., a=-2, b=2, domain=(float("-inf"), float("inf")),
+        n_samples=100, random_stream=uniforms
+    )
+    assert(buffered_samples == samples)
+
+
+def test_streaming_and_preallocated_output(tmpdir):
+    input_dict = tests["1d-gaussian"]
+
+    def sampler(**kwargs):
+        return ARSampler(
+            logpdf=input_dict["func"], a=input_dict["a"], b=input_dict["b"],
+            domain=input_dict["domain"], random_stream=np.random.RandomState(seed=1),
+            **kwargs
+        )
+
+    reference_samples = sampler().sample(5000)
+
+    # one candidate at a time, chunks continue the same sequence
+    chunks = list(sampler().stream(5000, chunk_size=1024))
+    assert([len(chunk) for chunk in chunks] == [1024] * 4 + [904])
+    assert(np.concatenate(chunks).tolist() == reference_samples)
+
+    out = np.memmap(str(tmpdir.join("samples.dat")), dtype=np.float32, mode="w+", shape=(5000,))
+    samples = sampler().sample(out=out)
+    assert(np.shares_memory(samples, out))
+    assert(np.array_equal(out, np.asarray(reference_samples, dtype=np.float32)))
+
+    samples = adaptive_rejection_sampling(
+        logpdf=input_dict["func"], a=input_dict["a"], b=input_dict["b"],
+        domain=input_dict["domain"], n_samples=5000,
+        random_stream=np.random.RandomState(seed=1), dtype=np.float32
+    )
+    assert(samples.dtype == np.float32 and len(samples) == 5000)
+
+    # block and frozen mode, chunks are drawn independently
+    for block_sampler in (sampler(block_size=1000), sampler(max_abscissae=20)):
+        stream = block_sampler.stream(chunk_size=3000)
+        samples = np.concatenate([next(stream) for _ in range(10)])
+
+        assert(len(samples) == 30000)
+        assert(allclose(np.mean(samples), 0., atol=2e-02))
+        assert(allclose(np.var(samples), 0.5, atol=2e-02))
+
+        assert(block_sampler.sample(0) == [])
+
+
+def test_compiled_sampler():
+    for test_name in ("1d-gaussian", "relativistic_monte_carlo_logpdf"):
+        input_dict = tests[test_name]
+
+        random_streams = [np.random.RandomState(seed=1) for _ in range(2)]
+        samplers = [
+            ARSampler(
+                logpdf=input_dict["func"], a=input_dict["a"], b=input_dict["b"],
+                domain=input_dict["domain"], compiled=compiled,
+                random_stream=random_stream
+            )
+            for compiled, random_stream in zip((False, True), random_streams)
+        ]
+
+        reference_samples, samples = (sampler.sample(5000) for sampler in samplers)
+
+        # the kernel consumes random values in the same order,
+        # and the caller's stream advances by exactly the values used
+        assert(allclose(samples, reference_samples))
+        assert(random_streams[0].rand() == random_streams[1].rand())
+        assert(samplers[0].abscissae == approx(samplers[1].abscissae))
+        assert(samplers[1].logpdf.n_evaluations == len(samplers[1].abscissae))
+
+    # evaluations of kernel runs that add no point to the mesh are counted, too
+    n_calls = [0]
+
+    def logpdf(x):
+        n_calls[0] += 1
+        return -x ** 2 / 2.
+
+    sampler = ARSampler(
+        logpdf=logpdf, a=-2., b=2., domain=(float("-inf"), float("inf")),
+        compiled=True, random_stream=np.random.RandomState(seed=1)
+    )
+    sample_kernel = sampler._sample_kernel
+
+    def sample_kernel_once_without_new_points(logpdf, S, fS, n, domain, U, samples):
+        if sampler._sample_kernel is not sample_kernel:
+            sampler._sample_kernel = sample_kernel
+
+            # a candidate at a point of the mesh is evaluated again
+            logpdf(S[0])
+            return 0, 3, n, 1
+
+        return sample_kernel(logpdf, S=S, fS=fS, n=n, domain=domain, U=U, samples=samples)
+
+    sampler._sample_kernel = sample_kernel_once_without_new_points
+    sampler.sample(100)
+
+    assert(sampler.stats.n_evaluations == sampler.logpdf.n_evaluations == n_calls[0])
+
+
+def test_compiled_sampler_infinite_values():
+    # a mesh with a value of -inf at the bound is accepted by both paths
+    def logpdf(x):
+        return 2. * math.log(x) - x if x > 0 else float("-inf")
+
+    samplers = [
+        ARSampler(
+            logpdf=logpdf, a=1., b=5., domain=(0., float("inf")),
+            abscissae=[0., 1., 2., 5.], compiled=compiled,
+            random_stream=np.random.RandomState(seed=1)
+        )
+        for compiled in (False, True)
+    ]
+
+    reference_samples, samples = (sampler.sample(2000) for sampler in samplers)
+
+    assert(allclose(samples, reference_samples))
+    assert(min(samples) > 0)
+
+
+def test_sampler_stats():
+    input_dict = tests["1d-gaussian"]
+
+    samples, stats = adaptive_rejection_sampling(
+        logpdf=input_dict["func"], a=input_dict["a"], b=input_dict["b"],
+        domain=input_dict["domain"], n_samples=2000,
+        random_stream=np.random.RandomState(seed=1), return_stats=True
+    )
+
+    assert(stats.n_samples == len(samples) == 2000)
+    assert(stats.n_squeezed <= stats.n_samples <= stats.n_candidates)
+    # every candidate that fails the squeeze test is inserted into the mesh
+    assert(stats.n_hull_updates == stats.n_candidates - stats.n_squeezed)
+    assert(stats.n_abscissae == stats.max_n_abscissae == stats.n_evaluations)
+    assert(0. < stats.squeeze_rate <= stats.acceptance_rate <= 1.)
+    assert(stats.timings is None)
+
+    # all other options are passed on to the sampler
+    for kwargs in ({"freeze_acceptance_rate": 0.9, "max_abscissae": 30},
+                   {"compiled": True, "auto_init": True}, {"prune_to": 10}):
+        samples, stats = adaptive_rejection_sampling(
+            logpdf=input_dict["func"], a=input_dict["a"], b=input_dict["b"],
+            domain=input_dict["domain"], n_samples=2000,
+            random_stream=np.random.RandomState(seed=1), return_stats=True, **kwargs
+        )
+        sampler = ARSampler(
+            logpdf=input_dict["func"], a=input_dict["a"], b=input_dict["b"],
+            domain=input_dict["domain"], random_stream=np.random.RandomState(seed=1), **kwargs
+        )
+
+        assert(samples == sampler.sample(2000))
+        assert((stats.n_candidates, stats.n_evaluations, stats.n_abscissae) == (
+            sampler.stats.n_candidates, sampler.stats.n_evaluations, sampler.stats.n_abscissae
+        ))
+
+    for kwargs in ({}, {"block_size": 100}, {"compiled": True}, {"max_abscissae": 20}):
+        mesh_sizes = []
+
+        sampler = ARSampler(
+            logpdf=input_dict["func"], a=input_dict["a"], b=input_dict["b"],
+            domain=input_dict["domain"], random_stream=np.random.RandomState(seed=1),
+            profile=True, on_mesh_update=lambda sampler: mesh_sizes.append(len(sampler.abscissae)),
+            **kwargs
+        )
+        sampler.sample(2000)
+        stats = sampler.stats
+
+        assert(stats.n_samples == 2000)
+        assert(stats.n_evaluations == sampler.logpdf.n_evaluations)
+        assert(stats.n_abscissae == len(sampler.abscissae))
+        assert(stats.n_upper_segments == len(sampler.upper_hull))
+        assert(mesh_sizes == sorted(mesh_sizes) and mesh_sizes[-1] == stats.n_abscissae)
+        assert(sum(stats.timings.values()) > 0.)
+
+
+def test_auto_init():
+    inf = float("inf")
+
+    # 'a' and 'b' far from the mode, on the same side of it
+    sampler = ARSampler(
+        logpdf=lambda x: -(x - 100.) ** 2 / 2., a=0., b=1., domain=(-inf, inf),
+        random_stream=np.random.RandomState(seed=1), auto_init=True
+    )
+    assert(sampler.abscissae[0] < 100. < sampler.abscissae[-1])
+    assert(sampler.logpdf.n_evaluations <= 20)
+
+    samples = sampler.sample(5000)
+    assert(mean(samples) == approx(100., abs=0.1))
+    assert(std(samples) == approx(1., abs=0.1))
+
+    # mode at a bounded boundary, linear logpdf
+    sampler = ARSampler(
+        logpdf=lambda x: -x, a=0., b=1., domain=(0., inf),
+        random_stream=np.random.RandomState(seed=1), auto_init=True
+    )
+    assert(mean(sampler.sample(5000)) == approx(1., abs=0.1))
+
+    # seeded with quantiles of samples of a similar target
+    sampler = ARSampler.from_samples(
+        logpdf=lambda x: -(x - 0.5) ** 2 / 2., samples=np.asarray(samples) - 100., domain=(-inf, inf),
+        random_stream=np.random.RandomState(seed=1)
+    )
+    assert(sampler.auto_init)
+    assert(mean(sampler.sample(5000)) == approx(0.5, abs=0.1))
+
+    with pytest.raises(ValueError):
+        find_initial_abscissae(lambda x: x, a=0., b=1., domain=(-inf, inf))
+
+
+def test_auto_init_bounded_domain():
+    inf = float("inf")
+
+    def gamma_logpdf(x):
+        # Gamma(3, 1), undefined at the bound of the domain
+        return 2. * math.log(x) - x
+
+    def gamma_dlogpdf(x):
+        return 2. / x - 1.
+
+    def vectorized_gamma_logpdf(x):
+        return 2. * np.log(x) - x
+
+    samples = np.random.RandomState(seed=0).gamma(3., size=2000)
+
+    for kwargs in (
+        {"logpdf": gamma_logpdf}, {"logpdf": gamma_logpdf, "dlogpdf": gamma_dlogpdf},
+        {"logpdf": gamma_logpdf, "compiled": True},
+        {"logpdf": vectorized_gamma_logpdf, "block_size": 64},
+    ):
+        sampler = ARSampler.from_samples(
+            samples=samples, domain=(0., inf), random_stream=np.random.RandomState(seed=1),
+            **kwargs
+        )
+
+        # logpdf is not evaluated at the bound, the upper hull reaches it anyway
+        assert(sampler.abscissae[0] > 0.)
+        assert(sampler.upper_hull.left[0] == 0.)
+
+        x = np.asarray(sampler.sample(20000))
+        assert(x.min() < 0.2)
+        assert(mean(x < 0.5) == approx(0.0144, abs=0.003))
+        assert(mean(x) == approx(3., abs=0.05))
+
+    sampler = ARSampler(
+        logpdf=gamma_logpdf, a=1., b=5., domain=(0., inf), auto_init=True,
+        random_stream=np.random.RandomState(seed=1)
+    )
+    assert(mean(np.asarray(sampler.sample(20000)) < 0.5) == approx(0.0144, abs=0.003))
+
+def test_speculative_sampler():
+    input_dict = tests["1d-gaussian"]
+    logpdf = input_dict["func"]
+
+    async def async_logpdf(x):
+        await asyncio.sleep(0.)
+        return logpdf(x)
+
+    samplers = [
+        ARSampler(
+            logpdf=function, a=input_dict["a"], b=input_dict["b"],
+            domain=input_dict["domain"], random_stream=np.random.RandomState(seed=1),
+            n_workers=4, profile=True
+        )
+        for function in (logpdf, async_logpdf)
+    ]
+
+    samples = [np.asarray(sampler.sample(5000)) for sampler in samplers]
+
+    # threads and coroutines evaluate the same candidates and take the same decisions
+    assert(allclose(samples[0], samples[1]))
+    assert(samplers[0].abscissae == samplers[1].abscissae)
+
+    for sampler in samplers:
+        assert(sampler.stats.n_evaluations == sampler.logpdf.n_evaluations == len(sampler.abscissae))
+        assert(sampler.stats.timings["logpdf"] > 0.)
+
+    assert(abs(mean(samples[0])) < 0.1)
+    assert(std(samples[0]) == approx(sqrt(0.5), abs=0.05))
+
+    samplers[0].freeze()
+    assert(std(samplers[0].sample(5000)) == approx(sqrt(0.5), abs=0.05))
+
+    with pytest.raises(AssertionError):
+        ARSampler(
+            logpdf=logpdf, a=input_dict["a"], b=input_dict["b"],
+            domain=input_dict["domain"], n_workers=4, block_size=100
+        )
+
+
+def test_speculative_sampler_threads():
+    input_dict = tests["1d-gaussian"]
+    n_threads = threading.active_count()
+
+    def speculative_sampler(**kwargs):
+        return ARSampler(
+            logpdf=input_dict["func"], a=input_dict["a"], b=input_dict["b"],
+            domain=input_dict["domain"], n_workers=4, **kwargs
+        )
+
+    with speculative_sampler() as sampler:
+        sampler.sample(1000)
+        assert(threading.active_count() > n_threads)
+
+    # the pool is shut down at the end of the block and recreated on demand
+    assert(threading.active_count() == n_threads)
+    sampler.sample(1000)
+    sampler.close()
+    assert(threading.active_count() == n_threads)
+
+    # a shared pool is used as is and not shut down by the samplers
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for _ in range(20):
+            with speculative_sampler(executor=executor) as sampler:
+                sampler.sample(100)
+
+            assert(threading.active_count() <= n_threads + 4)
+
+
+def test_save_and_load(tmpdir):
+    input_dict = tests["1d-gaussian"]
+    n_calls = [0]
+
+    def logpdf(x):
+        n_calls[0] += 1
+        return input_dict["func"](x)
+
+    for random_stream, kwargs in (
+        (np.random.RandomState(seed=1), {}),
+        (np.random.default_rng(1), {"block_size": 100}),
+        (np.random.RandomState(seed=1), {"dlogpdf": lambda x: -2. * x}),
+        (np.random.RandomState(seed=1), {"prune_to": 10, "freeze_acceptance_rate": 0.85}),
+        (np.random.RandomState(seed=1), {"auto_init": True}),
+    ):
+        sampler = ARSampler(
+            logpdf=logpdf, a=input_dict["a"], b=input_dict["b"],
+            domain=input_dict["domain"], random_stream=random_stream, **kwargs
+        )
+        sampler.sample(500)
+
+        file = str(tmpdir.join("sampler.npz"))
+        sampler.save(file)
+
+        n_calls_saved = n_calls[0]
+        restored = ARSampler.load(file, logpdf=logpdf, dlogpdf=kwargs.get("dlogpdf"))
+
+        # restoring evaluates nothing and gives back the same sampler
+        assert(n_calls[0] == n_calls_saved)
+        assert(restored.abscissae == sampler.abscissae)
+        assert(restored.frozen == sampler.frozen == ("freeze_acceptance_rate" in kwargs))
+        assert(vars(restored.stats) == vars(sampler.stats))
+        assert(restored.logpdf.n_evaluations == sampler.logpdf.n_evaluations)
+        assert(restored.logpdf.n_saved_evaluations == sampler.logpdf.n_saved_evaluations)
+        assert(allclose(restored.upper_hull.pr, sampler.upper_hull.pr))
+
+        # resuming gives the samples the saved sampler would have given
+        assert(restored.sample(500) == sampler.sample(500))
+        assert(restored.abscissae == sampler.abscissae)
+        assert(restored.stats.n_evaluations == sampler.stats.n_evaluations)
+
+    # independent chains from a shared envelope
+    restored = ARSampler.load(file, logpdf=logpdf, random_stream=np.random.RandomState(seed=2))
+    assert(restored.sample(10) != sampler.sample(10))
+
+
+def test_logpdf_lower_bound():
+    def logpdf(x):
+        return -x ** 2 / 2. - (np.logaddexp(x, -x) - log(2.))
+
+    def logpdf_lower_bound(x):
+        # log(cosh(x)) <= |x|
+        return -x ** 2 / 2. - np.abs(x)
+
+    grid = np.linspace(-10., 10., 100001)
+    density = exp(logpdf(grid))
+    second_moment = np.sum(grid ** 2 * density) / np.sum(density)
+
+    for kwargs in ({}, {"block_size": 100}, {"n_workers": 2}, {"freeze_acceptance_rate": 0.9}):
+        samplers = [
+            ARSampler(
+                logpdf=logpdf, a=-2., b=2., domain=(float("-inf"), float("inf")),
+                random_stream=np.random.RandomState(seed=1),
+                logpdf_lower_bound=lower_bound, profile=True, **kwargs
+            )
+            for lower_bound in (None, logpdf_lower_bound)
+        ]
+
+        reference_samples, samples = (np.asarray(sampler.sample(20000)) for sampler in samplers)
+        reference_stats, stats = (sampler.stats for sampler in samplers)
+
+        assert(mean(samples ** 2) == approx(second_moment, abs=0.03))
+
+        # the bound replaces `logpdf` evaluations
+        assert(reference_stats.n_bounded == reference_stats.n_bound_evaluations == 0)
+        assert(stats.n_bounded > 0)
+        assert(stats.n_bound_evaluations == stats.n_candidates - stats.n_squeezed)
+        assert(stats.n_squeezed + stats.n_bounded <= stats.n_candidates)
+        assert(stats.timings["lower_bound"] > 0.)
+
+        n_reference_evaluations = reference_stats.n_candidates - reference_stats.n_squeezed
+        assert(stats.n_bound_evaluations - stats.n_bounded < n_reference_evaluations)
+
+    # a bound that never helps gives the same samples
+    samplers = [
+        ARSampler(
+            logpdf=logpdf, a=-2., b=2., domain=(float("-inf"), float("inf")),
+            random_stream=np.random.RandomState(seed=1), logpdf_lower_bound=lower_bound
+        )
+        for lower_bound in (None, lambda x: float("-inf"))
+    ]
+    assert(samplers[0].sample(1000) == samplers[1].sample(1000))
+
+    with pytest.raises(AssertionError):
+        ARSampler(
+            logpdf=logpdf, a=-2., b=2., domain=(float("-inf"), float("inf")),
+            compiled=True, logpdf_lower_bound=logpdf_lower_bound
+        )
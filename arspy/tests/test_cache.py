@@ -0,0 +1,70 @@
+import threading
+import numpy as np
+
+from arspy.cache import SamplerCache
+
+
+def gaussian_logpdf(x, mean, sigma=1.):
+    return -(x - mean) ** 2 / (2. * sigma ** 2)
+
+
+def test_sampler_cache():
+    cache = SamplerCache(
+        logpdf=gaussian_logpdf, a=-2., b=2., domain=(float("-inf"), float("inf")),
+        random_stream=np.random.RandomState(seed=1), max_samplers=3, auto_init=True
+    )
+
+    sampler = cache.get((5.,))
+    samples = cache.sample((5.,), 2000)
+    assert(abs(np.mean(samples) - 5.) < 0.1)
+
+    # repeated parameters reuse the refined sampler
+    n_abscissae = len(sampler.abscissae)
+    assert(cache.get((5.,)) is sampler)
+    cache.sample((5.,), 100)
+    assert(len(sampler.abscissae) <= n_abscissae + 5)
+    assert((cache.n_hits, cache.n_misses, cache.n_evictions) == (3, 1, 0))
+
+    # least recently used samplers are evicted first
+    for mean in (0., 1., 5., 2.):
+        cache.draw((mean,))
+
+    assert(len(cache) == 3 and (0.,) not in cache)
+    assert(all(theta in cache for theta in ((1.,), (5.,), (2.,))))
+    assert(cache.n_evictions == 1)
+    assert(cache.hit_rate == 0.5)
+
+    # several parameters per target
+    samples = cache.sample((-3., 0.5), 2000)
+    assert(abs(np.std(samples) - 0.5) < 0.05)
+
+    # memory cap on the total number of mesh points
+    capped_cache = SamplerCache(
+        logpdf=gaussian_logpdf, a=-2., b=2., domain=(float("-inf"), float("inf")),
+        random_stream=np.random.RandomState(seed=1), max_total_abscissae=40
+    )
+
+    for mean in np.linspace(-1., 1., 10):
+        capped_cache.sample((mean,), 200)
+        assert(capped_cache.n_abscissae <= 40 or len(capped_cache) == 1)
+
+    assert(capped_cache.n_evictions == 10 - len(capped_cache))
+
+
+def test_sampler_cache_threads():
+    n_threads = threading.active_count()
+
+    cache = SamplerCache(
+        logpdf=gaussian_logpdf, a=-2., b=2., domain=(float("-inf"), float("inf")),
+        random_stream=np.random.RandomState(seed=1), max_samplers=2, n_workers=2
+    )
+
+    # evicted samplers shut down their pools of threads
+    for mean in np.linspace(-1., 1., 6):
+        cache.sample((mean,), 100)
+        assert(threading.active_count() <= n_threads + 2 * 2)
+
+    assert(cache.n_evictions == 4)
+
+    cache.clear()
+    assert(threading.active_count() == n_threads)
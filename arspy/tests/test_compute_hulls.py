@@ -1,4 +1,11 @@
-from arspy.hull import compute_hulls, HullNode as hn
+import numpy as np
+from pytest import approx
+
+from arspy.hull import (
+    compute_hulls, compute_hull_stack, evaluate_hulls, evaluate_hull_stack,
+    Hull, HullNode as hn,
+    _lower_hull_segment, _tail_segments, _tangent_segment, _upper_hull_segments
+)
 
 
 def test_compute_hulls():
@@ -27,3 +34,129 @@ def test_compute_hulls():
         for node_theirs, node_ours in zip(julia_lower_hull, our_lower_hull):
             if node_theirs != node_ours:
                 raise ValueError("lower", "THEIRS:", [node_theirs], "OURS:", [node_ours])
+
+
+def test_compute_hulls_large_mesh():
+    random_stream = np.random.RandomState(seed=1)
+
+    # gamma(3, 1) log-density, with a linear piece on [10, 20]
+    S = np.concatenate((np.sort(random_stream.uniform(0.01, 10., 5000)), np.linspace(10., 20., 11)[1:]))
+    fS = np.where(S <= 10., 2. * np.log(np.minimum(S, 10.)) - S, 2. * np.log(10.) - 10. - 0.8 * (S - 10.))
+    S, fS = list(S), list(fS)
+
+    for domain in ((0., float("inf")), (0., 20.)):
+        lower_hull, upper_hull = compute_hulls(S, fS, domain)
+
+        # the bulk computation reproduces the per-interval computation exactly
+        left_tail, right_tail = _tail_segments(S, fS, domain)
+        expected_upper_hull = Hull._from_segments(
+            left_tail +
+            [segment for li in range(len(S) - 1) for segment in _upper_hull_segments(S, fS, li, domain)] +
+            right_tail
+        )
+        expected_lower_hull = Hull._from_segments(
+            [_lower_hull_segment(S, fS, li) for li in range(len(S) - 1)]
+        )
+
+        for hull, expected_hull in ((lower_hull, expected_lower_hull), (upper_hull, expected_upper_hull)):
+            for attribute in ("m", "b", "left", "right", "pr"):
+                assert(np.array_equal(getattr(hull, attribute), getattr(expected_hull, attribute)))
+
+    # tangents of the standard gaussian
+    S = list(np.sort(random_stream.normal(size=5000)))
+    fS, dfS = [-s ** 2 / 2. for s in S], [-s for s in S]
+    domain = (float("-inf"), float("inf"))
+
+    _, upper_hull = compute_hulls(S, fS, domain, dfS=dfS)
+    expected_upper_hull = Hull._from_segments(
+        [_tangent_segment(S, fS, dfS, li, domain) for li in range(len(S))]
+    )
+
+    for attribute in ("m", "b", "left", "right", "pr"):
+        assert(np.array_equal(getattr(upper_hull, attribute), getattr(expected_upper_hull, attribute)))
+
+
+def test_hull_node_views():
+    S = (-2.0, -1.0, 0.0, 1.0, 2.0)
+    fS = tuple(-s ** 2 for s in S)
+
+    lower_hull, upper_hull = compute_hulls(S, fS, (float("-inf"), float("inf")))
+
+    assert(isinstance(upper_hull, Hull) and isinstance(lower_hull, Hull))
+    assert(upper_hull.pr.sum() == approx(1.0))
+    assert(list(upper_hull.left[1:]) == list(upper_hull.right[:-1]))
+
+    # nodes are views on the hull arrays
+    node = upper_hull[-1]
+    assert(node == hn(m=upper_hull.m[-1], b=upper_hull.b[-1],
+                      left=upper_hull.left[-1], right=float("inf"),
+                      pr=upper_hull.pr[-1]))
+    node.m = 5.0
+    assert(upper_hull.m[-1] == 5.0)
+
+    assert(all(
+        node_ours == node_copy
+        for node_ours, node_copy in zip(lower_hull, Hull.from_nodes(list(lower_hull)))
+    ))
+
+
+def test_hull_locate():
+    S = tuple(np.linspace(-3., 3.1, 50))
+    fS = tuple(-s ** 2 for s in S)
+
+    for hull in compute_hulls(S, fS, (float("-inf"), float("inf"))):
+        xs = np.random.RandomState(seed=1).uniform(-3., 3., size=100)
+
+        indices = hull.locate(xs)
+
+        for x, index in zip(xs, indices):
+            node = next(
+                (node for node in hull if node.left <= x <= node.right), hull[-1]
+            )
+            assert(hull[int(index)] == node)
+            assert(hull.locate(x) == index)
+
+        assert(np.allclose(hull.cdf, np.cumsum(hull.pr)))
+
+
+def test_compute_hull_stack():
+    random_stream = np.random.RandomState(seed=1)
+
+    domains = (
+        (float("-inf"), float("inf")), (-5., float("inf")),
+        (float("-inf"), 5.), (-5., 5.)
+    )
+    meshes = [
+        np.sort(np.concatenate(([-3.], random_stream.uniform(-3., 2.5, n - 2), [2.5])))
+        for n in (3, 4, 7, 12)
+    ]
+    targets = [(S, domain) for S in meshes for domain in domains]
+
+    # pad all meshes to the same width
+    S = np.full((len(targets), 15), float("inf"))
+    fS = np.full(S.shape, float("-inf"))
+    for k, (mesh, _) in enumerate(targets):
+        S[k, :len(mesh)], fS[k, :len(mesh)] = mesh, -mesh ** 2
+
+    lower_hulls, upper_hulls = compute_hull_stack(
+        S=S, fS=fS, n_abscissae=[len(mesh) for mesh, _ in targets],
+        domain=[domain for _, domain in targets]
+    )
+
+    # within the support of each hull, both hulls agree with `compute_hulls`
+    xs = random_stream.uniform(-3., 2.5, size=(50, len(targets)))
+    for x in xs:
+        lh_vals, uh_vals = evaluate_hull_stack(x, lower_hulls, upper_hulls)
+
+        for k, (mesh, domain) in enumerate(targets):
+            hulls = compute_hulls(list(mesh), list(-mesh ** 2), domain)
+            lh_val, uh_val = evaluate_hulls(x[k], *hulls)
+
+            assert(lh_vals[k] == approx(lh_val))
+            assert(uh_vals[k] == approx(uh_val))
+
+    for k, (mesh, domain) in enumerate(targets):
+        lower_hull, upper_hull = compute_hulls(list(mesh), list(-mesh ** 2), domain)
+
+        assert(lower_hulls.log_mass()[k] == approx(lower_hull.log_mass()))
+        assert(upper_hulls.log_mass()[k] == approx(upper_hull.log_mass()))
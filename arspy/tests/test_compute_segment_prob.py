@@ -1,6 +1,9 @@
 from math import isclose
+import warnings
 
-from arspy.hull import compute_segment_log_prob
+import numpy as np
+
+from arspy.hull import compute_segment_log_prob, _segment_log_probs
 
 
 def test_valid_inputs():
@@ -36,3 +39,25 @@ def test_valid_inputs():
 
     for input_vals, julia_result in inputs.items():
         assert(isclose(julia_result, compute_segment_log_prob(*input_vals)))
+
+
+def test_empty_and_vectorized_segments():
+    inf = float("inf")
+
+    segments = [
+        (-inf, -2., 4., 4.), (-2., -1., 3., 2.), (-1., 1., 0., 0.5),
+        (1., 2., -3., 2.), (2., inf, -4., 4.),
+        # empty segments, also flat ones
+        (1.5, 1.5, -2., 1.), (1.5, 1.5, 0., 1.),
+    ]
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+
+        log_probs = [compute_segment_log_prob(*segment) for segment in segments]
+        assert(log_probs[-2:] == [-inf, -inf])
+
+        # the vectorized version gives identical results, for any shape
+        l, r, m, b = np.array(segments).T
+        assert(_segment_log_probs(l, r, m, b).tolist() == log_probs)
+        assert(_segment_log_probs(l[None], r[None], m[None], b[None]).tolist() == [log_probs])
@@ -1,4 +1,4 @@
-from numpy import allclose
+from numpy import allclose, asarray
 
 from arspy.hull import evaluate_hulls, HullNode as hn
 
@@ -37,3 +37,14 @@ def test_evaluate_hulls():
 
     for input_vals, julia_result in inputs.items():
         assert(allclose(julia_result, evaluate_hulls(*input_vals)))
+
+    # vectorized evaluation of all inputs at once
+    for lower_hull, upper_hull in set(input_vals[1:] for input_vals in inputs):
+        xs = [x for x, *hulls in inputs if hulls == [lower_hull, upper_hull]]
+        julia_results = [inputs[(x, lower_hull, upper_hull)] for x in xs]
+
+        assert(allclose(
+            julia_results,
+            asarray(evaluate_hulls(asarray(xs), lower_hull, upper_hull)).T
+        ))
+
@@ -0,0 +1,102 @@
+import math
+import threading
+import numpy as np
+import pytest
+
+from arspy.gibbs import GibbsSampler, gibbs_sampling
+from arspy.parallel import parallel_gibbs_sampling
+
+covariance = np.array([[1., 0.8], [0.8, 1.]])
+precision = np.linalg.inv(covariance)
+
+
+def gaussian_logpdf(x):
+    return -x @ precision @ x / 2.
+
+
+def gamma_conditional(xi, x):
+    # undefined at the bound of the domain
+    return 2. * math.log(xi) - xi
+
+
+def beta_logpdf(x):
+    # independent Beta(3, 3) and standard normal coordinates
+    return 2. * math.log(x[0]) + 2. * math.log(1. - x[0]) - x[1] ** 2 / 2.
+
+
+def test_gibbs_sampler():
+    for scan in ("systematic", "random"):
+        sampler = GibbsSampler(
+            logpdf=gaussian_logpdf, x0=np.array([5., -5.]), scan=scan,
+            random_stream=np.random.RandomState(seed=1)
+        )
+
+        out = np.empty((2000, 2))
+        chain = sampler.sample(out=out)
+
+        assert(np.shares_memory(chain, out) and sampler.n_sweeps == 2000)
+        assert(np.allclose(np.cov(chain[200:].T), covariance, atol=0.2))
+
+        # the warm-started conditionals need few evaluations per update
+        assert(sampler.n_evaluations < 8 * 2000 * 2)
+
+        # all coordinates keep a small warm mesh
+        assert(all(len(mesh) <= sampler.n_warm_abscissae for mesh in sampler._warm_abscissae))
+
+    # conditionals on bounded domains, with a Generator
+    chain = gibbs_sampling(
+        conditionals=[gamma_conditional] * 3, x0=np.ones(3), n_sweeps=1500,
+        domains=(0., float("inf")), random_stream=np.random.default_rng(1)
+    )
+    assert((chain > 0.).all())
+    assert(np.allclose(chain.mean(axis=0), 3., atol=0.2))
+
+    with pytest.raises(ValueError):
+        GibbsSampler(logpdf=gaussian_logpdf, x0=np.array([-1., 1.]), domains=(0., 1.))
+
+
+def test_gibbs_sampler_bounded_domain():
+    inf = float("inf")
+
+    sampler = GibbsSampler(
+        logpdf=beta_logpdf, x0=np.array([0.5, 0.]), domains=[(0., 1.), (-inf, inf)],
+        random_stream=np.random.RandomState(seed=1)
+    )
+    chain = sampler.sample(5000)
+
+    # conditionals cover the whole domain, not only the starting mesh
+    assert(chain[:, 0].min() < 0.1 and chain[:, 0].max() > 0.9)
+    assert(chain[:, 0].mean() == pytest.approx(0.5, abs=0.02))
+    assert(chain[:, 0].var() == pytest.approx(1. / 28., abs=0.004))
+
+
+def test_gibbs_sampler_threads():
+    n_threads = threading.active_count()
+
+    with GibbsSampler(
+        logpdf=gaussian_logpdf, x0=np.zeros(2), n_workers=4,
+        random_stream=np.random.RandomState(seed=1)
+    ) as sampler:
+        sampler.sample(300)
+
+        # all conditionals share one pool of threads
+        assert(threading.active_count() <= n_threads + 4)
+
+    assert(threading.active_count() == n_threads)
+
+
+def test_parallel_gibbs_sampling():
+    chains = parallel_gibbs_sampling(
+        np.zeros(2), n_sweeps=100, n_chains=3, seed=1, n_workers=1, logpdf=gaussian_logpdf
+    )
+
+    assert(chains.shape == (3, 100, 2))
+    assert(not np.array_equal(chains[0], chains[1]))
+
+    out = np.empty((3, 100, 2))
+    parallel_chains = parallel_gibbs_sampling(
+        np.zeros((3, 2)), n_sweeps=100, seed=1, n_workers=2, out=out, logpdf=gaussian_logpdf
+    )
+
+    assert(parallel_chains is out)
+    assert(np.array_equal(parallel_chains, chains))
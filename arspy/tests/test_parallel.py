@@ -0,0 +1,36 @@
+import numpy as np
+
+from arspy.ars import adaptive_rejection_sampling
+from arspy.parallel import parallel_adaptive_rejection_sampling, spawn_random_streams
+from arspy.tests.test_ars import gaussian, half_gaussian
+
+
+def test_parallel_sampling():
+    jobs = (
+        [dict(logpdf=gaussian, a=-2., b=2., domain=(float("-inf"), float("inf")))] * 3 +
+        [dict(logpdf=half_gaussian, a=-2., b=0., domain=(float("-inf"), 0.))] * 2
+    )
+
+    samples = parallel_adaptive_rejection_sampling(jobs, n_samples=200, seed=1, n_workers=1)
+
+    assert(samples.shape == (5, 200))
+    assert((samples[3:] <= 0.).all())
+
+    # chains of the same target use independent streams
+    assert(not np.array_equal(samples[0], samples[1]))
+
+    # job `i` draws from the `i`-th spawned stream
+    expected = adaptive_rejection_sampling(
+        n_samples=200, random_stream=spawn_random_streams(1, 5)[4], **jobs[4]
+    )
+    assert(np.array_equal(samples[4], expected))
+
+    # results do not depend on the number of workers
+    for n_workers in (2, 3):
+        out = np.empty((5, 200))
+        parallel_samples = parallel_adaptive_rejection_sampling(
+            jobs, n_samples=200, seed=1, n_workers=n_workers, out=out
+        )
+
+        assert(parallel_samples is out)
+        assert(np.array_equal(parallel_samples, samples))
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from arspy.hull import compute_segment_log_prob
+from arspy.tabulated import TabulatedSampler, tabulated_rejection_sampling
+
+
+def test_tabulated_sampler(tmpdir):
+    grid = np.linspace(-4., 4., 10 ** 5)
+    np.save(str(tmpdir.join("abscissae.npy")), grid)
+    np.save(str(tmpdir.join("values.npy")), -grid ** 2 / 2.)
+
+    # memory-mapped tables are used without copies
+    abscissae = np.load(str(tmpdir.join("abscissae.npy")), mmap_mode="r")
+    values = np.load(str(tmpdir.join("values.npy")), mmap_mode="r")
+
+    sampler = TabulatedSampler(
+        abscissae=abscissae, values=values, domain=(float("-inf"), float("inf")),
+        random_stream=np.random.RandomState(seed=1)
+    )
+    assert(np.shares_memory(sampler.abscissae, abscissae))
+    assert(np.shares_memory(sampler.lower_hull.left, abscissae))
+
+    samples = sampler.sample(20000)
+    assert(abs(np.mean(samples)) < 0.05 and abs(np.std(samples) - 1.) < 0.05)
+    # tails are extrapolated beyond the grid
+    assert(sampler.logpdf(5.) == pytest.approx(-8. - 4. * (5. - 4.), rel=1e-4))
+    assert(sampler.logpdf(np.array([0.5])) == pytest.approx(-0.125, abs=1e-8))
+
+    assert(sampler.stats.n_samples == 20000 and sampler.stats.n_evaluations == 0)
+    assert(sampler.stats.acceptance_rate > 0.99)
+
+
+def test_tabulated_sampler_exact():
+    # on a coarse grid, the target is far from the upper hull
+    abscissae = np.array([0.1, 0.5, 1., 2., 4., 8.])
+    values = 2. * np.log(abscissae) - abscissae
+
+    out = np.empty(100000)
+    samples = tabulated_rejection_sampling(
+        abscissae, values, domain=(0.1, float("inf")), out=out,
+        random_stream=np.random.RandomState(seed=1)
+    )
+    assert(np.shares_memory(samples, out))
+
+    # mass of the target between (and beyond) the grid points
+    m = np.diff(values) / np.diff(abscissae)
+    log_masses = [
+        compute_segment_log_prob(l, r, slope, fl - slope * l)
+        for l, r, slope, fl in zip(abscissae[:-1], abscissae[1:], m, values[:-1])
+    ] + [compute_segment_log_prob(8., float("inf"), m[-1], values[-1] - m[-1] * 8.)]
+    masses = np.exp(log_masses) / np.exp(log_masses).sum()
+
+    counts = np.histogram(samples, bins=np.append(abscissae, np.inf))[0]
+    assert(np.allclose(counts / len(samples), masses, atol=0.005))
+
+
+def test_tabulated_sampler_invalid():
+    grid = np.linspace(-2., 2., 11)
+
+    with pytest.raises(ValueError):
+        # not log-concave
+        TabulatedSampler(abscissae=grid, values=grid ** 2)
+
+    with pytest.raises(AssertionError):
+        # no mass beyond the grid
+        TabulatedSampler(abscissae=grid, values=grid, domain=(-2., float("inf")))
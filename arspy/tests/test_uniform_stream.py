@@ -0,0 +1,38 @@
+import numpy as np
+
+from arspy.probability_utils import UniformStream, sampler_uniform_stream, uniform_stream
+
+
+def test_uniform_stream():
+    for buffer_size in (0, 1, 5, 4096):
+        uniforms = UniformStream(np.random.RandomState(seed=1), buffer_size=buffer_size)
+
+        # scalar and array draws are served in the order of the underlying stream
+        values = [uniforms.rand(), *uniforms.rand(3), uniforms.rand(), *uniforms.rand(10)]
+
+        assert(values == np.random.RandomState(seed=1).rand(15).tolist())
+        assert(isinstance(values[0], float))
+        assert(uniforms.rand(0).shape == (0,))
+
+    uniforms = UniformStream(np.random.default_rng(seed=1), buffer_size=4)
+    values = [uniforms.rand() for _ in range(6)]
+
+    assert(values == np.random.default_rng(seed=1).random(8)[:6].tolist())
+
+    random_stream = np.random.RandomState(seed=1)
+    assert(uniform_stream(random_stream) is random_stream)
+    assert(uniform_stream(np.random.default_rng(seed=1)).rand(3).shape == (3,))
+
+    # samplers only buffer streams they own
+    uniforms = UniformStream(random_stream)
+    assert(sampler_uniform_stream(uniforms) is uniforms)
+    assert(sampler_uniform_stream(random_stream).buffer_size == 0)
+    assert(sampler_uniform_stream(random_stream, owned=True).buffer_size > 0)
+
+    # unused values are handed out again, in order
+    for buffer_size in (0, 5):
+        uniforms = UniformStream(np.random.RandomState(seed=1), buffer_size=buffer_size)
+        values = uniforms.rand(4)
+        uniforms.put_back(values[1:])
+
+        assert([*uniforms.rand(2), uniforms.rand(), *uniforms.rand(3)] == np.random.RandomState(seed=1).rand(7)[1:].tolist())
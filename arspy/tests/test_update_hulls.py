@@ -0,0 +1,100 @@
+from numpy import allclose
+import numpy as np
+
+from arspy.hull import compute_hulls, update_hulls
+
+
+def _logpdf(x):
+    return -x ** 2 / 2.
+
+
+def _dlogpdf(x):
+    return -x
+
+
+def _assert_hulls_equal(hulls, expected_hulls):
+    for hull, expected_hull in zip(hulls, expected_hulls):
+        assert(len(hull) == len(expected_hull))
+        for attribute in ("m", "b", "left", "right", "pr"):
+            assert(allclose(
+                [getattr(node, attribute) for node in hull],
+                [getattr(node, attribute) for node in expected_hull]
+            ))
+
+
+def test_update_hulls():
+    random_stream = np.random.RandomState(seed=1)
+
+    domains = (
+        (float("-inf"), float("inf")), (-5., float("inf")),
+        (float("-inf"), 5.), (-5., 5.)
+    )
+
+    for domain in domains:
+        S = [-2., -1., 0.5, 1., 2.]
+        fS = [_logpdf(s) for s in S]
+        lower_hull, upper_hull = compute_hulls(S=S, fS=fS, domain=domain)
+
+        # include points outside of the current mesh for unbounded domains
+        for x in random_stream.uniform(
+            max(domain[0], -4.), min(domain[1], 4.), size=20
+        ):
+            lower_hull, upper_hull = update_hulls(
+                S=S, fS=fS, lower_hull=lower_hull, upper_hull=upper_hull,
+                x=x, fx=_logpdf(x), domain=domain
+            )
+
+            assert(S == sorted(S))
+            _assert_hulls_equal(
+                (lower_hull, upper_hull), compute_hulls(S=S, fS=fS, domain=domain)
+            )
+
+
+def test_update_tangent_hulls():
+    random_stream = np.random.RandomState(seed=1)
+
+    for domain in ((float("-inf"), float("inf")), (-5., 5.)):
+        S = [-2., -1., 0., 1., 2.]
+        fS, dfS = [_logpdf(s) for s in S], [_dlogpdf(s) for s in S]
+        lower_hull, upper_hull = compute_hulls(S=S, fS=fS, domain=domain, dfS=dfS)
+
+        assert(len(upper_hull) == len(S))
+
+        for x in random_stream.uniform(
+            max(domain[0], -4.), min(domain[1], 4.), size=20
+        ):
+            lower_hull, upper_hull = update_hulls(
+                S=S, fS=fS, lower_hull=lower_hull, upper_hull=upper_hull,
+                x=x, fx=_logpdf(x), domain=domain, dfS=dfS, dfx=_dlogpdf(x)
+            )
+
+            assert(dfS == [_dlogpdf(s) for s in S])
+            _assert_hulls_equal(
+                (lower_hull, upper_hull),
+                compute_hulls(S=S, fS=fS, domain=domain, dfS=dfS)
+            )
+
+        # tangents lie above the secant upper hull
+        secant_upper_hull = compute_hulls(S=S, fS=fS, domain=domain)[1]
+        assert(upper_hull.log_mass() < secant_upper_hull.log_mass())
+
+
+def test_update_hulls_existing_abscissa():
+    for domain in ((float("-inf"), float("inf")), (-5., 5.)):
+        S = [-2., -1., 0.5, 1., 2.]
+        fS = [_logpdf(s) for s in S]
+        lower_hull, upper_hull = compute_hulls(S=S, fS=fS, domain=domain)
+        n_lower, n_upper = len(lower_hull), len(upper_hull)
+
+        # points the hulls were built from leave mesh and hulls unchanged
+        for x in (S[0], S[2], S[-1]):
+            lower_hull, upper_hull = update_hulls(
+                S=S, fS=fS, lower_hull=lower_hull, upper_hull=upper_hull,
+                x=x, fx=_logpdf(x), domain=domain
+            )
+
+        assert(S == [-2., -1., 0.5, 1., 2.])
+        assert((len(lower_hull), len(upper_hull)) == (n_lower, n_upper))
+        _assert_hulls_equal(
+            (lower_hull, upper_hull), compute_hulls(S=S, fS=fS, domain=domain)
+        )
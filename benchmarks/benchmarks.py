@@ -0,0 +1,215 @@
+"""
+Benchmarks of `arspy` for airspeed velocity (asv).
+
+Run `asv run` to benchmark the current commit,
+`asv continuous master HEAD` to compare against a baseline and
+`asv compare <commit> <commit>` to inspect the tracked results.
+For a quick local run without asv, use `python -m benchmarks.benchmarks`.
+
+`time_*` benchmarks measure throughput, `track_*` benchmarks record
+`logpdf` evaluations per accepted sample (from `arspy.ars.SamplerStats`)
+and `peakmem_*` benchmarks record peak memory.
+"""
+from numpy import log, exp, sqrt, logaddexp
+import numpy as np
+
+from arspy.ars import ARSampler, BatchARSampler
+from arspy.hull import compute_hulls
+from arspy.tabulated import TabulatedSampler
+
+INF = float("inf")
+
+
+def gaussian(x, sigma=1):
+    return log(exp(-x ** 2 / sigma))
+
+
+def half_gaussian(x, sigma=3):
+    return log(exp(-x ** 2 / sigma)) * (1 * (x <= 0) + 1e300 * (x > 0))
+
+
+def relativistic_momentum_logpdf(p, m=1., c=1.):
+    return -m * c ** 2 * sqrt(p ** 2 / (m ** 2 * c ** 2) + 1)
+
+
+def logistic(x):
+    # exponential (heavier than gaussian) tails, the heaviest log-concave ones
+    return -x - 2. * logaddexp(0., -x)
+
+
+def sharp_gaussian(x, sigma=1e-3):
+    return -x ** 2 / (2. * sigma ** 2)
+
+
+# logpdf, a, b and domain of each target
+targets = {
+    "gaussian": (gaussian, -2., 2., (-INF, INF)),
+    "half-gaussian": (half_gaussian, -2., 0., (-INF, 0.)),
+    "relativistic": (relativistic_momentum_logpdf, -10., 10., (-INF, INF)),
+    "logistic": (logistic, -5., 5., (-INF, INF)),
+    "sharp-gaussian": (sharp_gaussian, -1e-2, 1e-2, (-INF, INF)),
+}
+
+# sampler options of each mode
+modes = {
+    "scalar": {},
+    "compiled": {"compiled": True},
+    "block": {"block_size": 2 ** 14},
+    "frozen": {"block_size": 2 ** 14, "freeze_acceptance_rate": 0.99, "max_abscissae": 200},
+    "speculative": {"n_workers": 4},
+}
+
+# modes that refine the hulls after (nearly) every evaluation,
+# larger runs are too slow to time
+max_scalar_samples = 10 ** 5
+
+
+def _sampler(target, mode, seed=1):
+    logpdf, a, b, domain = targets[target]
+
+    return ARSampler(
+        logpdf=logpdf, a=a, b=b, domain=domain,
+        random_stream=np.random.RandomState(seed=seed), **modes[mode]
+    )
+
+
+class Sampling(object):
+    """ Draw `n_samples` samples from a fresh sampler. """
+    params = (
+        list(targets), list(modes), [10, 10 ** 3, 10 ** 5, 10 ** 7]
+    )
+    param_names = ("target", "mode", "n_samples")
+    timeout = 300
+
+    def setup(self, target, mode, n_samples):
+        if mode in ("scalar", "compiled", "speculative") and n_samples > max_scalar_samples:
+            raise NotImplementedError("too slow")
+
+    def time_sample(self, target, mode, n_samples):
+        _sampler(target, mode).sample(n_samples, dtype=float)
+
+    def peakmem_sample(self, target, mode, n_samples):
+        _sampler(target, mode).sample(n_samples, dtype=float)
+
+    def track_evaluations_per_sample(self, target, mode, n_samples):
+        sampler = _sampler(target, mode)
+        sampler.sample(n_samples, dtype=float)
+        return sampler.stats.n_evaluations / n_samples
+
+    track_evaluations_per_sample.unit = "evaluations/sample"
+
+
+class Startup(object):
+    """ Create a sampler and draw a handful of samples (typical Gibbs step). """
+    params = (list(targets), [1, 10])
+    param_names = ("target", "n_samples")
+
+    def time_startup(self, target, n_samples):
+        _sampler(target, "scalar").sample(n_samples)
+
+    def track_evaluations(self, target, n_samples):
+        sampler = _sampler(target, "scalar")
+        sampler.sample(n_samples)
+        return sampler.stats.n_evaluations
+
+    track_evaluations.unit = "evaluations"
+
+
+class HullConstruction(object):
+    """ Build the hulls of a gaussian from a mesh of `n_abscissae` points. """
+    params = ([10 ** 3, 10 ** 5, 10 ** 6], ["secant", "tangent"])
+    param_names = ("n_abscissae", "upper_hull")
+
+    def setup(self, n_abscissae, upper_hull):
+        self.S = np.linspace(-10., 10., n_abscissae)
+        self.fS = -self.S ** 2 / 2.
+        self.dfS = -self.S if upper_hull == "tangent" else None
+
+    def time_compute_hulls(self, n_abscissae, upper_hull):
+        compute_hulls(self.S, self.fS, (-INF, INF), dfS=self.dfS)
+
+    def peakmem_compute_hulls(self, n_abscissae, upper_hull):
+        compute_hulls(self.S, self.fS, (-INF, INF), dfS=self.dfS)
+
+
+class TabulatedSampling(object):
+    """ Sample a gaussian tabulated on a grid of `n_abscissae` points. """
+    params = ([10 ** 3, 10 ** 6], [10 ** 3, 10 ** 6])
+    param_names = ("n_abscissae", "n_samples")
+    timeout = 300
+
+    def setup(self, n_abscissae, n_samples):
+        self.grid = np.linspace(-10., 10., n_abscissae)
+        self.values = -self.grid ** 2 / 2.
+
+    def time_tabulated_sample(self, n_abscissae, n_samples):
+        TabulatedSampler(
+            abscissae=self.grid, values=self.values, domain=(-INF, INF),
+            random_stream=np.random.RandomState(seed=1)
+        ).sample(n_samples)
+
+
+class BatchSampling(object):
+    """ Draw one sample from each of `n_targets` gaussians with different means. """
+    params = ([10, 10 ** 3, 10 ** 5], [1, 10])
+    param_names = ("n_targets", "n_samples")
+    timeout = 300
+
+    def setup(self, n_targets, n_samples):
+        self.means = np.linspace(-10., 10., n_targets)
+
+    def _sampler(self):
+        means = self.means
+
+        def logpdf(x, targets):
+            return -(x - means[targets, None]) ** 2 / 2.
+
+        return BatchARSampler(
+            logpdf=logpdf, a=means - 1., b=means + 1., domain=(-INF, INF),
+            random_stream=np.random.RandomState(seed=1)
+        )
+
+    def time_batch_sample(self, n_targets, n_samples):
+        self._sampler().sample(n_samples)
+
+    def peakmem_batch_sample(self, n_targets, n_samples):
+        self._sampler().sample(n_samples)
+
+    def time_separate_samplers(self, n_targets, n_samples):
+        if n_targets > 10 ** 3:
+            raise NotImplementedError("too slow")
+
+        for mean in self.means:
+            ARSampler(
+                logpdf=lambda x: -(x - mean) ** 2 / 2., a=mean - 1., b=mean + 1.,
+                domain=(-INF, INF), random_stream=np.random.RandomState(seed=1)
+            ).sample(n_samples)
+
+
+if __name__ == "__main__":
+    # quick run of the time_* benchmarks without asv, one repetition each
+    from itertools import product
+    from time import perf_counter
+
+    for benchmark in (Sampling, Startup, HullConstruction, TabulatedSampling, BatchSampling):
+        for params in product(*benchmark.params):
+            instance = benchmark()
+
+            try:
+                getattr(instance, "setup", lambda *params: None)(*params)
+            except NotImplementedError:
+                continue
+
+            for name in sorted(dir(instance)):
+                if not name.startswith("time_"):
+                    continue
+
+                start = perf_counter()
+                try:
+                    getattr(instance, name)(*params)
+                except NotImplementedError:
+                    continue
+
+                print("{}.{}{}: {:.4f}s".format(
+                    benchmark.__name__, name, params, perf_counter() - start
+                ))
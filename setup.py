@@ -23,6 +23,7 @@ with open(requirements_file, "r") as f:
 
 setup_requirements = ["pytest-runner"]
 test_requirements = ["pytest", "pytest-cov"]
+extra_requirements = {"numba": ["numba"]}
 
 
 if __name__ == "__main__":
@@ -40,6 +41,7 @@ if __name__ == "__main__":
         # package_data={"docs": ["*"]},
         # include_package_data=True,
         install_requires=install_requirements,
+        extras_require=extra_requirements,
         setup_requires=setup_requirements,
         tests_require=test_requirements,
     )